@@ -0,0 +1,245 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+
+from amv2.enums import MultinameKind
+from amv2.opcodes import Instruction, TruncatedInstruction, UnknownOpcode, \
+                         decode
+
+
+# values popped for the runtime parts of a multiname
+__RUNTIME_PARTS__ = {
+    MultinameKind.RT_Q_NAME: 1,
+    MultinameKind.RT_Q_NAME_A: 1,
+    MultinameKind.RT_Q_NAME_L: 2,
+    MultinameKind.RT_Q_NAME_L_A: 2,
+    MultinameKind.MULTINAME_L: 1,
+    MultinameKind.MULTINAME_L_A: 1,
+}
+
+# an exception handler starts with the exception on an emptied stack
+__HANDLER_STATE__ = (1, 0)
+
+
+@dataclass
+class BasicBlock:
+    # byte offsets in the method code, `end` excluded
+    start: int
+    end: int
+    instructions: list[Instruction]
+    # indexes in `MethodAnalysis.blocks`
+    successors: list[int] = field(default_factory=list)
+    handlers: list[int] = field(default_factory=list)
+    # heights on entry, None for unreachable blocks
+    stack_height: int = None
+    scope_height: int = None
+
+
+@dataclass
+class MethodAnalysis:
+    method_idx: int
+    blocks: list[BasicBlock]
+    max_stack: int
+    # absolute depth, starting from the body `init_scope_depth`
+    max_scope_depth: int
+    errors: list[str]
+
+    @property
+    def is_valid(self):
+        return not self.errors
+
+
+class Analyzer:
+    """Analyse the method bodies of an ABC `File`, cached per method."""
+
+    def __init__(self, abc):
+        self.abc = abc
+        self._bodies = {body.method_idx: body for body in abc.method_bodies}
+        # multiname index -> runtime parts, index 0 is the any name
+        self._runtime_parts = [0] + [
+            __RUNTIME_PARTS__.get(getattr(multiname, '__kind__', None), 0)
+            for multiname in abc.constants_pool.multinames
+        ]
+        self._cache = {}
+
+    def analyze(self, method_idx):
+        analysis = self._cache.get(method_idx)
+        if analysis is None:
+            analysis = analyze(self._bodies[method_idx], self._runtime_parts)
+            self._cache[method_idx] = analysis
+
+        return analysis
+
+    def analyze_all(self):
+        return [self.analyze(method_idx) for method_idx in self._bodies]
+
+
+def analyze(body, runtime_parts=()):
+    errors = []
+    try:
+        instructions = decode(body.code)
+    except (UnknownOpcode, TruncatedInstruction) as e:
+        errors.append(f"invalid code: {e}")
+        return MethodAnalysis(
+            method_idx=body.method_idx,
+            blocks=[],
+            max_stack=0,
+            max_scope_depth=body.init_scope_depth,
+            errors=errors,
+        )
+
+    blocks = split_blocks(body, instructions, errors)
+    max_stack, max_scope = compute_heights(blocks, runtime_parts, errors)
+
+    max_scope_depth = body.init_scope_depth + max_scope
+    if max_stack > body.max_stack:
+        errors.append(
+            f"stack height {max_stack} exceeds max_stack {body.max_stack}"
+        )
+    if max_scope_depth > body.max_scope_depth:
+        errors.append(
+            f"scope depth {max_scope_depth} exceeds "
+            f"max_scope_depth {body.max_scope_depth}"
+        )
+
+    return MethodAnalysis(
+        method_idx=body.method_idx,
+        blocks=blocks,
+        max_stack=max_stack,
+        max_scope_depth=max_scope_depth,
+        errors=errors,
+    )
+
+
+def split_blocks(body, instructions, errors):
+    if not instructions:
+        return []
+
+    offsets = {instruction.offset for instruction in instructions}
+    size = instructions[-1].end
+
+    leaders = {0}
+    for instruction in instructions:
+        targets = instruction.targets
+        if targets or not instruction.falls_through:
+            leaders.add(instruction.end)
+        for target in targets:
+            if target not in offsets:
+                errors.append(
+                    f"{instruction.opcode.name} at {instruction.offset} "
+                    f"jumps to {target}, not an instruction"
+                )
+                continue
+            leaders.add(target)
+
+    for exception in body.exceptions:
+        for offset in (exception.from_idx, exception.to_idx,
+                       exception.target_idx):
+            if offset in offsets:
+                leaders.add(offset)
+            elif offset != size:
+                errors.append(f"exception offset {offset} is not an "
+                              f"instruction")
+
+    starts = sorted(leader for leader in leaders if leader < size)
+    blocks = []
+    idx = 0
+    for start in starts:
+        block = BasicBlock(start=start, end=start, instructions=[])
+        while idx < len(instructions) and \
+                (block.end == start or instructions[idx].offset not in leaders):
+            block.instructions.append(instructions[idx])
+            block.end = instructions[idx].end
+            idx = idx + 1
+        blocks.append(block)
+
+    block_idx = {block.start: idx for idx, block in enumerate(blocks)}
+    for block in blocks:
+        last = block.instructions[-1]
+        targets = list(last.targets)
+        if last.falls_through and last.end < size:
+            targets.append(last.end)
+
+        for target in targets:
+            if target in block_idx and block_idx[target] not in \
+                    block.successors:
+                block.successors.append(block_idx[target])
+
+    for exception in body.exceptions:
+        handler = block_idx.get(exception.target_idx)
+        if handler is None:
+            continue
+
+        first = bisect_right(starts, exception.from_idx) - 1
+        for block in blocks[max(first, 0):]:
+            if block.start >= exception.to_idx:
+                break
+            if block.end > exception.from_idx and \
+                    handler not in block.handlers:
+                block.handlers.append(handler)
+
+    return blocks
+
+
+def compute_heights(blocks, runtime_parts, errors):
+    max_stack = 0
+    max_scope = 0
+    if not blocks:
+        return max_stack, max_scope
+
+    states = [None] * len(blocks)
+    states[0] = (0, 0)
+    worklist = [0]
+
+    def merge(idx, state):
+        if states[idx] is None:
+            states[idx] = state
+            worklist.append(idx)
+        elif states[idx] != state:
+            errors.append(
+                f"inconsistent heights at {blocks[idx].start}: "
+                f"{states[idx]} and {state}"
+            )
+
+    while worklist:
+        idx = worklist.pop()
+        block = blocks[idx]
+        stack, scope = states[idx]
+        block.stack_height, block.scope_height = stack, scope
+        max_stack = max(max_stack, stack)
+
+        for instruction in block.instructions:
+            opcode = instruction.opcode
+            pops = opcode.pops
+            if opcode.argc is not None:
+                pops = pops + \
+                    instruction.operands[opcode.argc] * opcode.argc_size
+            if opcode.multiname:
+                multiname = instruction.operands[0]
+                if multiname < len(runtime_parts):
+                    pops = pops + runtime_parts[multiname]
+
+            if pops > stack:
+                errors.append(
+                    f"stack underflow at {instruction.offset} "
+                    f"({opcode.name})"
+                )
+                stack = pops
+
+            stack = stack - pops + opcode.pushes
+            scope = scope + opcode.scope
+            if scope < 0:
+                errors.append(
+                    f"scope underflow at {instruction.offset} "
+                    f"({opcode.name})"
+                )
+                scope = 0
+
+            max_stack = max(max_stack, stack)
+            max_scope = max(max_scope, scope)
+
+        for successor in block.successors:
+            merge(successor, (stack, scope))
+        for handler in block.handlers:
+            merge(handler, __HANDLER_STATE__)
+
+    return max_stack, max_scope
@@ -0,0 +1,286 @@
+from dataclasses import dataclass
+
+
+# how an instruction hands control to the next one
+__NEXT__ = 0
+__JUMP__ = 1
+__BRANCH__ = 2
+__SWITCH__ = 3
+__RETURN__ = 4
+__THROW__ = 5
+
+
+class UnknownOpcode(Exception):
+    pass
+
+
+class TruncatedInstruction(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Opcode:
+    code: int
+    name: str
+    operands: tuple[str, ...] = ()
+    pops: int = 0
+    pushes: int = 0
+    scope: int = 0
+    flow: int = __NEXT__
+    # index of the argument count operand
+    argc: int = None
+    # values popped per argument
+    argc_size: int = 1
+    # the first operand is a multiname, its runtime parts are popped too
+    multiname: bool = False
+
+
+__OPCODES__ = [None] * 256
+
+
+def register_opcode(code, name, *operands, **kwargs):
+    __OPCODES__[code] = Opcode(code, name, operands, **kwargs)
+
+
+def _register_all():
+    register = register_opcode
+
+    register(0x01, 'bkpt')
+    register(0x02, 'nop')
+    register(0x03, 'throw', pops=1, flow=__THROW__)
+    register(0x04, 'getsuper', 'u30', pops=1, pushes=1, multiname=True)
+    register(0x05, 'setsuper', 'u30', pops=2, multiname=True)
+    register(0x06, 'dxns', 'u30')
+    register(0x07, 'dxnslate', pops=1)
+    register(0x08, 'kill', 'u30')
+    register(0x09, 'label')
+
+    for code, name in (
+        (0x0c, 'ifnlt'), (0x0d, 'ifnle'), (0x0e, 'ifngt'), (0x0f, 'ifnge'),
+        (0x13, 'ifeq'), (0x14, 'ifne'), (0x15, 'iflt'), (0x16, 'ifle'),
+        (0x17, 'ifgt'), (0x18, 'ifge'), (0x19, 'ifstricteq'),
+        (0x1a, 'ifstrictne'),
+    ):
+        register(code, name, 's24', pops=2, flow=__BRANCH__)
+    register(0x10, 'jump', 's24', flow=__JUMP__)
+    register(0x11, 'iftrue', 's24', pops=1, flow=__BRANCH__)
+    register(0x12, 'iffalse', 's24', pops=1, flow=__BRANCH__)
+    register(0x1b, 'lookupswitch', pops=1, flow=__SWITCH__)
+
+    register(0x1c, 'pushwith', pops=1, scope=1)
+    register(0x1d, 'popscope', scope=-1)
+    register(0x1e, 'nextname', pops=2, pushes=1)
+    register(0x1f, 'hasnext', pops=2, pushes=1)
+    register(0x20, 'pushnull', pushes=1)
+    register(0x21, 'pushundefined', pushes=1)
+    register(0x23, 'nextvalue', pops=2, pushes=1)
+    register(0x24, 'pushbyte', 'u8', pushes=1)
+    register(0x25, 'pushshort', 'u30', pushes=1)
+    register(0x26, 'pushtrue', pushes=1)
+    register(0x27, 'pushfalse', pushes=1)
+    register(0x28, 'pushnan', pushes=1)
+    register(0x29, 'pop', pops=1)
+    register(0x2a, 'dup', pops=1, pushes=2)
+    register(0x2b, 'swap', pops=2, pushes=2)
+    register(0x2c, 'pushstring', 'u30', pushes=1)
+    register(0x2d, 'pushint', 'u30', pushes=1)
+    register(0x2e, 'pushuint', 'u30', pushes=1)
+    register(0x2f, 'pushdouble', 'u30', pushes=1)
+    register(0x30, 'pushscope', pops=1, scope=1)
+    register(0x31, 'pushnamespace', 'u30', pushes=1)
+    register(0x32, 'hasnext2', 'u30', 'u30', pushes=1)
+
+    # domain memory
+    for code, name in ((0x35, 'li8'), (0x36, 'li16'), (0x37, 'li32'),
+                       (0x38, 'lf32'), (0x39, 'lf64')):
+        register(code, name, pops=1, pushes=1)
+    for code, name in ((0x3a, 'si8'), (0x3b, 'si16'), (0x3c, 'si32'),
+                       (0x3d, 'sf32'), (0x3e, 'sf64')):
+        register(code, name, pops=2)
+
+    register(0x40, 'newfunction', 'u30', pushes=1)
+    register(0x41, 'call', 'u30', pops=2, pushes=1, argc=0)
+    register(0x42, 'construct', 'u30', pops=1, pushes=1, argc=0)
+    register(0x43, 'callmethod', 'u30', 'u30', pops=1, pushes=1, argc=1)
+    register(0x44, 'callstatic', 'u30', 'u30', pops=1, pushes=1, argc=1)
+    for code, name, pushes in (
+        (0x45, 'callsuper', 1), (0x46, 'callproperty', 1),
+        (0x4a, 'constructprop', 1), (0x4c, 'callproplex', 1),
+        (0x4e, 'callsupervoid', 0), (0x4f, 'callpropvoid', 0),
+    ):
+        register(code, name, 'u30', 'u30', pops=1, pushes=pushes, argc=1,
+                 multiname=True)
+    register(0x47, 'returnvoid', flow=__RETURN__)
+    register(0x48, 'returnvalue', pops=1, flow=__RETURN__)
+    register(0x49, 'constructsuper', 'u30', pops=1, argc=0)
+    register(0x50, 'sxi1', pops=1, pushes=1)
+    register(0x51, 'sxi8', pops=1, pushes=1)
+    register(0x52, 'sxi16', pops=1, pushes=1)
+    register(0x53, 'applytype', 'u30', pops=1, pushes=1, argc=0)
+    register(0x55, 'newobject', 'u30', pushes=1, argc=0, argc_size=2)
+    register(0x56, 'newarray', 'u30', pushes=1, argc=0)
+    register(0x57, 'newactivation', pushes=1)
+    register(0x58, 'newclass', 'u30', pops=1, pushes=1)
+    register(0x59, 'getdescendants', 'u30', pops=1, pushes=1, multiname=True)
+    register(0x5a, 'newcatch', 'u30', pushes=1)
+    register(0x5d, 'findpropstrict', 'u30', pushes=1, multiname=True)
+    register(0x5e, 'findproperty', 'u30', pushes=1, multiname=True)
+    register(0x5f, 'finddef', 'u30', pushes=1)
+    register(0x60, 'getlex', 'u30', pushes=1)
+    register(0x61, 'setproperty', 'u30', pops=2, multiname=True)
+    register(0x62, 'getlocal', 'u30', pushes=1)
+    register(0x63, 'setlocal', 'u30', pops=1)
+    register(0x64, 'getglobalscope', pushes=1)
+    register(0x65, 'getscopeobject', 'u8', pushes=1)
+    register(0x66, 'getproperty', 'u30', pops=1, pushes=1, multiname=True)
+    register(0x68, 'initproperty', 'u30', pops=2, multiname=True)
+    register(0x6a, 'deleteproperty', 'u30', pops=1, pushes=1,
+             multiname=True)
+    register(0x6c, 'getslot', 'u30', pops=1, pushes=1)
+    register(0x6d, 'setslot', 'u30', pops=2)
+    register(0x6e, 'getglobalslot', 'u30', pushes=1)
+    register(0x6f, 'setglobalslot', 'u30', pops=1)
+
+    for code, name in (
+        (0x70, 'convert_s'), (0x71, 'esc_xelem'), (0x72, 'esc_xattr'),
+        (0x73, 'convert_i'), (0x74, 'convert_u'), (0x75, 'convert_d'),
+        (0x76, 'convert_b'), (0x77, 'convert_o'), (0x78, 'checkfilter'),
+        (0x81, 'coerce_b'), (0x82, 'coerce_a'), (0x83, 'coerce_i'),
+        (0x84, 'coerce_d'), (0x85, 'coerce_s'), (0x88, 'coerce_u'),
+        (0x89, 'coerce_o'), (0x90, 'negate'), (0x91, 'increment'),
+        (0x93, 'decrement'), (0x95, 'typeof'), (0x96, 'not'),
+        (0x97, 'bitnot'), (0xc0, 'increment_i'), (0xc1, 'decrement_i'),
+        (0xc4, 'negate_i'),
+    ):
+        register(code, name, pops=1, pushes=1)
+    register(0x80, 'coerce', 'u30', pops=1, pushes=1)
+    register(0x86, 'astype', 'u30', pops=1, pushes=1)
+    register(0x87, 'astypelate', pops=2, pushes=1)
+    register(0x92, 'inclocal', 'u30')
+    register(0x94, 'declocal', 'u30')
+    register(0xc2, 'inclocal_i', 'u30')
+    register(0xc3, 'declocal_i', 'u30')
+
+    for code, name in (
+        (0xa0, 'add'), (0xa1, 'subtract'), (0xa2, 'multiply'),
+        (0xa3, 'divide'), (0xa4, 'modulo'), (0xa5, 'lshift'),
+        (0xa6, 'rshift'), (0xa7, 'urshift'), (0xa8, 'bitand'),
+        (0xa9, 'bitor'), (0xaa, 'bitxor'), (0xab, 'equals'),
+        (0xac, 'strictequals'), (0xad, 'lessthan'), (0xae, 'lessequals'),
+        (0xaf, 'greaterthan'), (0xb0, 'greaterequals'),
+        (0xb1, 'instanceof'), (0xb3, 'istypelate'), (0xb4, 'in'),
+        (0xc5, 'add_i'), (0xc6, 'subtract_i'), (0xc7, 'multiply_i'),
+    ):
+        register(code, name, pops=2, pushes=1)
+    register(0xb2, 'istype', 'u30', pops=1, pushes=1)
+
+    for idx in range(4):
+        register(0xd0 + idx, f'getlocal_{idx}', pushes=1)
+        register(0xd4 + idx, f'setlocal_{idx}', pops=1)
+
+    register(0xef, 'debug', 'u8', 'u30', 'u8', 'u30')
+    register(0xf0, 'debugline', 'u30')
+    register(0xf1, 'debugfile', 'u30')
+    register(0xf2, 'bkptline', 'u30')
+    register(0xf3, 'timestamp')
+
+
+_register_all()
+
+
+def read_u30(code, position):
+    value = 0
+    shift = 0
+    while True:
+        byte = code[position]
+        position = position + 1
+        value = value | (byte & 0x7f) << shift
+        if not byte & 0x80 or shift >= 28:
+            return value & 0x3fffffff, position
+        shift = shift + 7
+
+
+def read_s24(code, position):
+    value = code[position] | code[position + 1] << 8 | code[position + 2] << 16
+    if value & 0x800000:
+        value = value - 0x1000000
+
+    return value, position + 3
+
+
+__OPERAND_READERS__ = {
+    'u8': lambda code, position: (code[position], position + 1),
+    'u30': read_u30,
+    's24': read_s24,
+}
+
+
+@dataclass
+class Instruction:
+    offset: int
+    opcode: Opcode
+    operands: tuple[int, ...]
+    # offset of the next instruction
+    end: int
+
+    @classmethod
+    def unpack(cls, code, position):
+        opcode = __OPCODES__[code[position]]
+        if opcode is None:
+            raise UnknownOpcode(f"{code[position]:#04x} at {position}")
+
+        offset = position
+        position = position + 1
+        try:
+            if opcode.flow == __SWITCH__:
+                # default offset, case count, then `count + 1` case offsets
+                default, position = read_s24(code, position)
+                count, position = read_u30(code, position)
+                operands = [default]
+                for _ in range(count + 1):
+                    case, position = read_s24(code, position)
+                    operands.append(case)
+            else:
+                operands = []
+                for operand in opcode.operands:
+                    value, position = __OPERAND_READERS__[operand](
+                        code, position
+                    )
+                    operands.append(value)
+        except IndexError:
+            raise TruncatedInstruction(f"{opcode.name} at {offset}")
+
+        return cls(
+            offset=offset,
+            opcode=opcode,
+            operands=tuple(operands),
+            end=position,
+        )
+
+    @property
+    def targets(self):
+        """Offsets control can be transferred to, besides `end`."""
+        flow = self.opcode.flow
+        if flow in (__JUMP__, __BRANCH__):
+            return (self.end + self.operands[0],)
+        if flow == __SWITCH__:
+            # switch offsets are relative to the instruction itself
+            return tuple(self.offset + case for case in self.operands)
+
+        return ()
+
+    @property
+    def falls_through(self):
+        return self.opcode.flow in (__NEXT__, __BRANCH__)
+
+
+def decode(code):
+    instructions = []
+    position = 0
+    size = len(code)
+    while position < size:
+        instruction = Instruction.unpack(code, position)
+        instructions.append(instruction)
+        position = instruction.end
+
+    return instructions
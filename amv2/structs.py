@@ -1,25 +1,42 @@
+from array import array
 from dataclasses import dataclass
 
 from amv2.enums import ClassFlag, ConstantKind, MethodFlag, MultinameKind, NamespaceKind, TraitAttribut, TraitType
+from swf.fields import EnumField
+
+
+def flag_table(flags):
+    """Flags set in every byte value."""
+    return tuple(
+        tuple(flag for flag in flags if flag.value & bits == flag.value)
+        for bits in range(256)
+    )
+
+
+__METHOD_FLAGS__ = flag_table(MethodFlag)
+__CLASS_FLAGS__ = flag_table(ClassFlag)
+__TRAIT_ATTRIBUTES__ = flag_table(TraitAttribut)
 
 
 class String(str):
     @classmethod
     def unpack(cls, stream):
         size = stream.read_var_uint30()
-        value = ''.join([stream.read_char() for _ in range(size)])
+        value = stream.read_string(size)
 
         return cls(value)
 
 
-@dataclass
+@dataclass(slots=True)
 class Namespace:
-    kind: NamespaceKind
+    kind: int
     name_idx: int
 
+    kind_enum = EnumField(NamespaceKind, 'kind')
+
     @classmethod
     def unpack(cls, stream):
-        kind = NamespaceKind(stream.read_uint8())
+        kind = stream.read_uint8()
         idx = stream.read_var_uint30()
 
         return cls(
@@ -28,14 +45,14 @@ class Namespace:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class NSSet:
-    namespace_idx: list[int]
+    namespace_idx: array
 
     @classmethod
     def unpack(cls, stream):
         count = stream.read_var_uint30()
-        idx = [stream.read_var_uint30() for _ in range(count)]
+        idx = stream.read_var_uint30_array(count)
 
         return cls(
             namespace_idx=idx,
@@ -43,25 +60,26 @@ class NSSet:
 
 
 class Multiname:
+    __slots__ = ()
     __multinames__ = {}
     i = 0
     @staticmethod
     def unpack(stream):
-        kind = MultinameKind(stream.read_uint8())
+        kind = stream.read_uint8()
         return Multiname.__multinames__[kind].unpack(stream)
 
     @staticmethod
     def register(kind):
         def decorator(cls):
-            Multiname.__multinames__[kind] = cls
+            Multiname.__multinames__[kind.value] = cls
 
             cls.__kind__ = kind
             return cls
         return decorator
 
 
-@dataclass
 @Multiname.register(MultinameKind.Q_NAME)
+@dataclass(slots=True)
 class QName:
     namespace_idx: int
     name_idx: int
@@ -79,11 +97,11 @@ class QName:
 
 @Multiname.register(MultinameKind.Q_NAME_A)
 class QNameA(QName):
-    pass
+    __slots__ = ()
 
 
-@dataclass
 @Multiname.register(MultinameKind.RT_Q_NAME)
+@dataclass(slots=True)
 class RTQName:
     name_idx: int
 
@@ -98,23 +116,25 @@ class RTQName:
 
 @Multiname.register(MultinameKind.RT_Q_NAME_A)
 class RTQNameA(RTQName):
-    pass
+    __slots__ = ()
 
 
 @Multiname.register(MultinameKind.RT_Q_NAME_L)
 class RTQNameL:
+    __slots__ = ()
+
     @classmethod
     def unpack(cls, _stream):
-        pass
+        return cls()
 
 
 @Multiname.register(MultinameKind.RT_Q_NAME_L_A)
 class RTQNameLA(RTQNameL):
-    pass
+    __slots__ = ()
 
 
-@dataclass
 @Multiname.register(MultinameKind.MULTINAME)
+@dataclass(slots=True)
 class Multiname_:
     name_idx: int
     namespace_idx: int
@@ -132,11 +152,11 @@ class Multiname_:
 
 @Multiname.register(MultinameKind.MULTINAME_A)
 class MultinameA(Multiname_):
-    pass
+    __slots__ = ()
 
 
-@dataclass
 @Multiname.register(MultinameKind.MULTINAME_L)
+@dataclass(slots=True)
 class MultinameL:
     namespace_idx: int
 
@@ -151,12 +171,12 @@ class MultinameL:
 
 @Multiname.register(MultinameKind.MULTINAME_L_A)
 class MultinameLA(MultinameL):
-    pass
+    __slots__ = ()
 
 
 # https://blog.richardszalay.com/2009/02/10/generics-vector-in-the-avm2/
-@dataclass
 @Multiname.register(MultinameKind.GENERIC_NAME)
+@dataclass(slots=True)
 class GenericName:
     name_idx: int
     params: list[int]
@@ -174,7 +194,7 @@ class GenericName:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CPool:
     sintegers: list[int]
     uintegers: list[int]
@@ -218,15 +238,17 @@ class CPool:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Option:
     value_idx: int
-    kind: ConstantKind
+    kind: int
+
+    kind_enum = EnumField(ConstantKind, 'kind')
 
     @classmethod
     def unpack(cls, stream):
         value_idx = stream.read_var_uint30()
-        kind = ConstantKind(stream.read_uint8())
+        kind = stream.read_uint8()
 
         return cls(
             value_idx=value_idx,
@@ -234,13 +256,13 @@ class Option:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Method:
     name_idx: int
-    param_names: list[int]
-    param_types: list[int]
+    param_names: array
+    param_types: array
     options: list[Option]
-    flags: list[MethodFlag]
+    flags: tuple[MethodFlag, ...]
     return_type: int
 
     @classmethod
@@ -248,24 +270,19 @@ class Method:
         param_count = stream.read_var_uint30()
         # TODO: add enum for types
         return_type = stream.read_var_uint30()
-        param_types = [stream.read_var_uint30() for _ in range(param_count)]
+        param_types = stream.read_var_uint30_array(param_count)
         name_idx = stream.read_var_uint30()
         bits_flags = stream.read_uint8()
-
-        flags = []
-        for flag in MethodFlag:
-            if flag.value & bits_flags != flag.value:
-                continue
-            flags.append(flag)
+        flags = __METHOD_FLAGS__[bits_flags]
 
         options = []
-        if MethodFlag.HAS_OPTIONAL in flags:
+        if bits_flags & MethodFlag.HAS_OPTIONAL.value:
             option_count = stream.read_var_uint30()
             options = [Option.unpack(stream) for _ in range(option_count)]
 
-        param_names = []
-        if MethodFlag.HAS_PARAM_NAMES in flags:
-            param_names = [stream.read_var_uint30() for _ in range(param_count)]
+        param_names = array('I')
+        if bits_flags & MethodFlag.HAS_PARAM_NAMES.value:
+            param_names = stream.read_var_uint30_array(param_count)
     
         return cls(
             name_idx=name_idx,
@@ -277,7 +294,7 @@ class Method:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     key: int
     value: int
@@ -293,7 +310,7 @@ class Item:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Metadata:
     name_idx: int
     items: list[Item]
@@ -311,13 +328,13 @@ class Metadata:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Trait:
     __traits__ = {}
 
     name_idx: int
-    metadata: list[int]
-    attributes: list[TraitAttribut]
+    metadata: array
+    attributes: tuple[TraitAttribut, ...]
 
 
     @staticmethod
@@ -325,20 +342,15 @@ class Trait:
         idx = stream.read_var_uint30()
 
         kind = stream.read_uint8()
-        type = TraitType(kind & 0b1111)
         bits_attributes = kind >> 4
 
-        instance = Trait.__traits__[type].unpack(stream)
+        instance = Trait.__traits__[kind & 0b1111].unpack(stream)
         instance.name_idx = idx
+        instance.attributes = __TRAIT_ATTRIBUTES__[bits_attributes]
 
-        for attribut in TraitAttribut:
-            if attribut.value & bits_attributes != attribut.value:
-                continue
-            instance.attributes.append(attribut)
-        
-        if TraitAttribut.METADATA in instance.attributes:
+        if bits_attributes & TraitAttribut.METADATA.value:
             count = stream.read_var_uint30()
-            instance.metadata = [stream.read_var_uint30() for _ in range(count)]
+            instance.metadata = stream.read_var_uint30_array(count)
 
         return instance
 
@@ -346,35 +358,37 @@ class Trait:
         def decorator(cls):
             kinds = kind if isinstance(kind, list) else [kind]
             for _kind in kinds:
-                Trait.__traits__[_kind] = cls
+                Trait.__traits__[_kind.value] = cls
 
             cls.__kind__ = kind
             return cls
         return decorator
 
 
-@dataclass
 @Trait.register([
     TraitType.SLOT,
     TraitType.CONST,
 ])
+@dataclass(slots=True)
 class SlotTrait(Trait):
     slot_id: int
     type_name_idx: int
     v_idx: int
-    v_kind: ConstantKind
+    v_kind: int
+
+    v_kind_enum = EnumField(ConstantKind, 'v_kind')
 
     @classmethod
     def unpack(cls, stream):
         id = stream.read_var_uint30()
         type_name_idx = stream.read_var_uint30()
         v_idx = stream.read_var_uint30()
-        v_kind = ConstantKind(stream.read_uint8()) if v_idx != 0 else None
+        v_kind = stream.read_uint8() if v_idx != 0 else None
 
         return cls(
             name_idx=None,
-            metadata=[],
-            attributes=[],
+            metadata=array('I'),
+            attributes=(),
             slot_id=id,
             type_name_idx=type_name_idx,
             v_idx=v_idx,
@@ -382,8 +396,8 @@ class SlotTrait(Trait):
         )
 
 
-@dataclass
 @Trait.register(TraitType.CLASS)
+@dataclass(slots=True)
 class ClassTrait(Trait):
     slot_id: int
     class_idx: int
@@ -395,15 +409,15 @@ class ClassTrait(Trait):
 
         return cls(
             name_idx=None,
-            metadata=[],
-            attributes=[],
+            metadata=array('I'),
+            attributes=(),
             slot_id=id,
             class_idx=idx,
         )
 
 
-@dataclass
 @Trait.register(TraitType.FUNCTION)
+@dataclass(slots=True)
 class FunctionTrait(Trait):
     slot_id: int
     function_idx: int
@@ -414,20 +428,20 @@ class FunctionTrait(Trait):
         idx = stream.read_var_uint30()
 
         return cls(
-            name_id=None,
-            metadata=[],
-            attributes=[],
+            name_idx=None,
+            metadata=array('I'),
+            attributes=(),
             slot_id=id,
             function_idx=idx,
         )
 
 
-@dataclass
 @Trait.register([
     TraitType.METHOD,
     TraitType.GETTER,
     TraitType.SETTER,
 ])
+@dataclass(slots=True)
 class MethodTrait(Trait):
     disp_id: int
     method_idx: int
@@ -439,20 +453,20 @@ class MethodTrait(Trait):
 
         return cls(
             name_idx=None,
-            metadata=[],
-            attributes=[],
+            metadata=array('I'),
+            attributes=(),
             disp_id=id,
             method_idx=idx,
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Instance:
     name_idx: int
     super_name_idx: int
-    flags: list[ClassFlag]
+    flags: tuple[ClassFlag, ...]
     protected_ns: int
-    interfaces: list[int]
+    interfaces: array
     init_method_idx: int
     traits: list[Trait]
 
@@ -462,18 +476,14 @@ class Instance:
         super_name_idx = stream.read_var_uint30()
 
         bits_flags = stream.read_uint8()
-        flags = []
-        for flag in ClassFlag:
-            if flag.value & bits_flags != flag.value:
-                continue
-            flags.append(flag)
+        flags = __CLASS_FLAGS__[bits_flags]
 
         protected_ns = None
-        if ClassFlag.PROTECTED_NS in flags:
+        if bits_flags & ClassFlag.PROTECTED_NS.value:
             protected_ns = stream.read_var_uint30()
 
         count = stream.read_var_uint30()
-        interfaces = [stream.read_var_uint30() for _ in range(count)]
+        interfaces = stream.read_var_uint30_array(count)
 
         init_method_idx = stream.read_var_uint30()
 
@@ -491,7 +501,7 @@ class Instance:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Class:
     init_method_idx: int
     traits: list[Trait]
@@ -509,7 +519,7 @@ class Class:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Script:
     init_method_idx: int
     traits: list[Trait]
@@ -527,7 +537,7 @@ class Script:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class AESException:
     from_idx: int
     to_idx: int
@@ -552,7 +562,7 @@ class AESException:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MethodBody:
     method_idx: int
     max_stack: int
@@ -592,7 +602,7 @@ class MethodBody:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class File:
     minor_version: int
     major_version: int
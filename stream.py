@@ -1,5 +1,7 @@
+from array import array
 import math
 import struct
+import sys
 
 from bitarray import bitarray
 
@@ -7,9 +9,13 @@ from bitarray import bitarray
 __BYTE_BITS_SIZE__ = 8
 __CHUNK_BIT_SIZE__ = 7
 
+# bytes searched at once for a string terminator
+__CSTRING_CHUNK_SIZE__ = 64
+
 __MAX_UINT8__ = 256
 __MAX_UINT16__ = 65536
 __MASK_01111111__ = 127
+__MASK_UINT30__ = 0x3fffffff
 
 __BYTE_ORDER_MAPPING__ = {
     'big': '>',
@@ -25,11 +31,58 @@ class SizeExceeded(Exception):
     pass
 
 
+class BitLayout:
+    """Precompiled layout of consecutive bit fields, read with a single
+    integer load by `Stream.read_layout`.
+
+    `fmt` lists the fields in stream order: `?` for a flag, `uN` and `sN`
+    for N bits unsigned and signed integers, `xN` for N reserved bits,
+    e.g. `BitLayout('x ? ? ? ? x2 ? x24')`.
+    """
+    __slots__ = ('size', '_fields')
+
+    def __init__(self, fmt):
+        fields = []
+        size = 0
+        for token in fmt.split():
+            kind = token[0]
+            bits = int(token[1:] or 1)
+            if kind not in '?usx':
+                raise ValueError(f"invalid bit field {token!r}")
+
+            fields.append((kind, bits, size))
+            size = size + bits
+
+        self.size = size
+        # (kind, shift, mask) of the fields returned
+        self._fields = tuple(
+            (kind, size - offset - bits, (1 << bits) - 1)
+            for kind, bits, offset in fields if kind != 'x'
+        )
+
+    def unpack(self, value):
+        values = []
+        for kind, shift, mask in self._fields:
+            field = value >> shift & mask
+            if kind == '?':
+                field = field == 1
+            elif kind == 's' and field > mask >> 1:
+                field = field - mask - 1
+            values.append(field)
+
+        return tuple(values)
+
+
 class Stream:
-    def __init__(self, data=None, bitorder='big', byteorder='little'):
+    def __init__(self, data=None, bitorder='big', byteorder='little',
+                 origin=0, encoding='utf-8'):
         self._buffer = bitarray()
         self._bitorder = bitorder
         self._byteorder = byteorder
+        # byte position of `data` in the data it was sliced from
+        self.origin = origin
+        # of the strings, SWF 5 and earlier don't use UTF-8
+        self.encoding = encoding
 
         self._buffer.frombytes(
             data if data is not None else bytes()
@@ -99,6 +152,9 @@ class Stream:
         self.seek_bits(self._position + remaining_bits)
 
     def read_bits(self, size=1, signed=False):
+        if size == 0:
+            return 0
+
         bits = self._read_bits(size)
         sign = 0
         if signed:
@@ -124,6 +180,54 @@ class Stream:
 
         return bytes
 
+    def read_view(self, size=1):
+        # zero-copy slice over the underlying buffer
+        start = self._read_byte_aligned_position(size)
+        return memoryview(self._buffer)[start:start + size]
+
+    def read_layout(self, layout):
+        if self._position % __BYTE_BITS_SIZE__ or \
+                layout.size % __BYTE_BITS_SIZE__:
+            value = self.read_ubits(layout.size)
+        else:
+            size = layout.size // __BYTE_BITS_SIZE__
+            start = self._read_byte_aligned_position(size)
+            value = int.from_bytes(
+                memoryview(self._buffer)[start:start + size],
+                byteorder=self._bitorder,
+            )
+
+        return layout.unpack(value)
+
+    def read_uint8_array(self, count):
+        start = self._read_byte_aligned_position(count)
+        return bytes(memoryview(self._buffer)[start:start + count])
+
+    def read_uint16_array(self, count):
+        return self._read_array('H', count)
+
+    def read_float_array(self, count):
+        return self._read_array('f', count)
+
+    def substream(self, size):
+        """Stream bounded to the next `size` bytes, sharing the buffer."""
+        start = self._read_byte_aligned_position(size)
+
+        return Stream.from_buffer(
+            memoryview(self._buffer)[start:start + size],
+            bitorder=self._bitorder,
+            byteorder=self._byteorder,
+            origin=self.origin + start,
+            encoding=self.encoding,
+        )
+
+    @classmethod
+    def from_buffer(cls, buffer, bitorder='big', **kwargs):
+        """Stream over `buffer` without copying it."""
+        stream = cls(bitorder=bitorder, **kwargs)
+        stream._buffer = bitarray(buffer=buffer, endian=bitorder)
+        return stream
+
     def read_ubits(self, size=1):
         return self.read_bits(size)
 
@@ -220,22 +324,52 @@ class Stream:
     def read_var_sint32(self):
         return self._read_var_bytes(bit_size=32, signed=True)
 
+    def read_var_uint30_array(self, count):
+        self.byte_align()
+        view = memoryview(self._buffer)
+        position = self.byte_position
+
+        values = array('I')
+        for _ in range(count):
+            value, position = _read_var_uint(view, position, 30)
+            values.append(value & __MASK_UINT30__)
+
+        self.seek_bytes(position)
+        return values
+
     def read_char(self):
         return self.read_bytes(to_int=False).decode()
 
     def read_cstring(self):
-        string = ''
-        char = self.read_char()
-        while char != '\0':
-            string += char
-            char = self.read_char()   
-
+        self.byte_align()
+        start = self.byte_position
+        view = memoryview(self._buffer)
+
+        end = start
+        while True:
+            chunk = bytes(view[end:end + __CSTRING_CHUNK_SIZE__])
+            if not chunk:
+                raise BitsExhaustion()
+
+            idx = chunk.find(0)
+            if idx != -1:
+                end = end + idx
+                break
+            end = end + len(chunk)
+
+        string = str(view[start:end], self.encoding)
+        self.seek_bytes(end + 1)
         return string
 
     def read_string(self, length=None):
+        # `length` is in bytes
         if length is None:
             length = self.read_uint16()
-        return ''.join([self.read_char() for _ in range(length)])
+
+        start = self._read_byte_aligned_position(length)
+        return str(
+            memoryview(self._buffer)[start:start + length], self.encoding
+        )
 
     def read_bool(self):
         return bool(self.read_uint8())
@@ -244,18 +378,11 @@ class Stream:
         return bool(self.read_ubits(1))
 
     def _read_var_bytes(self, bit_size=1, signed=False):
-        offset = __CHUNK_BIT_SIZE__
-        byte = self.read_uint8()
-        value = byte & __MASK_01111111__
-        while byte >> __CHUNK_BIT_SIZE__:
-            if offset >= bit_size:
-                raise SizeExceeded()
-
-            byte = self.read_uint8()
-            chunk = byte & __MASK_01111111__
-            value = value | (chunk << offset)
-
-            offset = offset + __CHUNK_BIT_SIZE__
+        self.byte_align()
+        value, position = _read_var_uint(
+            memoryview(self._buffer), self.byte_position, bit_size
+        )
+        self.seek_bytes(position)
 
         mask = (1 << bit_size) - 1
         value = value & mask
@@ -281,6 +408,47 @@ class Stream:
     def _read_byte_aligned_bits(self, size=1):
         return self._read_bits(size * __BYTE_BITS_SIZE__, byte_aligned=True)
 
+    def _read_array(self, typecode, count):
+        values = array(typecode)
+        size = count * values.itemsize
+        start = self._read_byte_aligned_position(size)
+
+        values.frombytes(memoryview(self._buffer)[start:start + size])
+        if self._byteorder != sys.byteorder:
+            values.byteswap()
+
+        return values
+
+    def _read_byte_aligned_position(self, size=1):
+        self.byte_align()
+        position = self.byte_position
+        if (position + size) * __BYTE_BITS_SIZE__ > self.bits_length:
+            raise BitsExhaustion()
+
+        self.seek_bytes(position + size)
+        return position
+
+
+def _read_var_uint(view, position, bit_size):
+    """Variable length integer of the bytes of `view` at `position`, with
+    the position following it."""
+    try:
+        byte = view[position]
+        value = byte & __MASK_01111111__
+        offset = __CHUNK_BIT_SIZE__
+        while byte >> __CHUNK_BIT_SIZE__:
+            if offset >= bit_size:
+                raise SizeExceeded()
+
+            position = position + 1
+            byte = view[position]
+            value = value | (byte & __MASK_01111111__) << offset
+            offset = offset + __CHUNK_BIT_SIZE__
+    except IndexError:
+        raise BitsExhaustion()
+
+    return value, position + 1
+
 
 def unpack_bytes(fmt, buffer, byte_order='little'):
     fmt = f"{__BYTE_ORDER_MAPPING__[byte_order]}{fmt}"
@@ -5,7 +5,9 @@ def byte_align_unpack(unpack):
         else:
             stream = args
 
-        unpack(*args)
+        value = unpack(*args)
         stream.byte_align()
 
+        return value
+
     return _unpack
@@ -0,0 +1,66 @@
+import argparse
+from dataclasses import asdict
+import json
+import os
+import sys
+
+from swf.scan import ScanStats, iter_scan
+
+
+def swf_paths(paths):
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for root, _, names in os.walk(path):
+            for name in sorted(names):
+                if name.lower().endswith('.swf'):
+                    yield os.path.join(root, name)
+
+
+def scan_command(args):
+    total = ScanStats()
+    files = {}
+    for path, stats in iter_scan(swf_paths(args.paths), args.workers):
+        total.merge(stats)
+        if args.per_file:
+            files[path] = stats
+
+    if args.json:
+        result = asdict(total)
+        if args.per_file:
+            result['per_file'] = {
+                path: asdict(stats) for path, stats in files.items()
+            }
+        json.dump(result, sys.stdout)
+        print()
+        return
+
+    for path, stats in files.items():
+        print(f"== {path}")
+        print(stats.table())
+        print()
+    print(total.table())
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m swf')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scan = commands.add_parser(
+        'scan', help='tag statistics from the tag headers only',
+    )
+    scan.add_argument('paths', nargs='+',
+                      help='SWF files, or directories searched for them')
+    scan.add_argument('--workers', type=int)
+    scan.add_argument('--per-file', action='store_true')
+    scan.add_argument('--json', action='store_true')
+    scan.set_defaults(func=scan_command)
+
+    args = parser.parse_args(args)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,35 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 
+from stream import BitLayout, Stream, unpack_bytes
 from swf.enums import ValueType, VarsMethod
 from swf.records import Events
 
 
 __ACTIONS__ = {}
+# action code -> unpack method, filled on registration so that decoding
+# an action is a single list lookup
+__DECODERS__ = [None] * 256
+
+__CONSTANT_POOL__ = 0x88
+__PUSH__ = 0x96
+__DEFINE_FUNCTION__ = 0x9b
+__DEFINE_FUNCTION_2__ = 0x8e
+__TRY__ = 0x8f
+# actions followed by nested action blocks
+__NESTING__ = frozenset((__DEFINE_FUNCTION__, __DEFINE_FUNCTION_2__, __TRY__))
+
+__DEFINE_FUNCTION_2_FLAGS__ = BitLayout('? ? ? ? ? ? ? ? x7 ?')
+__TRY_FLAGS__ = BitLayout('x5 ? ? ?')
 
 
 def register_action(code):
     def modifier(cls):
         __ACTIONS__[code] = cls
+        __DECODERS__[code] = cls.unpack
 
         cls.__code__ = code
         return cls
@@ -18,13 +37,15 @@ def register_action(code):
     return modifier
 
 
-@dataclass
+@dataclass(slots=True)
 class Header:
     code: int
     length: int
+    offset: int
 
     @classmethod
-    def unpack(cls, stream):
+    def unpack(cls, stream, base=0):
+        offset = base + stream.byte_position
         code = stream.read_uint8()
         length = 0
         if code >= 0x80:
@@ -33,24 +54,59 @@ class Header:
         return cls(
             code=code,
             length=length,
+            offset=offset,
         )
 
+    @property
+    def end(self):
+        # offset of the next action record
+        return self.offset + (3 if self.code >= 0x80 else 1) + self.length
 
 
 def unpack(stream):
-    header = Header.unpack(stream)
-    if header.code not in __ACTIONS__:
-        # unhandled action
-        if header.length != 0:
-            stream.move_bytes(header.length)
+    return Decoder().unpack(stream)
 
-        return None
 
-    cls = __ACTIONS__[header.code]
-    return cls.unpack(header, stream)
+class Decoder:
+    """Decode actions while tracking the active `ConstantPool`."""
 
+    def __init__(self, constant_pool=None, offset=0):
+        self.constant_pool = constant_pool if constant_pool is not None \
+                             else []
+        # position of the stream start in the enclosing action block
+        self.offset = offset
 
-@dataclass
+    def unpack(self, stream):
+        header = Header.unpack(stream, self.offset)
+        decoder = __DECODERS__[header.code]
+        if decoder is None:
+            # unhandled action
+            if header.length != 0:
+                stream.move_bytes(header.length)
+
+            return None
+
+        action = decoder(header, stream)
+        if header.code == __CONSTANT_POOL__:
+            self.constant_pool = action.constant_pool
+        elif header.code == __PUSH__:
+            action.resolve(self.constant_pool)
+        elif header.code in __NESTING__:
+            for block in action.blocks:
+                block.constant_pool = self.constant_pool
+
+        return action
+
+    def unpack_actions(self, stream, size):
+        actions = []
+        end = stream.byte_position + size
+        while stream.byte_position < end:
+            actions.append(self.unpack(stream))
+
+        return actions
+
+
+@dataclass(slots=True)
 class Action:
     header: Header
 
@@ -60,9 +116,173 @@ class Action:
             header=header,
         )
 
+
+class ActionIndex:
+    """Start offsets and codes of the action records of a block."""
+    __slots__ = ('offsets', 'codes')
+
+    def __init__(self, offsets, codes):
+        self.offsets = offsets
+        self.codes = codes
+
+    @classmethod
+    def build(cls, data, offset):
+        offsets = array('I')
+        codes = array('B')
+
+        size = len(data)
+        position = 0
+        while position < size:
+            code = data[position]
+            offsets.append(offset + position)
+            codes.append(code)
+
+            position = position + 1
+            if code < 0x80 or position + 2 > size:
+                continue
+
+            length = data[position] | data[position + 1] << 8
+            record = position + 2
+            position = record + length
+            # skip the nested blocks following the record
+            if code in (__DEFINE_FUNCTION__, __DEFINE_FUNCTION_2__):
+                position = position + (
+                    data[position - 2] | data[position - 1] << 8
+                )
+            elif code == __TRY__:
+                for idx in range(record + 1, record + 7, 2):
+                    position = position + (data[idx] | data[idx + 1] << 8)
+
+        return cls(
+            offsets=offsets,
+            codes=codes,
+        )
+
+    def find(self, offset):
+        idx = bisect_left(self.offsets, offset)
+        if idx == len(self.offsets) or self.offsets[idx] != offset:
+            return None
+
+        return idx
+
+    def __len__(self):
+        return len(self.offsets)
+
+
+class ActionBlock(Sequence):
+    """Actions over a slice of the body, decoded on first access."""
+    # weak referenced by the control flow graphs cache
+    __slots__ = ('data', 'offset', 'constant_pool', 'encoding', '_actions',
+                 '_index', '_decoded', '__weakref__')
+
+    def __init__(self, data, offset, constant_pool=None, encoding='utf-8'):
+        self.data = data
+        self.offset = offset
+        self.constant_pool = constant_pool
+        self.encoding = encoding
+        self._actions = None
+        self._index = None
+        # index -> action decoded by `unpack_action`
+        self._decoded = {}
+
+    @classmethod
+    def unpack(cls, size, stream, offset):
+        return cls(
+            data=stream.read_view(size),
+            offset=offset,
+            encoding=stream.encoding,
+        )
+
+    @property
+    def actions(self):
+        if self._actions is None:
+            decoder = Decoder(self.constant_pool, self.offset)
+            self._actions = decoder.unpack_actions(
+                Stream(self.data, encoding=self.encoding), len(self.data)
+            )
+
+        return self._actions
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = ActionIndex.build(self.data, self.offset)
+
+        return self._index
+
+    @property
+    def is_decoded(self):
+        return self._actions is not None
+
+    def find(self, offset):
+        """Index of the action starting at `offset`, e.g. a jump target."""
+        return self.index.find(offset)
+
+    def unpack_action(self, idx):
+        """Decode a single action without decoding the whole block."""
+        if idx in self._decoded:
+            return self._decoded[idx]
+
+        index = self.index
+        offsets = index.offsets
+
+        # the active constant pool is the last one defined before `idx`
+        constant_pool = self.constant_pool
+        pool_idx = _rfind(index.codes, __CONSTANT_POOL__, idx)
+        if pool_idx is not None:
+            constant_pool = self.unpack_action(pool_idx).constant_pool
+
+        decoder = Decoder(constant_pool, offsets[idx])
+        action = decoder.unpack(self._stream(offsets[idx]))
+        self._decoded[idx] = action
+        return action
+
+    def _stream(self, offset):
+        """Stream over the data from the action at `offset`, uncopied."""
+        return Stream.from_buffer(
+            memoryview(self.data)[offset - self.offset:],
+            encoding=self.encoding,
+        )
+
+    def __getitem__(self, idx):
+        if self._actions is not None or isinstance(idx, slice):
+            return self.actions[idx]
+
+        return self.unpack_action(range(len(self.index))[idx])
+
+    def __iter__(self):
+        return iter(self.actions)
+
+    def __len__(self):
+        if self._actions is not None:
+            return len(self._actions)
+
+        return len(self.index)
+
+    def __eq__(self, other):
+        # the same actions at another offset are equal, e.g. across builds
+        if not isinstance(other, ActionBlock):
+            return NotImplemented
+
+        return self.data == other.data
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}(offset={self.offset}, " \
+               f"size={len(self.data)})"
+
+
+def _rfind(codes, code, end):
+    for idx in range(end - 1, -1, -1):
+        if codes[idx] == code:
+            return idx
+
+    return None
+
 #### SWF 3 Actions ####
-@dataclass
 @register_action(code=0x81)
+@dataclass(slots=True)
 class GotoFrame(Action):
     frame: int
 
@@ -76,8 +296,8 @@ class GotoFrame(Action):
         )
 
 
-@dataclass
 @register_action(code=0x83)
+@dataclass(slots=True)
 class GetURL(Action):
     url: str
     target: str
@@ -94,44 +314,44 @@ class GetURL(Action):
         )
 
 
-@dataclass
 @register_action(code=0x04)
+@dataclass(slots=True)
 class NextFrame(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x05)
+@dataclass(slots=True)
 class PreviousFrame(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x06)
+@dataclass(slots=True)
 class Play(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x07)
+@dataclass(slots=True)
 class Stop(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x08)
+@dataclass(slots=True)
 class ToggleQuality(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x09)
+@dataclass(slots=True)
 class StopSounds(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x8a)
+@dataclass(slots=True)
 class WaitForFrame(Action):
     frame: int
     skip_count: int
@@ -148,8 +368,8 @@ class WaitForFrame(Action):
         )
 
 
-@dataclass
 @register_action(code=0x8b)
+@dataclass(slots=True)
 class SetTarget(Action):
     name: str
 
@@ -163,8 +383,8 @@ class SetTarget(Action):
         )
 
 
-@dataclass
 @register_action(code=0x8c)
+@dataclass(slots=True)
 class GoToLabel(Action):
     label: str
 
@@ -180,169 +400,209 @@ class GoToLabel(Action):
 
 
 #### SWF 4 Actions ####
-@dataclass
+class Constant(str):
+    """Constant pool entry pushed by index, resolved to its string."""
+
+    def __new__(cls, value, index):
+        constant = super().__new__(cls, value)
+        constant.index = index
+        return constant
+
+
+def _read_none(_stream):
+    return None
+
+
+def _read_double(stream):
+    # the two 32-bit halves of a pushed double are swapped
+    high = stream.read_bytes(4, to_int=False)
+    low = stream.read_bytes(4, to_int=False)
+    [value] = unpack_bytes(fmt='d', buffer=low + high)
+    return value
+
+
+# indexed by `ValueType` value
+__VALUE_TYPES__ = tuple(ValueType)
+__VALUE_READERS__ = (
+    Stream.read_cstring,  # STRING
+    Stream.read_float,  # FLOAT
+    _read_none,  # NULL
+    _read_none,  # UNDEFINED
+    Stream.read_uint8,  # REGISTER
+    Stream.read_bool,  # BOOL
+    _read_double,  # DOUBLE
+    Stream.read_uint32,  # INTEGER
+    Stream.read_uint8,  # CONSTANT_8
+    Stream.read_uint16,  # CONSTANT_16
+)
+__CONSTANT_TYPES__ = (ValueType.CONSTANT_8, ValueType.CONSTANT_16)
+
+
 @register_action(code=0x96)
+@dataclass(slots=True)
 class Push(Action):
     values: list[tuple[ValueType, Any]]
 
     @classmethod
     def unpack(cls, header, stream):
         values = []
-        position = stream.byte_position
-        while stream.byte_position < position + header.length:
-            type = ValueType(stream.read_uint8())
-            value = {
-                ValueType.STRING: stream.read_cstring,
-                ValueType.FLOAT: stream.read_float,
-                ValueType.REGISTER: stream.read_uint8,
-                ValueType.BOOL: stream.read_bool,
-                ValueType.DOUBLE: stream.read_double,
-                ValueType.INTEGER: stream.read_uint32,
-                ValueType.CONSTANT_8: stream.read_uint8,
-                ValueType.CONSTANT_16: stream.read_uint16,
-            }.get(type, lambda: None)()
-
-            values.append((type, value))
+        end = stream.byte_position + header.length
+        while stream.byte_position < end:
+            type = stream.read_uint8()
+            if type >= len(__VALUE_READERS__):
+                # unknown value type, its size can't be known
+                stream.seek_bytes(end)
+                break
+
+            values.append(
+                (__VALUE_TYPES__[type], __VALUE_READERS__[type](stream))
+            )
 
         return cls(
+            header=header,
             values=values,
         )
 
+    def resolve(self, constant_pool):
+        for idx, (type, value) in enumerate(self.values):
+            if type in __CONSTANT_TYPES__ and value < len(constant_pool):
+                self.values[idx] = (type, Constant(constant_pool[value], value))
+
 
-@dataclass
 @register_action(code=0x17)
+@dataclass(slots=True)
 class Pop(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x0a)
+@dataclass(slots=True)
 class Add(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x0b)
+@dataclass(slots=True)
 class Substract(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x0c)
+@dataclass(slots=True)
 class Multiply(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x0d)
+@dataclass(slots=True)
 class Divide(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x0e)
+@dataclass(slots=True)
 class Equals(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x0f)
+@dataclass(slots=True)
 class Less(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x10)
+@dataclass(slots=True)
 class And(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x11)
+@dataclass(slots=True)
 class Or(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x12)
+@dataclass(slots=True)
 class Not(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x13)
+@dataclass(slots=True)
 class StringEquals(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x14)
+@dataclass(slots=True)
 class StringLength(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x21)
+@dataclass(slots=True)
 class StringAdd(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x15)
+@dataclass(slots=True)
 class StringExtract(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x29)
+@dataclass(slots=True)
 class StringLess(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x31)
+@dataclass(slots=True)
 class MBStringLength(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x35)
+@dataclass(slots=True)
 class MBStringExtract(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x18)
+@dataclass(slots=True)
 class ToInteger(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x32)
+@dataclass(slots=True)
 class CharToAscii(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x33)
+@dataclass(slots=True)
 class AsciiToChart(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x36)
+@dataclass(slots=True)
 class MBCharToAscii(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x37)
+@dataclass(slots=True)
 class MBAsciiToChart(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x99)
+@dataclass(slots=True)
 class Jump(Action):
     offset: int
 
@@ -355,9 +615,14 @@ class Jump(Action):
             offset=offset,
         )
 
+    @property
+    def target(self):
+        # branch offsets are relative to the next action
+        return self.header.end + self.offset
+
 
-@dataclass
 @register_action(code=0x9d)
+@dataclass(slots=True)
 class If(Action):
     offset: int
 
@@ -370,27 +635,32 @@ class If(Action):
             offset=offset,
         )
 
+    @property
+    def target(self):
+        # branch offsets are relative to the next action
+        return self.header.end + self.offset
+
 
-@dataclass
 @register_action(code=0x9e)
+@dataclass(slots=True)
 class Call(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x1c)
+@dataclass(slots=True)
 class GetVariable(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x1d)
+@dataclass(slots=True)
 class SetVariable(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x9a)
+@dataclass(slots=True)
 class GetURL2(Action):
     send_vars_method: VarsMethod
     load_target: bool
@@ -411,8 +681,8 @@ class GetURL2(Action):
         )
 
 
-@dataclass
 @register_action(code=0x9f)
+@dataclass(slots=True)
 class GotoFrame2(Action):
     play: bool
     scene_bias: int
@@ -433,50 +703,50 @@ class GotoFrame2(Action):
         )
 
 
-@dataclass
 @register_action(code=0x20)
+@dataclass(slots=True)
 class SetTarget2(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x22)
+@dataclass(slots=True)
 class GetProperty(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x23)
+@dataclass(slots=True)
 class SetProperty(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x24)
+@dataclass(slots=True)
 class CloneSprite(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x25)
+@dataclass(slots=True)
 class RemoveSprite(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x27)
+@dataclass(slots=True)
 class StartDrag(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x28)
+@dataclass(slots=True)
 class EndDrag(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x8d)
+@dataclass(slots=True)
 class WaitForFrame2(Action):
     skip_count: int
 
@@ -490,45 +760,46 @@ class WaitForFrame2(Action):
         )
 
 
-@dataclass
 @register_action(code=0x26)
+@dataclass(slots=True)
 class Trace(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x34)
+@dataclass(slots=True)
 class GetTime(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x30)
+@dataclass(slots=True)
 class RandomNumber(Action):
     pass
 
 
 #### SWF 5 Actions ####
-@dataclass
 @register_action(code=0x3d)
+@dataclass(slots=True)
 class CallFunction(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x52)
+@dataclass(slots=True)
 class CallMethod(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x88)
+@dataclass(slots=True)
 class ConstantPool(Action):
-    constant_pool: str
+    constant_pool: list[str]
 
     @classmethod
     def unpack(cls, header, stream):
-        constant_pool = stream.read_string()
+        count = stream.read_uint16()
+        constant_pool = [stream.read_cstring() for _ in range(count)]
 
         return cls(
             header=header,
@@ -536,107 +807,117 @@ class ConstantPool(Action):
         )
 
 
-@dataclass
 @register_action(code=0x9b)
+@dataclass(slots=True)
 class DefineFunction(Action):
     name: str
     params: list[str]
     code_size: int
+    body: ActionBlock
 
     @classmethod
     def unpack(cls, header, stream):
         name = stream.read_cstring()
         count = stream.read_uint16()
         params = [stream.read_cstring() for _ in range(count)]
-    
+        code_size = stream.read_uint16()
+        # the function body follows the action record
+        body = ActionBlock.unpack(code_size, stream, header.end)
+
         return cls(
             header=header,
             name=name,
             params=params,
+            code_size=code_size,
+            body=body,
         )
 
+    @property
+    def blocks(self):
+        return (self.body,)
+
 
-@dataclass
 @register_action(code=0x3c)
+@dataclass(slots=True)
 class DefineLocal(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x41)
+@dataclass(slots=True)
 class DefineLocal2(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x3a)
+@dataclass(slots=True)
 class Delete(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x3b)
+@dataclass(slots=True)
 class Delete2(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x46)
+@dataclass(slots=True)
 class Enumerate(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x49)
+@dataclass(slots=True)
 class Equals2(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x4e)
+@dataclass(slots=True)
 class GetMember(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x42)
+@dataclass(slots=True)
 class InitArray(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x43)
+@dataclass(slots=True)
 class InitObject(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x53)
+@dataclass(slots=True)
 class NewMethod(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x40)
+@dataclass(slots=True)
 class NewObject(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x4f)
+@dataclass(slots=True)
 class SetMember(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x45)
+@dataclass(slots=True)
 class TargetPath(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x94)
-class NewMethod(Action):
+@dataclass(slots=True)
+class With(Action):
     size: int
 
     @classmethod
@@ -649,116 +930,110 @@ class NewMethod(Action):
         )
 
 
-@dataclass
-@register_action(code=0x53)
-class NewMethod(Action):
-    pass
-
-
-@dataclass
 @register_action(code=0x4a)
+@dataclass(slots=True)
 class ToNumber(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x4b)
+@dataclass(slots=True)
 class ToString(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x44)
+@dataclass(slots=True)
 class TypeOf(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x47)
+@dataclass(slots=True)
 class Add2(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x48)
+@dataclass(slots=True)
 class Less2(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x3f)
+@dataclass(slots=True)
 class Modulo(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x60)
+@dataclass(slots=True)
 class BitAnd(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x63)
+@dataclass(slots=True)
 class BitLShift(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x61)
+@dataclass(slots=True)
 class BitOr(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x64)
+@dataclass(slots=True)
 class BitRShift(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x65)
+@dataclass(slots=True)
 class BitURShift(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x62)
+@dataclass(slots=True)
 class BitXor(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x51)
+@dataclass(slots=True)
 class Decrement(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x50)
+@dataclass(slots=True)
 class Increment(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x4c)
+@dataclass(slots=True)
 class Push2(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x3e)
+@dataclass(slots=True)
 class Return(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x4d)
+@dataclass(slots=True)
 class StackSwap(Action):
     pass
 
 
-@dataclass
-@register_action(code=0x3e)
+@register_action(code=0x87)
+@dataclass(slots=True)
 class StoreRegister(Action):
     register_number: int
 
@@ -773,38 +1048,38 @@ class StoreRegister(Action):
 
 
 #### SWF 6 Actions ####
-@dataclass
 @register_action(code=0x54)
+@dataclass(slots=True)
 class InstanceOf(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x55)
+@dataclass(slots=True)
 class Enumerate2(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x66)
+@dataclass(slots=True)
 class StrictEquals(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x67)
+@dataclass(slots=True)
 class Greater(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x68)
+@dataclass(slots=True)
 class StringGreater(Action):
     pass
 
 
 #### SWF 7 Actions ####
-@dataclass
+@dataclass(slots=True)
 class RegisterParam:
     register: int
     name: str
@@ -820,8 +1095,8 @@ class RegisterParam:
         )
 
 
-@dataclass
 @register_action(code=0x8e)
+@dataclass(slots=True)
 class DefineFunction2(Action):
     name: str
     register_count: int
@@ -837,24 +1112,22 @@ class DefineFunction2(Action):
     preload_global: bool
     params: list[RegisterParam]
     code_size: int
+    body: ActionBlock
 
     @classmethod
     def unpack(cls, header, stream):
         name = stream.read_cstring()
         param_count = stream.read_uint16()
         register_count = stream.read_uint8()
-        preload_parent = stream.read_bit_bool()
-        preload_root = stream.read_bit_bool()
-        suppress_super = stream.read_bit_bool()
-        preload_super = stream.read_bit_bool()
-        suppress_arguments = stream.read_bit_bool()
-        preload_arguments = stream.read_bit_bool()
-        suppress_this = stream.read_bit_bool()
-        preload_this = stream.read_bit_bool()
-        stream.read_ubits(7)  # reserved always 0
-        preload_global = stream.read_bit_bool()
+        (
+            preload_parent, preload_root, suppress_super, preload_super,
+            suppress_arguments, preload_arguments, suppress_this,
+            preload_this, preload_global,
+        ) = stream.read_layout(__DEFINE_FUNCTION_2_FLAGS__)
         params = [RegisterParam.unpack(stream) for _ in range(param_count)]
         code_size = stream.read_uint16()
+        # the function body follows the action record
+        body = ActionBlock.unpack(code_size, stream, header.end)
 
         return cls(
             header=header,
@@ -871,29 +1144,34 @@ class DefineFunction2(Action):
             preload_global=preload_global,
             params=params,
             code_size=code_size,
+            body=body,
         )
 
+    @property
+    def blocks(self):
+        return (self.body,)
+
 
-@dataclass
 @register_action(code=0x69)
+@dataclass(slots=True)
 class Extends(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x2b)
+@dataclass(slots=True)
 class CastOp(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x2c)
+@dataclass(slots=True)
 class ImplementsOp(Action):
     pass
 
 
-@dataclass
 @register_action(code=0x8f)
+@dataclass(slots=True)
 class Try(Action):
     # reserved: int
     catch_in_register: bool
@@ -901,28 +1179,28 @@ class Try(Action):
     catch_block: bool
     catch_name: str
     catch_register: str
-    try_body: list[int]
-    catch_body: list[int]
-    finally_body: list[int]
+    try_body: ActionBlock
+    catch_body: ActionBlock
+    finally_body: ActionBlock
 
     @classmethod
     def unpack(cls, header, stream):
-        stream.read_ubits(5)  # reserved always 0
-        catch_in_register = stream.read_bit_bool()
-        finally_block = stream.read_bit_bool()
-        catch_block = stream.read_bit_bool()
-        try_size = stream.read_uint16()
-        catch_size = stream.read_uint16()
-        finally_size = stream.read_uint16()
+        catch_in_register, finally_block, catch_block = \
+            stream.read_layout(__TRY_FLAGS__)
+        try_size, catch_size, finally_size = stream.read_uint16_array(3)
         catch_register = -1
         catch_name = ''
         if catch_in_register:
             catch_register = stream.read_uint8()
         else:
             catch_name = stream.read_cstring()
-        try_body = [stream.read_uint8() for _ in range(try_size)]
-        catch_body = [stream.read_uint8() for _ in range(catch_size)]
-        finally_body = [stream.read_uint8() for _ in range(finally_size)]
+        # the bodies follow the action record
+        offset = header.end
+        try_body = ActionBlock.unpack(try_size, stream, offset)
+        offset = offset + try_size
+        catch_body = ActionBlock.unpack(catch_size, stream, offset)
+        offset = offset + catch_size
+        finally_body = ActionBlock.unpack(finally_size, stream, offset)
 
         return cls(
             header=header,
@@ -936,15 +1214,19 @@ class Try(Action):
             finally_body=finally_body,
         )
 
+    @property
+    def blocks(self):
+        return (self.try_body, self.catch_body, self.finally_body)
+
 
 
-@dataclass
 @register_action(code=0x2a)
+@dataclass(slots=True)
 class Throw(Action):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ClipAction:
     events: Events
     key_code: int
@@ -959,10 +1241,7 @@ class ClipAction:
             key_code = stream.read_uint8()
             size = size - 1
 
-        actions = []
-        position = stream.byte_position
-        while stream.byte_position < position + size:
-            actions.append(unpack(stream))
+        actions = Decoder().unpack_actions(stream, size)
 
         return cls(
             events=events,
@@ -971,7 +1250,7 @@ class ClipAction:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ClipActions:
     # reserved: int
     events: Events
@@ -0,0 +1,116 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import aclosing
+import pickle
+
+from stream import Stream
+from swf.file import File, unpack_body
+from swf.parallel import decode_range, dumps, tag_positions, tag_ranges
+
+
+# bytes of tags decoded per executor job
+__CHUNK_SIZE__ = 1 << 18
+# jobs submitted ahead of the consumer
+__PREFETCH__ = 2
+
+__EXECUTOR__ = None
+
+
+def shared_executor():
+    """Process pool shared by the requests not given an executor."""
+    global __EXECUTOR__
+    if __EXECUTOR__ is None:
+        __EXECUTOR__ = ProcessPoolExecutor()
+
+    return __EXECUTOR__
+
+
+def _open(path, chunk_size):
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    header, stream = unpack_body(Stream(data))
+    ranges = tag_ranges(tag_positions(stream), chunk_size)
+    return header, stream, ranges
+
+
+def _decode_pickled(version, encoding, data, origin):
+    return dumps(decode_range(version, encoding, data, origin))
+
+
+async def _chunks(header, stream, ranges, executor, prefetch):
+    loop = asyncio.get_running_loop()
+    body = memoryview(stream.buffer)
+    # process pools get copies of the ranges and send the tags pickled
+    pickled = isinstance(executor, ProcessPoolExecutor)
+
+    def submit(start, end):
+        if pickled:
+            return loop.run_in_executor(
+                executor, _decode_pickled, header.version, stream.encoding,
+                bytes(body[start:end]), start,
+            )
+        return loop.run_in_executor(
+            executor, decode_range, header.version, stream.encoding,
+            body[start:end], start,
+        )
+
+    ranges = iter(ranges)
+    pending = deque()
+    try:
+        for start, end in ranges:
+            pending.append(submit(start, end))
+            if len(pending) >= prefetch:
+                break
+
+        while pending:
+            tags = await pending.popleft()
+            # the next job is only submitted once the consumer caught up
+            for start, end in ranges:
+                pending.append(submit(start, end))
+                break
+            yield pickle.loads(tags) if pickled else tags
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def aiter_tags(path, executor=None, chunk_size=__CHUNK_SIZE__,
+                     prefetch=__PREFETCH__):
+    """Tags of the SWF at `path` up to End, decoded by `executor`.
+
+    Reading and decompressing run in the loop's default executor, tags are
+    decoded in jobs of about `chunk_size` bytes, at most `prefetch` jobs
+    ahead of the consumer. Process pools send payloads as bytes instead of
+    views of the body.
+    """
+    executor = executor or shared_executor()
+    loop = asyncio.get_running_loop()
+    header, stream, ranges = await loop.run_in_executor(
+        None, _open, path, chunk_size
+    )
+
+    chunks = _chunks(header, stream, ranges, executor, prefetch)
+    # the pending jobs are cancelled as soon as the consumer stops
+    async with aclosing(chunks):
+        async for tags in chunks:
+            for tag in tags:
+                yield tag
+
+
+async def parse(path, executor=None, chunk_size=__CHUNK_SIZE__,
+                prefetch=__PREFETCH__):
+    executor = executor or shared_executor()
+    loop = asyncio.get_running_loop()
+    header, stream, ranges = await loop.run_in_executor(
+        None, _open, path, chunk_size
+    )
+
+    tags = []
+    chunks = _chunks(header, stream, ranges, executor, prefetch)
+    async with aclosing(chunks):
+        async for chunk in chunks:
+            tags.extend(chunk)
+
+    return File.from_tags(header, tags, memoryview(stream.buffer))
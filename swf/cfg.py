@@ -0,0 +1,141 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from weakref import finalize, ref
+
+from swf.actions import Action, If, Jump, Return, Throw, WaitForFrame, \
+                        WaitForFrame2
+
+
+__END__ = 0x00
+
+# id of an action block -> graph, dropped with the block. Blocks are
+# keyed by identity, equal blocks at other offsets have other graphs.
+__GRAPHS__ = {}
+
+
+def build(actions):
+    """Control flow graph of an `ActionBlock`, cached per block."""
+    key = id(actions)
+    graph = __GRAPHS__.get(key)
+    if graph is None:
+        graph = __GRAPHS__[key] = ControlFlowGraph.build(actions)
+        finalize(actions, __GRAPHS__.pop, key, None)
+
+    return graph
+
+
+@dataclass
+class BasicBlock:
+    # action indexes in the action block, `end` excluded
+    start: int
+    end: int
+    offset: int
+    actions: list[Action]
+    # indexes in `ControlFlowGraph.blocks`
+    successors: list[int] = field(default_factory=list)
+    predecessors: list[int] = field(default_factory=list)
+
+
+class ControlFlowGraph:
+    def __init__(self, actions, blocks):
+        # weak, the graph is the block's value in `__GRAPHS__`
+        self._actions = ref(actions)
+        self.offset = actions.offset
+        self.blocks = blocks
+        self._offsets = [block.offset for block in blocks]
+        self._nested = None
+
+    @property
+    def actions(self):
+        """The `ActionBlock` of the graph, None once it's collected."""
+        return self._actions()
+
+    @classmethod
+    def build(cls, actions):
+        decoded = list(actions)
+        codes = actions.index.codes
+        offsets = actions.index.offsets
+        count = len(decoded)
+
+        # action index -> successor action indexes, for actions that
+        # don't fall through to the next one
+        branches = {}
+        leaders = {0}
+        for idx, action in enumerate(decoded):
+            if isinstance(action, Jump):
+                targets = [actions.find(action.target)]
+            elif isinstance(action, If):
+                targets = [actions.find(action.target), idx + 1]
+            elif isinstance(action, (WaitForFrame, WaitForFrame2)):
+                # the skipped actions only run once the frame is loaded
+                targets = [idx + 1, idx + 1 + action.skip_count]
+            elif isinstance(action, (Return, Throw)) or codes[idx] == __END__:
+                targets = []
+            else:
+                continue
+
+            targets = [target for target in targets
+                       if target is not None and target < count]
+            branches[idx] = targets
+            leaders.update(targets)
+            leaders.add(idx + 1)
+
+        leaders = sorted(leader for leader in leaders if leader < count)
+        block_idx = {leader: idx for idx, leader in enumerate(leaders)}
+
+        blocks = []
+        for idx, start in enumerate(leaders):
+            end = leaders[idx + 1] if idx + 1 < len(leaders) else count
+            blocks.append(BasicBlock(
+                start=start,
+                end=end,
+                offset=offsets[start],
+                actions=decoded[start:end],
+            ))
+
+        for idx, block in enumerate(blocks):
+            targets = branches.get(block.end - 1)
+            if targets is None:
+                targets = [block.end] if block.end < count else []
+
+            for target in targets:
+                successor = block_idx[target]
+                block.successors.append(successor)
+                blocks[successor].predecessors.append(idx)
+
+        return cls(
+            actions=actions,
+            blocks=blocks,
+        )
+
+    @property
+    def nested(self):
+        """Graphs of function and try bodies, by action index."""
+        if self._nested is None:
+            self._nested = {
+                block.start + idx: tuple(build(body) for body in action.blocks)
+                for block in self.blocks
+                for idx, action in enumerate(block.actions)
+                if isinstance(getattr(action, 'blocks', None), tuple)
+            }
+
+        return self._nested
+
+    def find(self, offset):
+        """Basic block starting at `offset`."""
+        offsets = self._offsets
+        idx = bisect_left(offsets, offset)
+        if idx == len(offsets) or offsets[idx] != offset:
+            return None
+
+        return self.blocks[idx]
+
+    def walk(self):
+        yield self
+        for graphs in self.nested.values():
+            for graph in graphs:
+                yield from graph.walk()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(offset={self.offset}, " \
+               f"blocks={len(self.blocks)})"
@@ -0,0 +1,373 @@
+"""Local parse daemon answering JSON-RPC requests over a Unix socket.
+
+    python -m swf.daemon /tmp/swf.sock --workers 4
+
+Requests and responses are JSON-RPC 2.0 objects, one per line. Files are
+parsed by a pool of warm worker processes, and the parsed files are kept
+in a LRU cache keyed by content hash, bounded by their memory usage.
+"""
+import argparse
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+import hashlib
+import json
+import os
+import pickle
+import signal
+import socket
+import time
+
+from stream import Stream
+from swf.file import File
+from swf.memory import memory_report
+from swf.parallel import dumps
+from swf.symbols import swf_symbols
+
+
+# bytes of parsed files kept in the cache
+__CACHE_SIZE__ = 256 << 20
+# file keys whose content hash is remembered
+__HASHES_SIZE__ = 4096
+
+__PARSE_ERROR__ = -32700
+__INVALID_REQUEST__ = -32600
+__METHOD_NOT_FOUND__ = -32601
+__INVALID_PARAMS__ = -32602
+__SERVER_ERROR__ = -32000
+
+
+class DaemonError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+@dataclass
+class Latency:
+    count: int = 0
+    # seconds
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+
+
+@dataclass
+class Parsed:
+    """Parsed file with the results computed once by the worker."""
+    swf: File
+    symbols: list
+    # bytes, from its memory report once unpickled, where the tag
+    # payloads are copies instead of views of the body
+    size: int = 0
+
+
+class Cache:
+    """LRU of parsed files bounded by their total memory usage."""
+
+    def __init__(self, size=__CACHE_SIZE__):
+        self.size = size
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # hash -> (value, size)
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, size):
+        if key in self._entries:
+            self.used -= self._entries.pop(key)[1]
+        if size > self.size:
+            return
+
+        self._entries[key] = (value, size)
+        self.used += size
+        while self.used > self.size:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.used -= evicted
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _warm():
+    # the modules and tag registries are imported with this one
+    return os.getpid()
+
+
+def _parse(data):
+    swf = File.unpack(Stream(data))
+    return dumps(Parsed(swf, sorted(swf_symbols(swf))))
+
+
+def _loads(data):
+    parsed = pickle.loads(data)
+    parsed.swf.body = memoryview(parsed.swf.body)
+    parsed.size = memory_report(parsed.swf).total
+    return parsed
+
+
+def _key(path):
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+def _read(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def _header(parsed):
+    return asdict(parsed.swf.header)
+
+
+def _tags(parsed):
+    swf = parsed.swf
+    return [
+        {
+            'code': tag.header.code,
+            'name': type(tag).__name__,
+            'offset': tag.header.offset,
+            'length': tag.header.length,
+        }
+        for tag in swf.tags if tag is not None
+    ]
+
+
+def _symbols(parsed):
+    return parsed.symbols
+
+
+__FILE_METHODS__ = {
+    'header': _header,
+    'tags': _tags,
+    'symbols': _symbols,
+}
+
+
+class Daemon:
+    def __init__(self, path, workers=None, cache_size=__CACHE_SIZE__):
+        self.path = path
+        self.workers = workers or os.cpu_count()
+        self.cache = Cache(cache_size)
+        self.latencies = {}
+        self._pool = None
+        # (path, size, mtime) -> content hash, least recently used first
+        self._hashes = OrderedDict()
+        # hash -> future of the parse in progress
+        self._parsing = {}
+
+    async def serve(self):
+        self._pool = ProcessPoolExecutor(self.workers)
+        loop = asyncio.get_running_loop()
+        # start the workers now rather than on the first requests
+        await asyncio.gather(*(
+            loop.run_in_executor(self._pool, _warm)
+            for _ in range(self.workers)
+        ))
+
+        server = await asyncio.start_unix_server(self._serve, self.path)
+        loop.add_signal_handler(
+            signal.SIGTERM, asyncio.current_task().cancel
+        )
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    async def _serve(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                response = await self.handle(line)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def handle(self, line):
+        start = time.perf_counter()
+        id = None
+        method = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                raise DaemonError(__PARSE_ERROR__, str(e))
+            if not isinstance(request, dict):
+                raise DaemonError(__INVALID_REQUEST__, 'not an object')
+
+            id = request.get('id')
+            method = request.get('method')
+            params = request.get('params', {})
+            if not isinstance(params, dict):
+                raise DaemonError(__INVALID_PARAMS__, 'params not an object')
+
+            result = await self.call(method, params)
+            response = {'jsonrpc': '2.0', 'id': id, 'result': result}
+        except DaemonError as e:
+            response = {
+                'jsonrpc': '2.0', 'id': id,
+                'error': {'code': e.code, 'message': str(e)},
+            }
+        except Exception as e:
+            response = {
+                'jsonrpc': '2.0', 'id': id,
+                'error': {
+                    'code': __SERVER_ERROR__,
+                    'message': f"{type(e).__name__}: {e}",
+                },
+            }
+
+        latency = self.latencies.setdefault(str(method), Latency())
+        latency.add(time.perf_counter() - start)
+        return response
+
+    async def call(self, method, params):
+        if method == 'ping':
+            return 'pong'
+        if method == 'metrics':
+            return self.metrics()
+        if method not in __FILE_METHODS__:
+            raise DaemonError(__METHOD_NOT_FOUND__, f"no method {method}")
+        if not isinstance(params.get('path'), str):
+            raise DaemonError(__INVALID_PARAMS__, 'path missing')
+
+        parsed = await self.file(params['path'])
+        return __FILE_METHODS__[method](parsed)
+
+    async def file(self, path):
+        loop = asyncio.get_running_loop()
+        key = await loop.run_in_executor(None, _key, path)
+
+        hash = self._hashes.get(key)
+        if hash is not None:
+            self._hashes.move_to_end(key)
+            parsed = self.cache.get(hash)
+            if parsed is not None:
+                return parsed
+
+        # the parsed file is keyed by the hash of the data it comes from,
+        # the file may have changed since it was hashed
+        data, read_hash = await loop.run_in_executor(None, _read, path)
+        if read_hash != hash:
+            hash = self._hashes[key] = read_hash
+            if len(self._hashes) > __HASHES_SIZE__:
+                self._hashes.popitem(last=False)
+            parsed = self.cache.get(hash)
+            if parsed is not None:
+                return parsed
+
+        future = self._parsing.get(hash)
+        if future is None:
+            future = self._parsing[hash] = loop.create_task(
+                self._parse(hash, data)
+            )
+            future.add_done_callback(lambda _: self._parsing.pop(hash))
+
+        return await future
+
+    async def _parse(self, hash, data):
+        loop = asyncio.get_running_loop()
+        parsed = await loop.run_in_executor(
+            None, _loads,
+            await loop.run_in_executor(self._pool, _parse, data),
+        )
+        self.cache.put(hash, parsed, parsed.size)
+        return parsed
+
+    def metrics(self):
+        cache = self.cache
+        return {
+            'cache': {
+                'entries': len(cache),
+                'bytes': cache.used,
+                'size': cache.size,
+                'hits': cache.hits,
+                'misses': cache.misses,
+                'evictions': cache.evictions,
+            },
+            'latency': {
+                method: asdict(latency)
+                for method, latency in self.latencies.items()
+            },
+        }
+
+
+class Client:
+    """Blocking client of a `Daemon`, keeping its connection open.
+
+        with Client('/tmp/swf.sock') as client:
+            client.call('tags', path='movie.swf')
+    """
+
+    def __init__(self, path):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self._file = self.socket.makefile('rwb')
+        self._id = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def call(self, method, **params):
+        self._id += 1
+        request = {
+            'jsonrpc': '2.0', 'id': self._id,
+            'method': method, 'params': params,
+        }
+        self._file.write(json.dumps(request).encode() + b'\n')
+        self._file.flush()
+
+        response = json.loads(self._file.readline())
+        if 'error' in response:
+            error = response['error']
+            raise DaemonError(error['code'], error['message'])
+
+        return response['result']
+
+    def close(self):
+        self._file.close()
+        self.socket.close()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m swf.daemon')
+    parser.add_argument('socket')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--cache-size', type=int, default=__CACHE_SIZE__,
+                        help='bytes of parsed files kept in memory')
+    args = parser.parse_args(args)
+
+    daemon = Daemon(args.socket, args.workers, args.cache_size)
+    try:
+        asyncio.run(daemon.serve())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == '__main__':
+    main()
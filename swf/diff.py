@@ -0,0 +1,312 @@
+from collections import Counter
+from dataclasses import dataclass, field, fields, is_dataclass
+
+from amv2.enums import ConstantKind
+from amv2.structs import ClassTrait, File as ABCFile, FunctionTrait, \
+                         MethodTrait, SlotTrait
+from stream import Stream
+from swf.file import unpack_body
+from swf.store import digest
+from swf.symbols import multiname_name
+from swf.tags import __CHARACTER_TAGS__, DoABC, unpack as unpack_tag, \
+                     walk as walk_tags
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+# constant kind -> pool of its values
+__CONSTANT_POOLS__ = {
+    ConstantKind.SINT.value: 'sintegers',
+    ConstantKind.UINT.value: 'uintegers',
+    ConstantKind.DOUBLE.value: 'doubles',
+    ConstantKind.UTF8.value: 'strings',
+}
+
+
+@dataclass
+class TagEntry:
+    code: int
+    # offset of the tag header in the decompressed body
+    position: int
+    length: int
+    hash: str
+    # (code, character id) or (code, occurrence) for control tags
+    key: tuple[int, int]
+
+
+@dataclass
+class Change:
+    kind: str
+    key: tuple[int, int]
+    # names of the differing fields, classes or methods
+    details: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Diff:
+    changes: list[Change]
+
+    @property
+    def is_empty(self):
+        return not self.changes
+
+
+class Build:
+    """Header-only view of a SWF, tags are only decoded on demand."""
+
+    def __init__(self, data):
+        self.header, self.stream = unpack_body(Stream(data))
+        self.body = memoryview(self.stream.buffer)
+        self.entries = self._scan()
+
+    def _scan(self):
+        entries = []
+        occurrences = Counter()
+
+        # sprites are compared whole, their control tags included
+        for position, header, _ in walk_tags(
+                self.stream, lambda header: False):
+            body = self.body[header.offset:header.offset + header.length]
+            if header.code in __CHARACTER_TAGS__ and header.length >= 2:
+                key = (header.code, body[0] | body[1] << 8)
+            else:
+                key = (header.code, occurrences[header.code])
+                occurrences[header.code] += 1
+
+            entries.append(TagEntry(
+                code=header.code,
+                position=position,
+                length=header.length,
+                hash=digest(body),
+                key=key,
+            ))
+
+        return entries
+
+    def unpack(self, entry):
+        self.stream.seek_bytes(entry.position)
+        return unpack_tag(self.header.version, self.stream)
+
+
+def diff(old_data, new_data):
+    old = Build(old_data)
+    new = Build(new_data)
+    old_entries = {entry.key: entry for entry in old.entries}
+    new_entries = {entry.key: entry for entry in new.entries}
+
+    changes = []
+    for key, entry in old_entries.items():
+        if key not in new_entries:
+            changes.append(Change(kind=REMOVED, key=key))
+            continue
+
+        new_entry = new_entries[key]
+        if entry.hash == new_entry.hash:
+            continue
+
+        old_tag = old.unpack(entry)
+        new_tag = new.unpack(new_entry)
+        if isinstance(old_tag, DoABC) and isinstance(new_tag, DoABC):
+            details = [
+                name for name in diff_fields(old_tag, new_tag)
+                if name != 'data'
+            ]
+            details += diff_abc(old_tag.data, new_tag.data)
+        else:
+            details = diff_fields(old_tag, new_tag)
+
+        # no details when equal once decoded, e.g. the same records
+        # written differently
+        changes.append(Change(kind=CHANGED, key=key, details=details))
+
+    for entry in new.entries:
+        if entry.key not in old_entries:
+            changes.append(Change(kind=ADDED, key=entry.key))
+
+    return Diff(
+        changes=changes,
+    )
+
+
+def diff_files(old_path, new_path):
+    with open(old_path, 'rb') as file:
+        old_data = file.read()
+    with open(new_path, 'rb') as file:
+        new_data = file.read()
+
+    return diff(old_data, new_data)
+
+
+def diff_fields(old, new):
+    if type(old) is not type(new):
+        return ['type']
+
+    if not is_dataclass(old):
+        return [] if same(old, new) else ['value']
+
+    return [
+        _field.name for _field in fields(old)
+        if _field.name != 'header' and not same(
+            getattr(old, _field.name), getattr(new, _field.name)
+        )
+    ]
+
+
+def same(old, new):
+    """Deep equality ignoring offsets, which shift between builds."""
+    if type(old) is not type(new):
+        return False
+
+    if is_dataclass(old):
+        return not diff_fields(old, new)
+    if isinstance(old, (list, tuple)):
+        return len(old) == len(new) and all(map(same, old, new))
+
+    return old == new
+
+
+def abc_constant(cpool, kind, idx):
+    """(kind, value) of a default or slot value."""
+    pool = __CONSTANT_POOLS__.get(kind)
+    if pool is None:
+        # true, false, null, undefined, or a namespace by its name
+        if idx == 0 or idx > len(cpool.namespaces):
+            return kind, None
+        return kind, abc_string(cpool, cpool.namespaces[idx - 1].name_idx)
+
+    values = getattr(cpool, pool)
+    if idx == 0 or idx > len(values):
+        return kind, None
+    return kind, values[idx - 1]
+
+
+def abc_string(cpool, idx):
+    if idx == 0 or idx > len(cpool.strings):
+        return None
+
+    return str(cpool.strings[idx - 1])
+
+
+def abc_traits(abc, traits):
+    """Traits with their constant pool indexes resolved, in order."""
+    cpool = abc.constants_pool
+    records = []
+    for trait in traits:
+        record = (
+            multiname_name(cpool, trait.name_idx), type(trait).__name__,
+            trait.attributes,
+        )
+        if isinstance(trait, SlotTrait):
+            record += (
+                trait.slot_id,
+                multiname_name(cpool, trait.type_name_idx),
+                abc_constant(cpool, trait.v_kind, trait.v_idx),
+            )
+        elif isinstance(trait, ClassTrait):
+            instance = abc.instances[trait.class_idx]
+            record += (
+                trait.slot_id, multiname_name(cpool, instance.name_idx),
+            )
+        elif isinstance(trait, FunctionTrait):
+            record += (trait.slot_id,)
+        elif isinstance(trait, MethodTrait):
+            record += (trait.disp_id,)
+        records.append(record)
+
+    return tuple(records)
+
+
+def abc_classes(abc):
+    """Qualified class name -> its instance and class records, with the
+    constant pool indexes resolved. Methods are compared by
+    `abc_methods`."""
+    cpool = abc.constants_pool
+    classes = {}
+    for instance, _class in zip(abc.instances, abc.classes):
+        protected_ns = None
+        if instance.protected_ns is not None:
+            protected_ns = abc_constant(
+                cpool, ConstantKind.PROTECTED_NS.value, instance.protected_ns
+            )
+        classes[multiname_name(cpool, instance.name_idx)] = (
+            multiname_name(cpool, instance.super_name_idx),
+            instance.flags,
+            protected_ns,
+            tuple(multiname_name(cpool, idx) for idx in instance.interfaces),
+            abc_traits(abc, instance.traits),
+            abc_traits(abc, _class.traits),
+        )
+
+    return classes
+
+
+def abc_signature(abc, method_idx):
+    """Parameter and return types, flags and defaults of a method."""
+    cpool = abc.constants_pool
+    method = abc.methods[method_idx]
+    return (
+        tuple(multiname_name(cpool, idx) for idx in method.param_types),
+        multiname_name(cpool, method.return_type),
+        method.flags,
+        tuple(
+            abc_constant(cpool, option.kind, option.value_idx)
+            for option in method.options
+        ),
+    )
+
+
+def abc_methods(abc):
+    """Qualified method name -> hashes of its body code and signature."""
+    cpool = abc.constants_pool
+    bodies = {body.method_idx: digest(body.code) for body in abc.method_bodies}
+
+    def traits_methods(owner, traits):
+        for trait in traits:
+            method_idx = getattr(trait, 'method_idx', None)
+            if method_idx is None:
+                method_idx = getattr(trait, 'function_idx', None)
+            if method_idx is not None:
+                name = multiname_name(cpool, trait.name_idx)
+                yield f"{owner}/{name}", method_idx
+
+    methods = {}
+    for instance, _class in zip(abc.instances, abc.classes):
+        owner = multiname_name(cpool, instance.name_idx)
+        methods[f"{owner}/iinit"] = instance.init_method_idx
+        methods[f"{owner}$/cinit"] = _class.init_method_idx
+        methods.update(traits_methods(owner, instance.traits))
+        methods.update(traits_methods(f"{owner}$", _class.traits))
+
+    for idx, script in enumerate(abc.scripts):
+        methods[f"script{idx}/init"] = script.init_method_idx
+        methods.update(traits_methods(f"script{idx}", script.traits))
+
+    return {
+        name: (bodies.get(method_idx), abc_signature(abc, method_idx))
+        for name, method_idx in methods.items()
+    }
+
+
+def diff_abc(old_data, new_data):
+    """Names of the classes and methods that differ between two ABCs."""
+    old_abc = ABCFile.unpack(Stream(old_data))
+    new_abc = ABCFile.unpack(Stream(new_data))
+
+    details = []
+    for old, new in (
+            (abc_classes(old_abc), abc_classes(new_abc)),
+            (abc_methods(old_abc), abc_methods(new_abc))):
+        for name in sorted(old.keys() | new.keys(), key=str):
+            if name not in new:
+                details.append(f"-{name}")
+            elif name not in old:
+                details.append(f"+{name}")
+            elif old[name] != new[name]:
+                details.append(f"~{name}")
+
+    if not details and not same(old_abc.constants_pool,
+                                new_abc.constants_pool):
+        details.append('constants_pool')
+
+    return details
@@ -57,3 +57,40 @@ class JoinStyleType:
     ROUND = 0
     BEVEL = 1
     MITER = 2
+
+
+class SoundFormat(Enum):
+    UNCOMPRESSED_NATIVE_ENDIAN = 0
+    ADPCM = 1
+    MP3 = 2
+    UNCOMPRESSED_LITTLE_ENDIAN = 3
+    NELLYMOSER_16KHZ = 4
+    NELLYMOSER_8KHZ = 5
+    NELLYMOSER = 6
+    SPEEX = 11
+
+
+class SoundRate(Enum):
+    KHZ_5_5 = 0
+    KHZ_11 = 1
+    KHZ_22 = 2
+    KHZ_44 = 3
+
+
+class SoundSize(Enum):
+    BITS_8 = 0
+    BITS_16 = 1
+
+
+class SoundType(Enum):
+    MONO = 0
+    STEREO = 1
+
+
+class VideoCodec(Enum):
+    SORENSON_H263 = 2
+    SCREEN_VIDEO = 3
+    VP6 = 4
+    VP6_ALPHA = 5
+    SCREEN_VIDEO_2 = 6
+    AVC = 7
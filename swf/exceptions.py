@@ -1,2 +1,6 @@
 class UnmatchedFileLength(Exception):
     pass
+
+
+class IncompleteFile(Exception):
+    pass
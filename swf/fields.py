@@ -0,0 +1,16 @@
+class EnumField:
+    """Enum member of the int stored in `field`, looked up on access.
+
+    Decoders store the raw value, None is returned for values the enum
+    doesn't define rather than failing the parse.
+    """
+
+    def __init__(self, enum, field):
+        self.members = {member.value: member for member in enum}
+        self.field = field
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        return self.members.get(getattr(instance, self.field))
@@ -1,8 +1,16 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from itertools import accumulate
+import mmap
+import os
+import zlib
 
 from stream import Stream
 from swf.exceptions import UnmatchedFileLength
-from swf.tags import End, Tag, unpack as unpack_tag
+from swf.index import InvalidSidecar, MediaIndex, Sidecar, TagIndex
+from swf.parallel import unpack_tags
+from swf.seekable import SeekableZlib
+from swf.tags import __TAGS__, End, ShowFrame, Tag, unpack as unpack_tag, \
+                     walk as walk_tags
 from swf.records import Rectangle
 
 
@@ -28,6 +36,18 @@ __COMPRESSION_MAPPING__ = {
     'ZWS': 'lzma',
 }
 
+# signature and version, file length
+__FILE_HEADER_SIZE__ = 8
+# length of the LZMA data of ZWS bodies, preceding its 5 bytes of
+# properties. pylzma reads the properties and data without it.
+__LZMA_LENGTH_SIZE__ = 4
+# decompressed bytes per sidecar chunk of a compressed body
+__CHUNK_SIZE__ = 1 << 20
+
+# strings are UTF-8 from SWF 6, in the player locale code page before
+__UTF8_VERSION__ = 6
+__LEGACY_ENCODING__ = 'latin-1'
+
 
 class InvalidSignature(Exception):
     pass
@@ -82,45 +102,319 @@ class Header:
 class File:
     header: Header
     tags: list[Tag]
+    media: MediaIndex
+    # decompressed data, tag offsets are relative to it
+    body: memoryview = field(repr=False)
 
     @classmethod
-    def unpack(cls, stream):
-        header = Header.unpack(stream)
+    def unpack(cls, stream, workers=None):
+        """`workers` processes decode the tags, see `swf.parallel`."""
+        header, stream = unpack_body(stream)
 
-        position = stream.byte_position
-        data = stream.available_bytes
-
-        if header.is_zlib_compressed:
-            import zlib
-            data = zlib.decompress(data)
-        elif header.is_lzma_compressed:
-            import pylzma
-            data = pylzma.decompress(data)
+        if workers is not None:
+            tags = unpack_tags(header.version, stream, workers)
+        else:
+            tags = []
+            tag = unpack_tag(header.version, stream)
+            while not isinstance(tag, End):
+                tags.append(tag)
+                tag = unpack_tag(header.version, stream)
 
-        if position + len(data) != header.file_length:
-            raise UnmatchedFileLength()
+        return cls.from_tags(header, tags, memoryview(stream.buffer))
 
-        stream = Stream(data)
-        # we don't read all the header struct data in the first
-        # unpack since the data might be compressed
-        header.unpack_rest(stream)
-
-        tags = []
-        tag = unpack_tag(header.version, stream)
-        while not isinstance(tag, End):
-            tags.append(tag)
-            tag = unpack_tag(header.version, stream)
+    @classmethod
+    def from_tags(cls, header, tags, body):
+        media = MediaIndex()
+        frame = 0
+        for tag in tags:
+            media.add(tag, frame)
+            if isinstance(tag, ShowFrame):
+                frame += 1
 
         return cls(
             header=header,
             tags=tags,
+            media=media,
+            body=body,
+        )
+
+    def sound_stream(self, timeline=0):
+        """Data of the stream blocks of `timeline`, MP3 streams as a
+        sequence of MP3 frames."""
+        blocks = self.media.sound_blocks.get(timeline, {})
+        return b''.join(
+            self.body[offset:offset + length]
+            for _, frame_blocks in sorted(blocks.items())
+            for offset, length in frame_blocks
+        )
+
+    def video_frame(self, stream_id, frame_num):
+        offset, length = self.media.video_frames[stream_id][frame_num]
+        return self.body[offset:offset + length]
+
+
+def string_encoding(version):
+    if version < __UTF8_VERSION__:
+        return __LEGACY_ENCODING__
+
+    return 'utf-8'
+
+
+def unpack_body(stream):
+    """Read the header and return it with a stream over the decompressed
+    body, positioned on the first tag."""
+    header = Header.unpack(stream)
+
+    position = stream.byte_position
+    data = stream.available_bytes
+
+    if header.is_zlib_compressed:
+        import zlib
+        data = zlib.decompress(data)
+    elif header.is_lzma_compressed:
+        import pylzma
+        data = pylzma.decompress(data[__LZMA_LENGTH_SIZE__:])
+
+    if position + len(data) != header.file_length:
+        raise UnmatchedFileLength()
+
+    stream = Stream(data, encoding=string_encoding(header.version))
+    # we don't read all the header struct data in the first
+    # unpack since the data might be compressed
+    header.unpack_rest(stream)
+
+    return header, stream
+
+
+class IndexedFile:
+    """Random access to the tags of a SWF through its sidecar index.
+
+    Uncompressed bodies are read straight from the file, compressed ones
+    from the sidecar chunks covering the requested tag. zlib bodies
+    indexed without chunks are read through in-memory decompressor
+    checkpoints instead.
+    """
+
+    def __init__(self, path, sidecar_path, interval=None):
+        self.path = path
+        with open(sidecar_path, 'rb') as file:
+            self._sidecar_data = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        self.sidecar = Sidecar.unpack(self._sidecar_data)
+        self.tags = self.sidecar.tags
+        # sidecar offset of every chunk, and of the end of the last one
+        self._chunk_offsets = list(accumulate(
+            self.sidecar.chunks, initial=self.sidecar.chunks_offset
+        ))
+        self._file = open(path, 'rb')
+        self._zlib = None
+        if self.sidecar.signature == 'CWS' and not self.sidecar.chunks:
+            self._data = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+            self._view = memoryview(self._data)[__FILE_HEADER_SIZE__:]
+            self._zlib = SeekableZlib(
+                self._view,
+                **({} if interval is None else {'interval': interval})
+            )
+
+    @property
+    def version(self):
+        return self.sidecar.version
+
+    @property
+    def is_compressed(self):
+        return self.sidecar.signature != 'FWS'
+
+    def __len__(self):
+        return len(self.tags)
+
+    def read_body(self, position, size):
+        """`size` bytes of the decompressed body from `position`."""
+        if not self.is_compressed:
+            self._file.seek(__FILE_HEADER_SIZE__ + position)
+            return self._file.read(size)
+        if self._zlib is not None:
+            return self._zlib.read(position, size)
+
+        chunk_size = self.sidecar.chunk_size
+        first = position // chunk_size
+        last = (position + size - 1) // chunk_size if size else first
+        data = b''.join(
+            zlib.decompress(self._sidecar_data[
+                self._chunk_offsets[idx]:self._chunk_offsets[idx + 1]
+            ])
+            for idx in range(first, last + 1)
+        )
+        start = position - first * chunk_size
+        return data[start:start + size]
+
+    def read(self, idx):
+        """Header and body of the tag `idx`."""
+        position = self.tags.positions[idx]
+        end = self.tags.offsets[idx] + self.tags.lengths[idx]
+        return self.read_body(position, end - position)
+
+    def tag(self, idx):
+        position = self.tags.positions[idx]
+        stream = Stream(
+            self.read(idx),
+            origin=position,
+            encoding=string_encoding(self.version),
         )
+        return unpack_tag(self.version, stream)
 
+    def find(self, character_id):
+        """Tag defining `character_id`."""
+        idx = self.tags.find(character_id)
+        return None if idx is None else self.tag(idx)
 
-def parse(path):
+    def frame_tags(self, frame, parent=-1):
+        """Indexes of the tags of a frame of the main timeline, or of the
+        sprite at index `parent`."""
+        return self.tags.frame_tags(frame, parent)
+
+    def close(self):
+        if self._zlib is not None:
+            self._zlib.data.release()
+            self._zlib = None
+            self._view.release()
+            self._data.close()
+        self._file.close()
+        self._sidecar_data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def sidecar_path(path):
+    return f"{path}.idx"
+
+
+def build_index(path, sidecar=None, chunk_size=__CHUNK_SIZE__):
+    """Parse the tag headers of `path` and write its sidecar index.
+
+    With a None `chunk_size`, zlib bodies aren't copied to the sidecar
+    and are read through decompressor checkpoints once opened.
+    """
+    stat = os.stat(path)
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    header, stream = unpack_body(Stream(data))
+    tags = TagIndex.build(stream)
+
+    index = Sidecar(
+        source_size=stat.st_size,
+        source_mtime=stat.st_mtime_ns,
+        signature=header.signature,
+        version=header.version,
+        file_length=header.file_length,
+        tags=tags,
+    )
+    chunks = []
+    chunk_size = _chunk_size(header.signature, chunk_size)
+    if chunk_size:
+        body = memoryview(stream.buffer)
+        chunks = [
+            zlib.compress(body[start:start + chunk_size])
+            for start in range(0, len(body), chunk_size)
+        ]
+        index.chunk_size = chunk_size
+        index.chunks.extend(len(chunk) for chunk in chunks)
+
+    sidecar = sidecar or sidecar_path(path)
+    temp = f"{sidecar}.tmp"
+    with open(temp, 'wb') as file:
+        file.write(index.pack(chunks))
+    os.replace(temp, sidecar)
+
+    return index
+
+
+def open_indexed(path, sidecar=None, chunk_size=__CHUNK_SIZE__,
+                 interval=None):
+    """Open `path` for random tag access, (re)building its sidecar index
+    when missing, older than the file or chunked differently."""
+    sidecar = sidecar or sidecar_path(path)
+    if _is_stale(path, sidecar, chunk_size):
+        build_index(path, sidecar, chunk_size)
+
+    return IndexedFile(path, sidecar, interval)
+
+
+def _chunk_size(signature, chunk_size):
+    """Size of the sidecar chunks of a body, 0 when it has none."""
+    if signature == 'FWS':
+        return 0
+    if signature == 'ZWS':
+        # LZMA bodies have no seekable fallback
+        return chunk_size or __CHUNK_SIZE__
+
+    return chunk_size or 0
+
+
+def _is_stale(path, sidecar, chunk_size=__CHUNK_SIZE__):
+    if not os.path.exists(sidecar):
+        return True
+
+    stat = os.stat(path)
+    try:
+        with open(sidecar, 'rb') as file:
+            index = Sidecar.unpack(
+                file.read(Sidecar.header_size()), header_only=True
+            )
+    except InvalidSidecar:
+        return True
+
+    return index.source_size != stat.st_size or \
+        index.source_mtime != stat.st_mtime_ns or \
+        index.chunk_size != _chunk_size(index.signature, chunk_size)
+
+
+def visit(stream, handlers):
+    """Call `handlers[cls](tag)` for each tag of a `cls`, keeping none.
+
+    Tags without a handler for their class or one of its bases are
+    skipped undecoded, the control tags of unhandled sprites are visited.
+    Returns the file header.
+    """
+    header, stream = unpack_body(stream)
+
+    dispatch = {}
+    for code, cls in __TAGS__.items():
+        for base in cls.__mro__:
+            if base in handlers:
+                dispatch[code] = handlers[base]
+                break
+
+    _visit(header.version, stream, dispatch)
+    return header
+
+
+def _visit(version, stream, dispatch):
+    # handled sprites are decoded whole, their control tags included
+    for position, header, _ in walk_tags(
+            stream, lambda header: header.code not in dispatch):
+        handler = dispatch.get(header.code)
+        if handler is not None:
+            stream.seek_bytes(position)
+            handler(unpack_tag(version, stream))
+
+
+def parse(path, workers=None, handlers=None):
+    """Parsed `File` at `path`, or its header after visiting its tags
+    with `handlers`, see `visit`."""
     with open(path, 'rb') as file:
         data = file.read()
         stream = Stream(data)
 
-    swf = File.unpack(stream)
+    if handlers is not None:
+        return visit(stream, handlers)
+
+    swf = File.unpack(stream, workers)
     return swf
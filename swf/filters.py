@@ -22,11 +22,11 @@ def unpack(stream):
 
 
 class Filter:
-    pass
+    __slots__ = ()
 
 
-@dataclass
 @register_filter(id=0)
+@dataclass(slots=True)
 class DropShadow(Filter):
     color: RGBA
     blur_x: float
@@ -66,8 +66,8 @@ class DropShadow(Filter):
         )
 
 
-@dataclass
 @register_filter(id=1)
+@dataclass(slots=True)
 class Blur(Filter):
     blur_x: float
     blur_y: float
@@ -111,8 +111,8 @@ class Blur(Filter):
         return filter
 
 
-@dataclass
 @register_filter(id=2)
+@dataclass(slots=True)
 class Glow(Filter):
     color: RGBA
     blur_x: float
@@ -149,8 +149,8 @@ class Glow(Filter):
         )
 
 
-@dataclass
 @register_filter(id=3)
+@dataclass(slots=True)
 class Bevel(Filter):
     shadow_color: RGBA
     highlight_color: RGBA
@@ -197,11 +197,11 @@ class Bevel(Filter):
 
 
 
-@dataclass
 @register_filter(id=4)
+@dataclass(slots=True)
 class GradientGlow(Filter):
     gradient_colors: list[RGBA]
-    gradient_ratio: list[int]
+    gradient_ratio: bytes
     blur_x: float
     blur_y: float
     angle: float
@@ -217,7 +217,7 @@ class GradientGlow(Filter):
     def unpack(cls, stream):
         count = stream.read_uint8()
         gradient_colors = [RGBA.unpack(stream) for _ in range(count)]
-        gradient_ratio = [stream.read_uint8() for _ in range(count)]
+        gradient_ratio = stream.read_uint8_array(count)
         blur_x = stream.read_fixed16()
         blur_y = stream.read_fixed16()
         angle = stream.read_fixed16()
@@ -245,8 +245,8 @@ class GradientGlow(Filter):
         )
 
 
-@dataclass
 @register_filter(id=5)
+@dataclass(slots=True)
 class Convolution(Filter):
     divisor: float
     bias: float
@@ -262,10 +262,9 @@ class Convolution(Filter):
         matrix_y = stream.read_uint8()
         divisor = stream.read_float()
         bias = stream.read_float()
-        matrix = []
-        for row in range(matrix_x):
-            matrix[row] = [stream.read_float()
-                            for _ in range(matrix_y)]
+        values = stream.read_float_array(matrix_x * matrix_y)
+        matrix = [values[row * matrix_y:(row + 1) * matrix_y].tolist()
+                  for row in range(matrix_x)]
         default_color = RGBA.unpack(stream)
         stream.read_ubits(6)  # reserved always 0
         clamp = stream.read_bit_bool()
@@ -306,8 +305,8 @@ class Convolution(Filter):
         return filter
 
 
-@dataclass
 @register_filter(id=6)
+@dataclass(slots=True)
 class ColorMatrix(Filter):
     COLS = 5
     ROWS = 4
@@ -316,10 +315,11 @@ class ColorMatrix(Filter):
 
     @classmethod
     def unpack(cls, stream):
-        matrix = []
-        for row in range(ColorMatrix.ROWS):
-            matrix[row] = [stream.read_float()
-                            for _ in range(ColorMatrix.COLS)]
+        values = stream.read_float_array(ColorMatrix.ROWS * ColorMatrix.COLS)
+        matrix = [
+            values[row * ColorMatrix.COLS:(row + 1) * ColorMatrix.COLS]
+            .tolist() for row in range(ColorMatrix.ROWS)
+        ]
 
         return cls(
             matrix=matrix,
@@ -339,8 +339,8 @@ class ColorMatrix(Filter):
         return RGBA(*result)
 
 
-@dataclass
 @register_filter(id=7)
+@dataclass(slots=True)
 class GradientBevel(Filter):
     composite_source: bool
     on_top: bool
@@ -359,7 +359,7 @@ class GradientBevel(Filter):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class FilterList:
     filters: list[Filter]
 
@@ -0,0 +1,273 @@
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+import struct
+import sys
+
+from swf.tags import __CHARACTER_TAGS__, __MP3__, DefineSprite, ShowFrame, \
+                     SoundStreamBlock, SoundStreamHead, VideoFrame, \
+                     walk as walk_tags
+
+
+__MAIN_TIMELINE__ = 0
+# sample count and seek samples preceding the frames of MP3 stream blocks
+__MP3_BLOCK_HEADER_SIZE__ = 4
+
+__SIDECAR_MAGIC__ = b'SWFX'
+__SIDECAR_VERSION__ = 1
+# magic, format version, source size, source mtime, signature, swf version,
+# file length, tag count, chunk size, chunk count
+__SIDECAR_HEADER__ = struct.Struct('<4sHQq3sBIIII')
+# field name, array type code
+__TAG_ARRAYS__ = (
+    ('codes', 'H'),
+    ('positions', 'I'),
+    ('offsets', 'I'),
+    ('lengths', 'I'),
+    ('frames', 'I'),
+    ('character_ids', 'i'),
+    ('parents', 'i'),
+)
+
+
+def payload_range(header, payload, skip=0):
+    # payloads are always the trailing bytes of the tag body
+    skip = min(skip, len(payload))
+    return (
+        header.offset + header.length - len(payload) + skip,
+        len(payload) - skip,
+    )
+
+
+@dataclass
+class MediaIndex:
+    # timeline (main timeline or sprite id) -> frame -> [(offset, length)]
+    sound_blocks: dict[int, dict[int, list[tuple[int, int]]]] = \
+        field(default_factory=dict)
+    # stream id -> frame number -> (offset, length)
+    video_frames: dict[int, dict[int, tuple[int, int]]] = \
+        field(default_factory=dict)
+    # timeline -> stream sound compression of its SoundStreamHead
+    stream_formats: dict[int, int] = field(default_factory=dict)
+
+    def add(self, tag, frame, timeline=__MAIN_TIMELINE__):
+        if isinstance(tag, SoundStreamHead):
+            self.stream_formats[timeline] = tag.stream_sound_compression
+        elif isinstance(tag, SoundStreamBlock):
+            # MP3 blocks are indexed from their first frame
+            skip = 0
+            if self.stream_formats.get(timeline) == __MP3__:
+                skip = __MP3_BLOCK_HEADER_SIZE__
+            blocks = self.sound_blocks.setdefault(timeline, {})
+            blocks.setdefault(frame, []).append(
+                payload_range(tag.header, tag.stream_sound_data, skip)
+            )
+        elif isinstance(tag, VideoFrame):
+            frames = self.video_frames.setdefault(tag.stream_id, {})
+            frames[tag.frame_num] = payload_range(tag.header, tag.video_data)
+        elif isinstance(tag, DefineSprite):
+            sprite_frame = 0
+            for control_tag in tag.control_tags:
+                self.add(control_tag, sprite_frame, tag.sprite_id)
+                if isinstance(control_tag, ShowFrame):
+                    sprite_frame += 1
+
+
+@dataclass
+class TagIndex:
+    """Compact index of every tag, control tags of sprites included, in
+    decompressed body coordinates."""
+    # header start
+    positions: array = field(default_factory=lambda: array('I'))
+    codes: array = field(default_factory=lambda: array('H'))
+    # body start and length
+    offsets: array = field(default_factory=lambda: array('I'))
+    lengths: array = field(default_factory=lambda: array('I'))
+    # frame in the enclosing timeline
+    frames: array = field(default_factory=lambda: array('I'))
+    # -1 for tags that don't define a character
+    character_ids: array = field(default_factory=lambda: array('i'))
+    # index of the enclosing `DefineSprite`, -1 on the main timeline
+    parents: array = field(default_factory=lambda: array('i'))
+    # lookups built from the arrays once they're loaded, see `_lookups`
+    # character id -> index of the first tag defining it
+    _definitions: dict = field(default=None, init=False, repr=False,
+                               compare=False)
+    # parent -> (tag indexes, their frames), in tag order so frames are
+    # sorted
+    _timelines: dict = field(default=None, init=False, repr=False,
+                             compare=False)
+
+    @classmethod
+    def build(cls, stream):
+        """Index the tags of a body stream positioned on the first tag."""
+        index = cls()
+        index._walk(stream, memoryview(stream.buffer))
+        return index
+
+    def _walk(self, stream, body):
+        # frame and parent of each timeline, from the main one down
+        frames = [0]
+        parents = [-1]
+        for position, header, depth in walk_tags(stream):
+            del frames[depth + 1:], parents[depth + 1:]
+            local = header.offset - stream.origin
+            character_id = -1
+            if header.code in __CHARACTER_TAGS__ and header.length >= 2:
+                character_id = body[local] | body[local + 1] << 8
+
+            self.positions.append(stream.origin + position)
+            self.codes.append(header.code)
+            self.offsets.append(header.offset)
+            self.lengths.append(header.length)
+            self.frames.append(frames[depth])
+            self.character_ids.append(character_id)
+            self.parents.append(parents[depth])
+
+            if header.code == DefineSprite.__code__:
+                frames.append(0)
+                parents.append(len(self.codes) - 1)
+            elif header.code == ShowFrame.__code__:
+                frames[depth] += 1
+
+    def _lookups(self):
+        if self._definitions is None:
+            definitions = {}
+            timelines = {}
+            for idx, (character_id, parent, frame) in enumerate(
+                    zip(self.character_ids, self.parents, self.frames)):
+                if character_id != -1:
+                    definitions.setdefault(character_id, idx)
+                timeline = timelines.get(parent)
+                if timeline is None:
+                    timeline = timelines[parent] = (array('I'), array('I'))
+                timeline[0].append(idx)
+                timeline[1].append(frame)
+
+            self._definitions = definitions
+            self._timelines = timelines
+
+    def find(self, character_id):
+        """Index of the tag defining `character_id`."""
+        self._lookups()
+        return self._definitions.get(character_id)
+
+    def frame_tags(self, frame, parent=-1):
+        """Indexes of the tags of a frame of the main timeline, or of the
+        sprite at index `parent`."""
+        self._lookups()
+        timeline = self._timelines.get(parent)
+        if timeline is None:
+            return []
+
+        idxs, frames = timeline
+        start = bisect_left(frames, frame)
+        end = bisect_left(frames, frame + 1, start)
+        return idxs[start:end].tolist()
+
+    def __len__(self):
+        return len(self.codes)
+
+
+@dataclass
+class Sidecar:
+    """Tag index persisted next to a SWF.
+
+    Compressed bodies are also stored as independently compressed chunks,
+    so reading a tag decompresses at most the chunks it spans.
+    """
+    source_size: int
+    source_mtime: int
+    signature: str
+    version: int
+    file_length: int
+    tags: TagIndex
+    chunk_size: int = 0
+    chunks: array = field(default_factory=lambda: array('I'))
+    # offset of the first chunk in the sidecar
+    chunks_offset: int = 0
+
+    def pack(self, chunks=()):
+        header = __SIDECAR_HEADER__.pack(
+            __SIDECAR_MAGIC__,
+            __SIDECAR_VERSION__,
+            self.source_size,
+            self.source_mtime,
+            self.signature.encode(),
+            self.version,
+            self.file_length,
+            len(self.tags),
+            self.chunk_size,
+            len(self.chunks),
+        )
+        parts = [header]
+        for name, _ in __TAG_ARRAYS__:
+            parts.append(_to_little_endian(getattr(self.tags, name)))
+        parts.append(_to_little_endian(self.chunks))
+        parts.extend(chunks)
+
+        return b''.join(parts)
+
+    @staticmethod
+    def header_size():
+        return __SIDECAR_HEADER__.size
+
+    @classmethod
+    def unpack(cls, data, header_only=False):
+        if len(data) < __SIDECAR_HEADER__.size:
+            raise InvalidSidecar()
+
+        (
+            magic, format_version, source_size, source_mtime, signature,
+            version, file_length, count, chunk_size, chunk_count,
+        ) = __SIDECAR_HEADER__.unpack_from(data)
+        if magic != __SIDECAR_MAGIC__ or \
+                format_version != __SIDECAR_VERSION__:
+            raise InvalidSidecar()
+
+        position = __SIDECAR_HEADER__.size
+        tags = TagIndex()
+        if header_only:
+            count = chunk_count = 0
+        for name, typecode in __TAG_ARRAYS__:
+            values, position = _from_little_endian(
+                typecode, data, position, count
+            )
+            setattr(tags, name, values)
+        chunks, position = _from_little_endian(
+            'I', data, position, chunk_count
+        )
+
+        return cls(
+            source_size=source_size,
+            source_mtime=source_mtime,
+            signature=signature.decode(),
+            version=version,
+            file_length=file_length,
+            tags=tags,
+            chunk_size=chunk_size,
+            chunks=chunks,
+            chunks_offset=position,
+        )
+
+
+class InvalidSidecar(Exception):
+    pass
+
+
+def _to_little_endian(values):
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    return values.tobytes()
+
+
+def _from_little_endian(typecode, data, position, count):
+    values = array(typecode)
+    end = position + count * values.itemsize
+    values.frombytes(data[position:end])
+    if sys.byteorder == 'big':
+        values.byteswap()
+
+    return values, end
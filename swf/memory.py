@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field
+from enum import Enum
+import sys
+
+
+@dataclass
+class Usage:
+    count: int = 0
+    bytes: int = 0
+
+
+@dataclass
+class MemoryReport:
+    # tag class name -> instances and deep size of their decoded fields
+    tags: dict[str, Usage] = field(default_factory=dict)
+    # type name -> instances and their own size, every nested object counted
+    records: dict[str, Usage] = field(default_factory=dict)
+    # decompressed data the tags point into
+    body: int = 0
+
+    @property
+    def total(self):
+        return self.body + sum(usage.bytes for usage in self.tags.values())
+
+    def table(self):
+        lines = [f"{'tag':<32} {'count':>8} {'bytes':>12}"]
+        for name, usage in _by_size(self.tags):
+            lines.append(f"{name:<32} {usage.count:>8} {usage.bytes:>12}")
+
+        lines.append('')
+        lines.append(f"{'record':<32} {'count':>8} {'bytes':>12}")
+        for name, usage in _by_size(self.records):
+            lines.append(f"{name:<32} {usage.count:>8} {usage.bytes:>12}")
+
+        lines.append('')
+        lines.append(f"{'body':<41} {self.body:>12}")
+        lines.append(f"{'total':<41} {self.total:>12}")
+        return '\n'.join(lines)
+
+
+def memory_report(swf):
+    """Bytes used by the tags of a parsed `File`, per tag and record type.
+
+    Objects shared between tags are counted once, for the first tag
+    referencing them.
+    """
+    report = MemoryReport(body=swf.body.nbytes)
+    seen = set()
+    for tag in swf.tags:
+        usage = report.tags.setdefault(type(tag).__name__, Usage())
+        usage.count += 1
+        usage.bytes += _deep_size(tag, seen, report.records)
+
+    return report
+
+
+def _deep_size(obj, seen, records):
+    size = 0
+    objects = [obj]
+    while objects:
+        obj = objects.pop()
+        if id(obj) in seen or obj is None or isinstance(obj, (bool, Enum)):
+            continue
+        seen.add(id(obj))
+
+        obj_size = sys.getsizeof(obj)
+        size += obj_size
+        usage = records.setdefault(type(obj).__name__, Usage())
+        usage.count += 1
+        usage.bytes += obj_size
+
+        # memoryviews point into the body, counted once in the report
+        if isinstance(obj, (str, bytes, memoryview, int, float)):
+            continue
+        if isinstance(obj, dict):
+            objects.extend(obj.keys())
+            objects.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            objects.extend(obj)
+        else:
+            objects.extend(_attributes(obj))
+
+    return size
+
+
+def _attributes(obj):
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if name != '__weakref__' and hasattr(obj, name):
+                yield getattr(obj, name)
+
+    if hasattr(obj, '__dict__'):
+        yield obj.__dict__
+
+
+def _by_size(usages):
+    return sorted(usages.items(), key=lambda item: -item[1].bytes)
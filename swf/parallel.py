@@ -0,0 +1,115 @@
+from concurrent.futures import ProcessPoolExecutor
+import io
+from multiprocessing import shared_memory
+import os
+import pickle
+
+from stream import Stream
+from swf.tags import End, skip as skip_tag, unpack as unpack_tag
+
+
+# ranges per worker, more ranges balance better but pickle more
+__RANGES_PER_WORKER__ = 4
+
+# shared memory blocks attached by the current worker process
+__ATTACHED__ = {}
+
+
+class _Pickler(pickle.Pickler):
+    # views of the body can't be pickled, they're sent as bytes
+    def reducer_override(self, obj):
+        if isinstance(obj, memoryview):
+            return bytes, (obj.tobytes(),)
+        return NotImplemented
+
+
+def dumps(obj):
+    """Pickle with the views of the body as bytes."""
+    file = io.BytesIO()
+    _Pickler(file, pickle.HIGHEST_PROTOCOL).dump(obj)
+    return file.getvalue()
+
+
+def _attach(name):
+    shm = __ATTACHED__.get(name)
+    if shm is None:
+        shm = __ATTACHED__[name] = shared_memory.SharedMemory(name=name)
+
+    return shm
+
+
+def decode_range(version, encoding, buffer, origin=0):
+    """Tags of `buffer`, whole tags starting at body position `origin`."""
+    stream = Stream.from_buffer(buffer, origin=origin, encoding=encoding)
+
+    tags = []
+    while stream.byte_position < len(buffer):
+        tags.append(unpack_tag(version, stream))
+
+    return tags
+
+
+def _decode_shared(name, version, encoding, start, end):
+    shm = _attach(name)
+    return dumps(decode_range(version, encoding, shm.buf[start:end], start))
+
+
+def tag_positions(stream):
+    """Byte positions of the tags up to End, and of the End tag.
+
+    The stream is left after the End tag.
+    """
+    positions = [stream.byte_position]
+    header = skip_tag(stream)
+    while header.code != End.__code__:
+        positions.append(stream.byte_position)
+        header = skip_tag(stream)
+
+    return positions
+
+
+def tag_ranges(positions, size):
+    """(start, end) ranges of whole tags of about `size` bytes."""
+    ranges = []
+    start, last = positions[0], positions[-1]
+    for position in positions[1:]:
+        if position - start >= size or position == last:
+            ranges.append((start, position))
+            start = position
+
+    return ranges
+
+
+def unpack_tags(version, stream, workers=None):
+    """Decode the tags up to End in a pool of `workers` processes.
+
+    The body is copied once into shared memory, each worker decodes
+    contiguous ranges of whole tags from it. Tags come back in file order,
+    with their payloads as bytes instead of views of the body.
+    """
+    workers = workers or os.cpu_count()
+    positions = tag_positions(stream)
+    size = (positions[-1] - positions[0]) // (workers * __RANGES_PER_WORKER__)
+    ranges = tag_ranges(positions, max(size, 1))
+    if not ranges:
+        return []
+
+    body = memoryview(stream.buffer)
+    shm = shared_memory.SharedMemory(create=True, size=len(body))
+    try:
+        shm.buf[:len(body)] = body
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [
+                pool.submit(
+                    _decode_shared, shm.name, version, stream.encoding,
+                    start, end,
+                )
+                for start, end in ranges
+            ]
+            return [
+                tag for future in futures
+                for tag in pickle.loads(future.result())
+            ]
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,182 @@
+from dataclasses import asdict, dataclass
+import inspect
+import json
+import time
+
+import amv2.structs
+from stream import Stream
+import swf.actions
+import swf.filters
+import swf.tags
+
+
+TAG = 'tag'
+ACTION = 'action'
+FILTER = 'filter'
+ABC = 'abc'
+
+# Stream methods whose calls are counted
+__PRIMITIVE_PREFIXES__ = ('read_', 'tell_', 'seek_', 'move_', 'byte_align')
+
+
+@dataclass
+class Entry:
+    kind: str
+    name: str
+    count: int = 0
+    # stream bytes consumed
+    bytes: int = 0
+    # seconds, `self_time` excludes the nested instrumented unpacks
+    time: float = 0.0
+    self_time: float = 0.0
+
+
+class Profiler:
+    """Per tag, action, filter and ABC struct parse statistics.
+
+    The unpack methods and Stream primitives are only wrapped while the
+    profiler is enabled, parsing costs nothing extra otherwise.
+
+        with Profiler() as profiler:
+            parse(path)
+        print(profiler.table())
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.calls = {}
+        # [entry, elapsed time of the nested unpacks]
+        self._stack = []
+        self._patches = []
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *args):
+        self.disable()
+
+    def enable(self):
+        # inherited unpacks are counted under the class defining them
+        for cls in set(swf.tags.__TAGS__.values()):
+            if 'unpack' in vars(cls):
+                self._patch_method(cls, TAG)
+        for cls in set(swf.filters.__FILTERS__.values()):
+            if 'unpack' in vars(cls):
+                self._patch_method(cls, FILTER)
+        for cls in vars(amv2.structs).values():
+            if inspect.isclass(cls) and 'unpack' in vars(cls) and \
+                    cls.__module__ == amv2.structs.__name__:
+                self._patch_method(cls, ABC)
+
+        decoders = swf.actions.__DECODERS__
+        for code, decoder in enumerate(decoders):
+            if decoder is not None:
+                self._patches.append((decoders, code, decoder))
+                decoders[code] = self._timed(
+                    decoder, ACTION, decoder.__self__.__name__
+                )
+
+        for name, method in list(vars(Stream).items()):
+            if name.startswith(__PRIMITIVE_PREFIXES__) and callable(method):
+                self._patches.append((Stream, name, method))
+                setattr(Stream, name, self._counted(method, name))
+
+    def disable(self):
+        for owner, key, original in reversed(self._patches):
+            if isinstance(owner, list):
+                owner[key] = original
+            else:
+                setattr(owner, key, original)
+        self._patches = []
+
+    def _patch_method(self, cls, kind):
+        original = vars(cls)['unpack']
+        if isinstance(original, staticmethod):
+            wrapper = staticmethod(
+                self._timed(original.__func__, kind, cls.__name__)
+            )
+        else:
+            wrapper = classmethod(
+                self._timed(original.__func__, kind, cls.__name__)
+            )
+
+        self._patches.append((cls, 'unpack', original))
+        setattr(cls, 'unpack', wrapper)
+
+    def _timed(self, func, kind, name):
+        entry = self.entries.get((kind, name))
+        if entry is None:
+            entry = self.entries[(kind, name)] = Entry(kind, name)
+        stack = self._stack
+
+        def timed(*args):
+            stream = args[-1]
+            position = stream.byte_position
+            frame = [entry, 0.0]
+            stack.append(frame)
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+                if stack:
+                    stack[-1][1] += elapsed
+                entry.count += 1
+                entry.bytes += stream.byte_position - position
+                entry.time += elapsed
+                entry.self_time += elapsed - frame[1]
+
+        # `swf.tags.unpack` dispatches on the unpack arguments
+        timed.__signature__ = inspect.signature(func)
+        return timed
+
+    def _counted(self, method, name):
+        calls = self.calls
+        calls.setdefault(name, 0)
+
+        def counted(*args, **kwargs):
+            calls[name] += 1
+            return method(*args, **kwargs)
+
+        return counted
+
+    def results(self):
+        entries = sorted(
+            (entry for entry in self.entries.values() if entry.count),
+            key=lambda entry: entry.self_time,
+            reverse=True,
+        )
+        return {
+            'entries': [asdict(entry) for entry in entries],
+            'calls': {
+                name: count for name, count in sorted(
+                    self.calls.items(), key=lambda item: -item[1]
+                ) if count
+            },
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.results(), **kwargs)
+
+    def table(self):
+        results = self.results()
+        lines = [
+            f"{'kind':<8} {'name':<28} {'count':>8} {'bytes':>10} "
+            f"{'time':>10} {'self':>10}"
+        ]
+        for entry in results['entries']:
+            lines.append(
+                f"{entry['kind']:<8} {entry['name']:<28} "
+                f"{entry['count']:>8} {entry['bytes']:>10} "
+                f"{entry['time'] * 1000:>8.2f}ms "
+                f"{entry['self_time'] * 1000:>8.2f}ms"
+            )
+
+        lines.append('')
+        lines.append(f"{'stream primitive':<37} {'calls':>8}")
+        for name, count in results['calls'].items():
+            lines.append(f"{name:<37} {count:>8}")
+
+        return '\n'.join(lines)
@@ -0,0 +1,187 @@
+from collections import deque
+import zlib
+
+from stream import Stream
+from swf.exceptions import IncompleteFile, UnmatchedFileLength
+from swf.file import Header, __FILE_HEADER_SIZE__, __LZMA_LENGTH_SIZE__, \
+                     string_encoding
+from swf.tags import End, unpack as unpack_tag
+
+
+# most decompressed bytes produced at once beyond the ones needed
+__OUTPUT_SIZE__ = 1 << 18
+# tag code and short length, the long length follows when it's 0x3f
+__SHORT_HEADER_SIZE__ = 2
+__LONG_HEADER_SIZE__ = 6
+# frame rate and count after the frame size rectangle
+__HEADER_REST_SIZE__ = 4
+
+
+class SwfParser:
+    """Push parser decoding a SWF from chunks of bytes, doing no I/O.
+
+        parser = SwfParser()
+        for chunk in chunks:
+            parser.feed(chunk)
+            for event in parser.events():
+                ...
+        parser.close()
+
+    The events are the file `Header`, once complete, then every tag as
+    soon as its body is available, up to the End tag. Only the compressed
+    input not decompressed yet and the bytes of the current incomplete tag
+    are buffered.
+    """
+
+    def __init__(self):
+        self.header = None
+        self.finished = False
+
+        self._head = bytearray()
+        self._decompressor = None
+        # compressed bytes left by the decompressor
+        self._tail = b''
+        self._buffer = bytearray()
+        # buffer bytes already consumed
+        self._start = 0
+        # position of the buffer start in the decompressed body, which
+        # starts after the file header
+        self._position = 0
+        self._events = deque()
+
+    def feed(self, chunk):
+        if self.finished:
+            return
+
+        if self._head is not None:
+            self._head += chunk
+            if len(self._head) < __FILE_HEADER_SIZE__:
+                return
+
+            if self.header is None:
+                self.header = Header.unpack(Stream(bytes(self._head)))
+            size = _head_size(self.header)
+            if len(self._head) < size:
+                return
+
+            chunk = bytes(self._head[size:])
+            self._head = None
+            self._decompressor = _decompressor(self.header)
+
+        self._tail += chunk
+        self._parse()
+
+    def events(self):
+        while self._events:
+            yield self._events.popleft()
+
+    def close(self):
+        if not self.finished:
+            raise IncompleteFile()
+
+    def _available(self):
+        return len(self._buffer) - self._start
+
+    def _fill(self, size):
+        """Decompress until `size` bytes are buffered, False if the input
+        doesn't go that far yet."""
+        while self._available() < size and self._tail:
+            data = self._decompress(size - self._available())
+            if self._start and self._start >= len(self._buffer) // 2:
+                del self._buffer[:self._start]
+                self._start = 0
+            self._buffer += data
+
+        return self._available() >= size
+
+    def _decompress(self, size):
+        decompressor = self._decompressor
+        if decompressor is None:
+            data, self._tail = self._tail, b''
+        elif self.header.is_zlib_compressed:
+            data = decompressor.decompress(
+                self._tail, max(size, __OUTPUT_SIZE__)
+            )
+            self._tail = decompressor.unconsumed_tail
+        else:
+            data, self._tail = decompressor.decompress(self._tail), b''
+
+        return data
+
+    def _read(self, size):
+        start = self._start
+        self._start += size
+        self._position += size
+        return bytes(self._buffer[start:self._start])
+
+    def _parse(self):
+        if self.header.frame_size is None and not self._parse_header():
+            return
+
+        while not self.finished and self._fill(__SHORT_HEADER_SIZE__):
+            start = self._start
+            code_and_length = self._buffer[start] | \
+                self._buffer[start + 1] << 8
+            size = __SHORT_HEADER_SIZE__ + (code_and_length & 0x3f)
+            if code_and_length & 0x3f == 0x3f:
+                if not self._fill(__LONG_HEADER_SIZE__):
+                    return
+                start = self._start
+                size = __LONG_HEADER_SIZE__ + int.from_bytes(
+                    self._buffer[start + 2:start + 6], 'little'
+                )
+
+            if not self._fill(size):
+                return
+
+            origin = self._position
+            stream = Stream(
+                self._read(size),
+                origin=origin,
+                encoding=string_encoding(self.header.version),
+            )
+            tag = unpack_tag(self.header.version, stream)
+            if isinstance(tag, End):
+                self._finish()
+            if tag is not None:
+                self._events.append(tag)
+
+    def _parse_header(self):
+        if not self._fill(1):
+            return False
+
+        # the frame size rectangle is 5 bits of size, then 4 values
+        nbits = self._buffer[self._start] >> 3
+        size = (5 + 4 * nbits + 7) // 8 + __HEADER_REST_SIZE__
+        if not self._fill(size):
+            return False
+
+        self.header.unpack_rest(Stream(self._read(size)))
+        self._events.append(self.header)
+        return True
+
+    def _finish(self):
+        self.finished = True
+        if __FILE_HEADER_SIZE__ + self._position != self.header.file_length:
+            raise UnmatchedFileLength()
+
+        self._buffer = None
+        self._tail = b''
+
+
+def _head_size(header):
+    # the LZMA data length isn't part of what pylzma decompresses
+    if header.is_lzma_compressed:
+        return __FILE_HEADER_SIZE__ + __LZMA_LENGTH_SIZE__
+
+    return __FILE_HEADER_SIZE__
+
+
+def _decompressor(header):
+    if header.is_zlib_compressed:
+        return zlib.decompressobj()
+    if header.is_lzma_compressed:
+        import pylzma
+        return pylzma.decompressobj()
+
+    return None
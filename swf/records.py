@@ -1,11 +1,38 @@
 from dataclasses import dataclass
 from typing import Union
 
+from stream import BitLayout
 from swf import byte_align_unpack
+from swf.fields import EnumField
 from swf.enums import CapStyleType, FillStyleType, JoinStyleType
 
 
-@dataclass
+# SWF 6 adds 16 bits of events
+__EVENTS_FLAGS__ = BitLayout(' '.join(['?'] * 16))
+__EVENTS_6_FLAGS__ = BitLayout(' '.join(['?'] * 16 + ['x5 ? ? ? x8']))
+__STYLE_CHANGE_FLAGS__ = BitLayout('? ? ? ? ?')
+
+# fill style type values, compared without building the enum members
+__SOLID_FILL__ = FillStyleType.SOLID.value
+__FOCAL_GRADIENT_FILL__ = FillStyleType.FOCAL_RADIAL_GRADIENT.value
+__GRADIENT_FILLS__ = frozenset((
+    FillStyleType.LINEAR_GRADIENT.value,
+    FillStyleType.RADIAL_GRADIENT.value,
+    FillStyleType.FOCAL_RADIAL_GRADIENT.value,
+))
+__MORPH_GRADIENT_FILLS__ = frozenset((
+    FillStyleType.LINEAR_GRADIENT.value,
+    FillStyleType.RADIAL_GRADIENT.value,
+))
+__BITMAP_FILLS__ = frozenset((
+    FillStyleType.REPEATING_BITMAP.value,
+    FillStyleType.CLIPPED_BITMAP.value,
+    FillStyleType.NON_SMOOTHED_REPEATING_BITMAP.value,
+    FillStyleType.NON_SMOOTHED_CLIPPED_BITMAP.value,
+))
+
+
+@dataclass(slots=True)
 class RGB:
     red: int
     green :int
@@ -24,7 +51,7 @@ class RGB:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class RGBA(RGB):
     alpha: int
 
@@ -41,7 +68,7 @@ class RGBA(RGB):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ARGB(RGB):
     alpha: int
 
@@ -58,7 +85,7 @@ class ARGB(RGB):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Rectangle:
     x_min: int
     x_max: int
@@ -82,7 +109,7 @@ class Rectangle:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Matrix:
     has_scale: bool
     scale_x: int
@@ -145,7 +172,7 @@ class Matrix:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Cxform:
     # [red, green, blue]
     has_add_terms: bool
@@ -209,7 +236,7 @@ class Cxform:
         return RGB(*result)
 
 
-@dataclass
+@dataclass(slots=True)
 class CxformWithAlpha(Cxform):
     alpha_add_term: int
     alpha_mult_term: int
@@ -240,7 +267,7 @@ class CxformWithAlpha(Cxform):
         )
 
     def __mul__(self, color):
-        rgb = super().__mul__(color)
+        rgb = super(CxformWithAlpha, self).__mul__(color)
         alpha = color.alpha * self.alpha_mult_term / 256
 
         return RGBA(
@@ -251,7 +278,7 @@ class CxformWithAlpha(Cxform):
         )
 
     def __add__(self, color):
-        rgb = super().__add__(color)
+        rgb = super(CxformWithAlpha, self).__add__(color)
         alpha =  max(0, min(color.alpha + self.alpha_add_term, 255))
 
         return RGBA(
@@ -261,7 +288,7 @@ class CxformWithAlpha(Cxform):
             alpha=alpha,
         )
 
-@dataclass
+@dataclass(slots=True)
 class Events:
     is_key_up: bool
     is_key_down: bool
@@ -287,32 +314,18 @@ class Events:
 
     @classmethod
     def unpack(cls, version, stream):
-        is_key_up = stream.read_bit_bool()
-        is_key_down = stream.read_bit_bool()
-        is_mouse_up = stream.read_bit_bool()
-        is_mouse_down = stream.read_bit_bool()
-        is_mouse_move = stream.read_bit_bool()
-        is_unload = stream.read_bit_bool()
-        is_enter_frame = stream.read_bit_bool()
-        is_load = stream.read_bit_bool()
-        is_drag_over = stream.read_bit_bool()
-        is_roll_out = stream.read_bit_bool()
-        is_roll_over = stream.read_bit_bool()
-        is_release_outside = stream.read_bit_bool()
-        is_release = stream.read_bit_bool()
-        is_press = stream.read_bit_bool()
-        is_initialize = stream.read_bit_bool()
-        is_data = stream.read_bit_bool()
-
-        is_construct = False
-        is_key_press = False
-        is_drag_out = False
         if version >= 6:
-            stream.read_ubits(5)  # reserved is always 0
-            is_construct = stream.read_bit_bool()
-            is_key_press = stream.read_bit_bool()
-            is_drag_out = stream.read_bit_bool()
-            stream.read_ubits(8)  # reserved is always 0
+            flags = stream.read_layout(__EVENTS_6_FLAGS__)
+        else:
+            flags = stream.read_layout(__EVENTS_FLAGS__) + (False,) * 3
+
+        (
+            is_key_up, is_key_down, is_mouse_up, is_mouse_down,
+            is_mouse_move, is_unload, is_enter_frame, is_load, is_drag_over,
+            is_roll_out, is_roll_over, is_release_outside, is_release,
+            is_press, is_initialize, is_data, is_construct, is_key_press,
+            is_drag_out,
+        ) = flags
 
         return cls(
             is_key_up=is_key_up,
@@ -337,7 +350,7 @@ class Events:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Grad:
     ratio: int
     color: RGB
@@ -356,7 +369,7 @@ class Grad:
             color=color,
         )
 
-@dataclass
+@dataclass(slots=True)
 class Gradient:
     spread_mode: int
     imterpolation_mode: RGB
@@ -377,7 +390,7 @@ class Gradient:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class FocalGradient:
     spread_mode: int
     imterpolation_mode: RGB
@@ -401,7 +414,7 @@ class FocalGradient:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class FillStyle:
     type: int
     color: RGB
@@ -410,35 +423,28 @@ class FillStyle:
     bitmap_id: int
     bitmap_matrix: Matrix
 
+    type_enum = EnumField(FillStyleType, 'type')
+
     @classmethod
     def unpack(cls, shape_version, stream):
-        type = FillStyleType(stream.read_uint8())
+        type = stream.read_uint8()
         color = None
         gradient_matrix = None
         gradient = None
         bitmap_id = None
         bitmap_matrix= None
-        if type == FillStyleType.SOLID:
+        if type == __SOLID_FILL__:
             if shape_version <= 2:
                 color = RGB.unpack(stream)
             else:
                 color = RGBA.unpack(stream)
-        elif type in (
-                        FillStyleType.LINEAR_GRADIENT,
-                        FillStyleType.RADIAL_GRADIENT,
-                        FillStyleType.FOCAL_RADIAL_GRADIENT,
-                    ):
+        elif type in __GRADIENT_FILLS__:
             gradient_matrix = Matrix.unpack(stream)
-            if type == FillStyleType.FOCAL_RADIAL_GRADIENT:
+            if type == __FOCAL_GRADIENT_FILL__:
                 gradient =  FocalGradient.unpack(stream)
             else:
                 gradient =  Gradient.unpack(stream)
-        elif type in (
-                        FillStyleType.REPEATING_BITMAP,
-                        FillStyleType.CLIPPED_BITMAP,
-                        FillStyleType.NON_SMOOTHED_REPEATING_BITMAP,
-                        FillStyleType.NON_SMOOTHED_CLIPPED_BITMAP,
-                    ):
+        elif type in __BITMAP_FILLS__:
             bitmap_id = stream.read_uint16()
             bitmap_matrix = Matrix.unpack(stream)
 
@@ -452,7 +458,7 @@ class FillStyle:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class FillStyleArray:
     fill_styles: list[FillStyle]
 
@@ -467,7 +473,7 @@ class FillStyleArray:
             fill_styles=fill_styles,
         )
 
-@dataclass
+@dataclass(slots=True)
 class LineStyle:
     width: int
     color: RGB
@@ -488,7 +494,7 @@ class LineStyle:
 
 
 class ShapeRecord:
-    pass
+    __slots__ = ()
 
 
 def unpack_shape(fill_bits, line_bits, shape_version, stream):
@@ -506,7 +512,7 @@ def unpack_shape(fill_bits, line_bits, shape_version, stream):
 
     return StyleChange.unpack(fill_bits, line_bits, shape_version, stream)
 
-@dataclass
+@dataclass(slots=True)
 class StyleChange(ShapeRecord):
     is_edge_record: bool
     move_delta_x: int
@@ -519,11 +525,10 @@ class StyleChange(ShapeRecord):
 
     @classmethod
     def unpack(cls, fill_bits, line_bits, shape_version, stream):
-        state_new_styles = stream.read_bit_bool()
-        state_line_style = stream.read_bit_bool()
-        state_fill_style_1 = stream.read_bit_bool()
-        state_fill_style_0 = stream.read_bit_bool()
-        state_move_to = stream.read_bit_bool()
+        (
+            state_new_styles, state_line_style, state_fill_style_1,
+            state_fill_style_0, state_move_to,
+        ) = stream.read_layout(__STYLE_CHANGE_FLAGS__)
 
         move_delta_x = None
         move_delta_y = None
@@ -567,7 +572,7 @@ class StyleChange(ShapeRecord):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class StraightEdge(ShapeRecord):
     is_edge_record: bool
     is_straight: bool
@@ -601,7 +606,7 @@ class StraightEdge(ShapeRecord):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CurvedEdge(ShapeRecord):
     is_edge_record: bool
     is_straight: bool
@@ -628,7 +633,7 @@ class CurvedEdge(ShapeRecord):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class EndShape(ShapeRecord):
     is_edge_record: bool
     end_of_shape: int
@@ -642,7 +647,7 @@ class EndShape(ShapeRecord):
             end_of_shape=end_of_shape,
         )
 
-@dataclass
+@dataclass(slots=True)
 class Shape:
     fill_bits: int
     line_bits: int
@@ -665,7 +670,7 @@ class Shape:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class LineStyleArray:
     line_styles: list[LineStyle]
 
@@ -682,7 +687,7 @@ class LineStyleArray:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ShapeWithStyle(Shape):
     fill_styles: FillStyleArray
     line_styles: LineStyleArray
@@ -702,7 +707,7 @@ class ShapeWithStyle(Shape):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MorphGradRecord:
     start_ratio: int
     start_color: RGBA
@@ -724,7 +729,7 @@ class MorphGradRecord:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MorphGradient:
     morph_grads: list[MorphGradRecord]
 
@@ -738,7 +743,7 @@ class MorphGradient:
             morph_grads=morph_grads,
         )
 
-@dataclass
+@dataclass(slots=True)
 class MorphFillStyle:
     type: int
     start_color: RGBA
@@ -750,9 +755,11 @@ class MorphFillStyle:
     start_bitmap_matrix: Matrix
     end_bitmap_matrix: Matrix
 
+    type_enum = EnumField(FillStyleType, 'type')
+
     @classmethod
     def unpack(cls, stream):
-        type = FillStyleType(stream.read_uint8())
+        type = stream.read_uint8()
         start_color = None
         end_color = None
         start_gradient_matrix = None
@@ -761,22 +768,14 @@ class MorphFillStyle:
         bitmap_id = None
         start_bitmap_matrix = None
         end_bitmap_matrix = None
-        if type == FillStyleType.SOLID:
+        if type == __SOLID_FILL__:
             start_color = RGBA.unpack(stream)
             end_color = RGBA.unpack(stream)
-        elif type in (
-                        FillStyleType.LINEAR_GRADIENT,
-                        FillStyleType.RADIAL_GRADIENT,
-                    ):
+        elif type in __MORPH_GRADIENT_FILLS__:
             start_gradient_matrix = Matrix.unpack(stream)
             end_gradient_matrix = Matrix.unpack(stream)
             gradient =  MorphGradient.unpack(stream)
-        elif type in (
-                        FillStyleType.REPEATING_BITMAP,
-                        FillStyleType.CLIPPED_BITMAP,
-                        FillStyleType.NON_SMOOTHED_REPEATING_BITMAP,
-                        FillStyleType.NON_SMOOTHED_CLIPPED_BITMAP,
-                    ):
+        elif type in __BITMAP_FILLS__:
             bitmap_id = stream.read_uint16()
             start_bitmap_matrix = Matrix.unpack(stream)
             end_bitmap_matrix = Matrix.unpack(stream)
@@ -794,7 +793,7 @@ class MorphFillStyle:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MorphLineStyle:
     start_width: int
     end_width: int
@@ -817,7 +816,7 @@ class MorphLineStyle:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MorphLineStyle2:
     start_width: int
     end_width: int
@@ -880,7 +879,7 @@ class MorphLineStyle2:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MorphLineStyleArray:
     line_styles: list[Union[MorphLineStyle, MorphLineStyle2]]
 
@@ -900,7 +899,7 @@ class MorphLineStyleArray:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MorphFillStyleArray:
     line_styles: list[MorphFillStyle]
 
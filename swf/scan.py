@@ -0,0 +1,134 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from stream import Stream
+from swf.file import unpack_body
+from swf.tags import __TAGS__, DefineSprite, ShowFrame, walk as walk_tags
+
+
+# files sent to a worker at once
+__BATCH_SIZE__ = 64
+
+
+@dataclass
+class TagStats:
+    count: int = 0
+    # body bytes, headers excluded
+    bytes: int = 0
+
+
+@dataclass
+class ScanStats:
+    files: int = 0
+    # files that couldn't be scanned
+    errors: int = 0
+    # decompressed bytes
+    bytes: int = 0
+    # ShowFrame tags of the main timeline and of the sprites
+    frames: int = 0
+    sprite_frames: int = 0
+    sprites: int = 0
+    # tag code -> count and bytes
+    tags: dict[int, TagStats] = field(default_factory=dict)
+    # nesting depth -> tags, 0 for the main timeline
+    depths: dict[int, int] = field(default_factory=dict)
+
+    def merge(self, other):
+        self.files += other.files
+        self.errors += other.errors
+        self.bytes += other.bytes
+        self.frames += other.frames
+        self.sprite_frames += other.sprite_frames
+        self.sprites += other.sprites
+        for code, stats in other.tags.items():
+            total = self.tags.setdefault(code, TagStats())
+            total.count += stats.count
+            total.bytes += stats.bytes
+        for depth, count in other.depths.items():
+            self.depths[depth] = self.depths.get(depth, 0) + count
+
+        return self
+
+    def table(self):
+        lines = [
+            f"files {self.files}, errors {self.errors}, "
+            f"bytes {self.bytes}",
+            f"frames {self.frames}, sprites {self.sprites}, "
+            f"sprite frames {self.sprite_frames}",
+            '',
+            f"{'code':>5} {'tag':<32} {'count':>10} {'bytes':>14}",
+        ]
+        for code, stats in sorted(
+                self.tags.items(), key=lambda item: -item[1].bytes):
+            cls = __TAGS__.get(code)
+            name = cls.__name__ if cls is not None else 'Unknown'
+            lines.append(
+                f"{code:>5} {name:<32} {stats.count:>10} {stats.bytes:>14}"
+            )
+
+        lines.append('')
+        lines.append(f"{'depth':>5} {'tags':>10}")
+        for depth, count in sorted(self.depths.items()):
+            lines.append(f"{depth:>5} {count:>10}")
+
+        return '\n'.join(lines)
+
+
+def scan(data):
+    """Statistics of a SWF from its tag headers, no tag body is decoded."""
+    stats = ScanStats(files=1)
+    header, stream = unpack_body(Stream(data))
+    stats.bytes = stream.bytes_length
+    tags = stats.tags
+    depths = stats.depths
+    for _, header, depth in walk_tags(stream):
+        depths[depth] = depths.get(depth, 0) + 1
+        tag_stats = tags.get(header.code)
+        if tag_stats is None:
+            tag_stats = tags[header.code] = TagStats()
+        tag_stats.count += 1
+        tag_stats.bytes += header.length
+
+        if header.code == ShowFrame.__code__:
+            if depth:
+                stats.sprite_frames += 1
+            else:
+                stats.frames += 1
+        elif header.code == DefineSprite.__code__:
+            stats.sprites += 1
+
+    return stats
+
+
+def scan_file(path):
+    try:
+        with open(path, 'rb') as file:
+            return scan(file.read())
+    except Exception:
+        # malformed files are counted, they don't stop a corpus scan
+        return ScanStats(files=1, errors=1)
+
+
+def _scan_batch(paths):
+    return [(path, scan_file(path)) for path in paths]
+
+
+def iter_scan(paths, workers=None):
+    """(path, stats) of each file, scanned by `workers` processes."""
+    paths = list(paths)
+    batches = [
+        paths[idx:idx + __BATCH_SIZE__]
+        for idx in range(0, len(paths), __BATCH_SIZE__)
+    ]
+    with ProcessPoolExecutor(workers) as pool:
+        for results in pool.map(_scan_batch, batches):
+            yield from results
+
+
+def scan_files(paths, workers=None):
+    """Statistics over all the files of `paths`."""
+    total = ScanStats()
+    for _, stats in iter_scan(paths, workers):
+        total.merge(stats)
+
+    return total
@@ -0,0 +1,75 @@
+from bisect import bisect_right
+import zlib
+
+
+# decompressed bytes between two checkpoints
+__INTERVAL__ = 4 << 20
+# compressed bytes fed to the decompressor at once, and most bytes it
+# outputs for them
+__INPUT_SIZE__ = 1 << 16
+__OUTPUT_SIZE__ = 1 << 18
+
+
+class SeekableZlib:
+    """Random reads in a zlib stream.
+
+    Decompressor snapshots are recorded every `interval` decompressed
+    bytes the first time the stream is read through, a later read
+    resumes from the closest snapshot before it, so it decompresses at
+    most about `interval` bytes besides the ones it returns.
+    """
+
+    def __init__(self, data, interval=__INTERVAL__):
+        self.data = memoryview(data)
+        self.interval = interval
+        # (decompressed position, compressed position, decompressor)
+        self.checkpoints = [(0, 0, zlib.decompressobj())]
+        self._positions = [0]
+        self._frontier = self.checkpoints[0]
+
+    def _advance(self, position):
+        """Record checkpoints until one is past `position` or the stream
+        ends."""
+        out_position, in_position, decompressor = self._frontier
+        decompressor = decompressor.copy()
+        last = self._positions[-1]
+        while out_position <= position and not decompressor.eof and \
+                in_position < len(self.data):
+            data, in_position = _step(decompressor, self.data, in_position)
+            out_position += len(data)
+            if out_position - last >= self.interval:
+                self.checkpoints.append(
+                    (out_position, in_position, decompressor.copy())
+                )
+                self._positions.append(out_position)
+                last = out_position
+
+        self._frontier = (out_position, in_position, decompressor)
+
+    def read(self, position, size):
+        end = position + size
+        if position >= self._frontier[0]:
+            self._advance(position)
+
+        idx = bisect_right(self._positions, position) - 1
+        out_position, in_position, decompressor = self.checkpoints[idx]
+        decompressor = decompressor.copy()
+
+        parts = []
+        start = out_position
+        while out_position < end and not decompressor.eof and \
+                in_position < len(self.data):
+            part, in_position = _step(decompressor, self.data, in_position)
+            parts.append(part)
+            out_position += len(part)
+
+        data = b''.join(parts)
+        return data[position - start:end - start]
+
+
+def _step(decompressor, data, position):
+    """Decompress a bounded part of `data` from `position`, returns it with
+    the position of the first compressed byte left."""
+    data = data[position:position + __INPUT_SIZE__]
+    part = decompressor.decompress(data, __OUTPUT_SIZE__)
+    return part, position + len(data) - len(decompressor.unconsumed_tail)
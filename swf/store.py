@@ -0,0 +1,137 @@
+from dataclasses import asdict, dataclass
+import hashlib
+import json
+import os
+import struct
+import tempfile
+
+from stream import Stream
+from swf.file import unpack_body
+from swf.tags import End, walk as walk_tags
+
+
+__LONG_HEADER_SIZE__ = 6
+
+
+def digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass
+class Manifest:
+    # hash of the SWF file content
+    hash: str
+    version: int
+    # hash of the movie header fields preceding the first tag
+    head: str
+    # (code, body hash, long header) in file order, the End tag excluded
+    tags: list[tuple[int, str, bool]]
+
+    def hashes(self):
+        return {hash for _, hash, _ in self.tags} | {self.head}
+
+
+class AssetStore:
+    """Content-addressed store of SWF tag bodies.
+
+    Every tag body is stored once under its SHA-256, and every SWF is
+    recorded as a manifest of body hashes, keyed by the hash of the file
+    content. Adding a file already in the store costs one hash.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+        os.makedirs(os.path.join(root, 'manifests'), exist_ok=True)
+
+    def _object_path(self, hash):
+        return os.path.join(self.root, 'objects', hash[:2], hash[2:])
+
+    def _manifest_path(self, hash):
+        return os.path.join(self.root, 'manifests', f"{hash}.json")
+
+    def __contains__(self, hash):
+        return os.path.exists(self._object_path(hash))
+
+    def put(self, data):
+        hash = digest(data)
+        path = self._object_path(hash)
+        if not os.path.exists(path):
+            _write_atomic(path, data)
+
+        return hash
+
+    def get(self, hash):
+        with open(self._object_path(hash), 'rb') as file:
+            return file.read()
+
+    def manifest(self, hash):
+        path = self._manifest_path(hash)
+        if not os.path.exists(path):
+            return None
+
+        with open(path) as file:
+            manifest = json.load(file)
+
+        manifest['tags'] = [tuple(tag) for tag in manifest['tags']]
+        return Manifest(**manifest)
+
+    def add(self, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        return self.add_bytes(data)
+
+    def add_bytes(self, data):
+        hash = digest(data)
+        manifest = self.manifest(hash)
+        if manifest is not None:
+            return manifest
+
+        header, stream = unpack_body(Stream(data))
+        body = memoryview(stream.buffer)
+        head = self.put(body[:stream.byte_position])
+
+        tags = []
+        # sprites are stored whole, their control tags included
+        for position, tag, _ in walk_tags(stream, lambda header: False):
+            is_long = tag.offset - position == __LONG_HEADER_SIZE__
+            tag_hash = self.put(body[tag.offset:tag.offset + tag.length])
+            tags.append((tag.code, tag_hash, is_long))
+
+        manifest = Manifest(
+            hash=hash,
+            version=header.version,
+            head=head,
+            tags=tags,
+        )
+        _write_atomic(
+            self._manifest_path(hash),
+            json.dumps(asdict(manifest)).encode(),
+        )
+        return manifest
+
+    def rebuild(self, manifest):
+        """Uncompressed SWF with the tags of `manifest`."""
+        chunks = [self.get(manifest.head)]
+        for code, hash, is_long in manifest.tags:
+            data = self.get(hash)
+            if is_long or len(data) >= 0x3f:
+                chunks.append(struct.pack('<HI', code << 6 | 0x3f, len(data)))
+            else:
+                chunks.append(struct.pack('<H', code << 6 | len(data)))
+            chunks.append(data)
+        chunks.append(struct.pack('<H', End.__code__ << 6))
+
+        body = b''.join(chunks)
+        return b'FWS' + bytes([manifest.version]) + \
+               struct.pack('<I', 8 + len(body)) + body
+
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=directory)
+    with os.fdopen(fd, 'wb') as file:
+        file.write(data)
+    os.replace(temp, path)
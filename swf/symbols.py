@@ -0,0 +1,223 @@
+import hashlib
+import os
+import sqlite3
+
+from amv2.structs import File as ABCFile, GenericName, Multiname_, QName
+from stream import Stream
+from swf.file import File
+from swf.tags import DefineSprite, DoABC, SymbolClass
+
+
+__SCHEMA__ = '''
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_hash ON files (hash);
+CREATE TABLE IF NOT EXISTS contents (
+    hash TEXT PRIMARY KEY,
+    error TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS symbols (
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    -- class extending or implementing `name`, empty for other kinds
+    owner TEXT NOT NULL,
+    PRIMARY KEY (name, kind, hash, owner)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS symbols_hash ON symbols (hash);
+'''
+
+CLASS = 'class'
+SUPER = 'super'
+INTERFACE = 'interface'
+REFERENCE = 'reference'
+SYMBOL = 'symbol'
+
+
+def multiname_name(cpool, idx):
+    """Qualified name of a multiname, None for runtime names."""
+    if idx == 0 or idx > len(cpool.multinames):
+        return None
+
+    multiname = cpool.multinames[idx - 1]
+    if isinstance(multiname, GenericName):
+        return multiname_name(cpool, multiname.name_idx)
+    if not isinstance(multiname, (QName, Multiname_)):
+        return None
+
+    name = _string(cpool, multiname.name_idx)
+    if name is None or not isinstance(multiname, QName):
+        return name
+
+    namespace_idx = multiname.namespace_idx
+    if namespace_idx == 0 or namespace_idx > len(cpool.namespaces):
+        return name
+
+    package = _string(cpool, cpool.namespaces[namespace_idx - 1].name_idx)
+    return f"{package}.{name}" if package else name
+
+
+def _string(cpool, idx):
+    if idx == 0 or idx > len(cpool.strings):
+        return None
+
+    return str(cpool.strings[idx - 1])
+
+
+def abc_symbols(abc):
+    cpool = abc.constants_pool
+    symbols = set()
+    for instance in abc.instances:
+        name = multiname_name(cpool, instance.name_idx)
+        if name is None:
+            continue
+
+        symbols.add((name, CLASS, ''))
+        super_name = multiname_name(cpool, instance.super_name_idx)
+        if super_name is not None:
+            symbols.add((super_name, SUPER, name))
+        for interface_idx in instance.interfaces:
+            interface = multiname_name(cpool, interface_idx)
+            if interface is not None:
+                symbols.add((interface, INTERFACE, name))
+
+    for idx in range(1, len(cpool.multinames) + 1):
+        name = multiname_name(cpool, idx)
+        if name is not None:
+            symbols.add((name, REFERENCE, ''))
+
+    return symbols
+
+
+def swf_symbols(swf):
+    """(name, kind, owner) defined or referenced by a parsed SWF."""
+    symbols = set()
+    tags = list(swf.tags)
+    while tags:
+        tag = tags.pop()
+        if isinstance(tag, DoABC):
+            abc = ABCFile.unpack(Stream(tag.data))
+            symbols.update(abc_symbols(abc))
+        elif isinstance(tag, SymbolClass):
+            symbols.update((name, SYMBOL, '') for _, name in tag.tags)
+        elif isinstance(tag, DefineSprite):
+            tags.extend(tag.control_tags)
+
+    return symbols
+
+
+class SymbolIndex:
+    """SQLite index of the AS3 symbols of a SWF corpus.
+
+    Symbols are stored per file content hash, so renamed or duplicated
+    files are only parsed once, and `update` only parses files whose
+    size or modification time changed.
+    """
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(__SCHEMA__)
+
+    def update(self, paths):
+        """Index `paths`, returns the number of parsed files."""
+        parsed = 0
+        with self.connection:
+            for path in paths:
+                parsed = parsed + self._update(os.path.abspath(path))
+
+        return parsed
+
+    def _update(self, path):
+        stat = os.stat(path)
+        row = self.connection.execute(
+            'SELECT size, mtime FROM files WHERE path = ?', (path,)
+        ).fetchone()
+        if row == (stat.st_size, stat.st_mtime):
+            return 0
+
+        with open(path, 'rb') as file:
+            data = file.read()
+        hash = hashlib.sha256(data).hexdigest()
+
+        self.connection.execute(
+            'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)',
+            (path, hash, stat.st_size, stat.st_mtime),
+        )
+
+        known = self.connection.execute(
+            'SELECT 1 FROM contents WHERE hash = ?', (hash,)
+        ).fetchone()
+        if known:
+            return 0
+
+        error = None
+        symbols = ()
+        try:
+            symbols = swf_symbols(File.unpack(Stream(data)))
+        except Exception as e:
+            # malformed files are recorded so they aren't parsed again
+            error = f"{type(e).__name__}: {e}"
+
+        self.connection.execute(
+            'INSERT INTO contents VALUES (?, ?)', (hash, error)
+        )
+        self.connection.executemany(
+            'INSERT INTO symbols VALUES (?, ?, ?, ?)',
+            ((name, kind, hash, owner) for name, kind, owner in symbols),
+        )
+        return 1
+
+    def remove(self, paths):
+        with self.connection:
+            self.connection.executemany(
+                'DELETE FROM files WHERE path = ?',
+                ((os.path.abspath(path),) for path in paths),
+            )
+
+    def prune(self):
+        """Drop the symbols of contents no file points to anymore."""
+        with self.connection:
+            self.connection.execute(
+                'DELETE FROM contents WHERE hash NOT IN '
+                '(SELECT hash FROM files)'
+            )
+            self.connection.execute(
+                'DELETE FROM symbols WHERE hash NOT IN '
+                '(SELECT hash FROM contents)'
+            )
+
+    def find(self, name, kinds=(CLASS, SYMBOL)):
+        """Paths of the files with `name` as one of `kinds`."""
+        placeholders = ', '.join('?' * len(kinds))
+        rows = self.connection.execute(
+            'SELECT DISTINCT files.path FROM symbols '
+            'JOIN files ON files.hash = symbols.hash '
+            f'WHERE symbols.name = ? AND symbols.kind IN ({placeholders}) '
+            'ORDER BY files.path',
+            (name, *kinds),
+        )
+        return [path for path, in rows]
+
+    def defines(self, name):
+        return self.find(name, (CLASS, SYMBOL))
+
+    def references(self, name):
+        return self.find(name, (REFERENCE, SUPER, INTERFACE))
+
+    def subclasses(self, name):
+        """Classes extending or implementing `name`, with their files."""
+        rows = self.connection.execute(
+            'SELECT DISTINCT symbols.owner, files.path FROM symbols '
+            'JOIN files ON files.hash = symbols.hash '
+            'WHERE symbols.name = ? AND symbols.kind IN (?, ?) '
+            'ORDER BY files.path',
+            (name, SUPER, INTERFACE),
+        )
+        return rows.fetchall()
+
+    def close(self):
+        self.connection.close()
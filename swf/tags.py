@@ -1,8 +1,12 @@
 from dataclasses import dataclass
 import inspect
-from swf.actions import ClipActions
 
-from swf.enums import BlendMode
+from stream import BitLayout
+from swf.actions import ActionBlock, ClipActions
+
+from swf.enums import BlendMode, SoundFormat, SoundRate, SoundSize, \
+                      SoundType, VideoCodec
+from swf.fields import EnumField
 from swf.filters import FilterList
 from swf.records import RGB, RGBA, CxformWithAlpha, \
                         Cxform, Matrix, MorphFillStyleArray, \
@@ -12,6 +16,22 @@ from swf.records import RGB, RGBA, CxformWithAlpha, \
 
 __TAGS__ = {}
 
+# tags whose body starts with the id of the character they define
+__CHARACTER_TAGS__ = frozenset((
+    2, 6, 7, 10, 11, 13, 14, 20, 21, 22, 32, 33, 34, 35, 36, 37, 39, 46,
+    48, 60, 62, 75, 83, 84, 87, 90, 91,
+))
+
+__PLACE_OBJECT_2_FLAGS__ = BitLayout('? ? ? ? ? ? ? ?')
+__PLACE_OBJECT_3_FLAGS__ = BitLayout('? ? ? ? ? ? ? ? x ? ? ? ? ? ? ?')
+__FILE_ATTRIBUTES_FLAGS__ = BitLayout('x ? ? ? ? x2 ? x24')
+
+# stream sound compression followed by a latency seek
+__MP3__ = SoundFormat.MP3.value
+
+# sprite id and frame count preceding the control tags
+__SPRITE_HEADER_SIZE__ = 4
+
 
 def register_tag(code):
     def modifier(cls):
@@ -23,10 +43,12 @@ def register_tag(code):
     return modifier
 
 
-@dataclass
+@dataclass(slots=True)
 class Header:
     code: int
     length: int
+    # position of the tag body in the decompressed data
+    offset: int
 
     @classmethod
     def unpack(cls, stream):
@@ -43,28 +65,69 @@ class Header:
         return cls(
             code=code,
             length=length,
+            offset=stream.origin + stream.byte_position,
         )
 
 def unpack(version, stream):
     header = Header.unpack(stream)
+    # decoders can't read past their body, and the next tag always
+    # starts `length` bytes further whatever they read
+    body = stream.substream(header.length)
     if header.code not in __TAGS__:
         # unkown tag
         print(f"Unkown tag {header.code}, length: {header.length}")
-        if header.length != 0:
-            stream.move_bytes(header.length)
         return None
 
     unpack_tag = __TAGS__[header.code].unpack
-    args, *_ = inspect.getargspec(unpack_tag)
+    args, *_ = inspect.getfullargspec(unpack_tag)
     if len(args) == 4:
-        tag = unpack_tag(header, version, stream)
+        tag = unpack_tag(header, version, body)
     else:
-        tag = unpack_tag(header, stream)
+        tag = unpack_tag(header, body)
 
     return tag
 
 
-@dataclass
+def skip(stream):
+    """Read a tag header and move past its body without decoding it."""
+    header = Header.unpack(stream)
+    if header.length != 0:
+        stream.move_bytes(header.length)
+
+    return header
+
+
+def walk(stream, descend=None):
+    """(position, header, depth) of the tags up to the End of the main
+    timeline, without decoding them.
+
+    The control tags of each DefineSprite follow it one level deeper,
+    unless `descend(header)` is false for it. End tags aren't included,
+    the stream is left after the End of the main timeline.
+    """
+    # positions after the sprites being walked
+    ends = []
+    while True:
+        position = stream.byte_position
+        header = Header.unpack(stream)
+        if header.code == End.__code__:
+            if not ends:
+                return
+            stream.seek_bytes(ends.pop())
+            continue
+
+        yield position, header, len(ends)
+
+        local = header.offset - stream.origin
+        if header.code == DefineSprite.__code__ and (
+                descend is None or descend(header)):
+            ends.append(local + header.length)
+            stream.seek_bytes(local + __SPRITE_HEADER_SIZE__)
+        else:
+            stream.seek_bytes(local + header.length)
+
+
+@dataclass(slots=True)
 class Tag:
     header: Header
 
@@ -74,8 +137,8 @@ class Tag:
             header=header,
         )
 
-@dataclass
 @register_tag(code=4)
+@dataclass(slots=True)
 class PlaceObject(Tag):
     character_id: int
     depth: int
@@ -98,8 +161,8 @@ class PlaceObject(Tag):
         )
 
 
-@dataclass
 @register_tag(code=26)
+@dataclass(slots=True)
 class PlaceObject2(Tag):
     move: bool
     depth: int
@@ -113,14 +176,10 @@ class PlaceObject2(Tag):
 
     @classmethod
     def unpack(cls, header, version, stream):
-        has_clip_actions = stream.read_bit_bool()
-        has_clip_depth = stream.read_bit_bool()
-        has_name = stream.read_bit_bool()
-        has_ratio = stream.read_bit_bool()
-        has_color_transform = stream.read_bit_bool()
-        has_matrix = stream.read_bit_bool()
-        has_character = stream.read_bit_bool()
-        move = stream.read_bit_bool()
+        (
+            has_clip_actions, has_clip_depth, has_name, has_ratio,
+            has_color_transform, has_matrix, has_character, move,
+        ) = stream.read_layout(__PLACE_OBJECT_2_FLAGS__)
         depth = stream.read_uint16()
 
         character_id = None
@@ -165,13 +224,13 @@ class PlaceObject2(Tag):
         )
 
 
-@dataclass
 @register_tag(code=70)
+@dataclass(slots=True)
 class PlaceObject3(Tag):
     move: bool
     opaque_background: bool
     depth: int
-    class_name = str
+    class_name: str
     character_id: int
     matrix: Matrix
     color_transform: CxformWithAlpha
@@ -179,29 +238,22 @@ class PlaceObject3(Tag):
     name: str
     clip_depth: int
     surface_filter_list: FilterList
-    blend_mode: BlendMode
-    bit_map_cache: int
+    blend_mode: int
+    bitmap_cache: int
     visible: int
     background_color: RGBA
     clip_actions: ClipActions
 
+    blend_mode_enum = EnumField(BlendMode, 'blend_mode')
+
     @classmethod
     def unpack(cls, header, version, stream):
-        has_clip_actions = stream.read_bit_bool()
-        has_clip_depth = stream.read_bit_bool()
-        has_name = stream.read_bit_bool()
-        has_ratio = stream.read_bit_bool()
-        has_color_transform = stream.read_bit_bool()
-        has_matrix = stream.read_bit_bool()
-        has_character = stream.read_bit_bool()
-        move = stream.read_bit_bool()
-        opaque_background = stream.read_bit_bool()
-        has_visible = stream.read_bit_bool()
-        has_image = stream.read_bit_bool()
-        has_class_name = stream.read_bit_bool()
-        has_cache_as_bitmap = stream.read_bit_bool()
-        has_blend_mode = stream.read_bit_bool()
-        has_filter_list = stream.read_bit_bool()
+        (
+            has_clip_actions, has_clip_depth, has_name, has_ratio,
+            has_color_transform, has_matrix, has_character, move,
+            opaque_background, has_visible, has_image, has_class_name,
+            has_cache_as_bitmap, has_blend_mode, has_filter_list,
+        ) = stream.read_layout(__PLACE_OBJECT_3_FLAGS__)
         depth = stream.read_uint16()
 
         class_name = None
@@ -238,7 +290,7 @@ class PlaceObject3(Tag):
 
         blend_mode = None
         if has_blend_mode:
-            blend_mode = BlendMode(stream.read_uint8())
+            blend_mode = stream.read_uint8()
 
         bitmap_cache = None
         if has_cache_as_bitmap:
@@ -275,8 +327,8 @@ class PlaceObject3(Tag):
         )
 
 
-@dataclass
 @register_tag(code=5)
+@dataclass(slots=True)
 class RemoveObject(Tag):
     character_id: int
     depth: int
@@ -293,8 +345,8 @@ class RemoveObject(Tag):
         )
 
 
-@dataclass
 @register_tag(code=28)
+@dataclass(slots=True)
 class RemoveObject2(Tag):
     depth: int
 
@@ -308,14 +360,14 @@ class RemoveObject2(Tag):
         )
 
 
-@dataclass
 @register_tag(code=1)
+@dataclass(slots=True)
 class ShowFrame(Tag):
     pass
 
 
-@dataclass
 @register_tag(code=9)
+@dataclass(slots=True)
 class SetBackgroundColor(Tag):
     background_color: RGB
 
@@ -329,8 +381,8 @@ class SetBackgroundColor(Tag):
         )
 
 
-@dataclass
 @register_tag(code=43)
+@dataclass(slots=True)
 class FrameLabel(Tag):
     name: str
     named_anchor: bool
@@ -349,20 +401,20 @@ class FrameLabel(Tag):
         )
 
 
-@dataclass
 @register_tag(code=24)
+@dataclass(slots=True)
 class Protect(Tag):
     pass
 
 
-@dataclass
 @register_tag(code=0)
+@dataclass(slots=True)
 class End(Tag):
     pass
 
 
-@dataclass
 @register_tag(code=56)
+@dataclass(slots=True)
 class ExportAssets(Tag):
     tags: list[tuple[int, str]]
 
@@ -378,8 +430,8 @@ class ExportAssets(Tag):
         )
 
 
-@dataclass
 @register_tag(code=57)
+@dataclass(slots=True)
 class ImportAssets(Tag):
     url: str
     tags: list[tuple[int, str]]
@@ -398,8 +450,8 @@ class ImportAssets(Tag):
         )
 
 
-@dataclass
 @register_tag(code=58)
+@dataclass(slots=True)
 class EnableDebuger(Tag):
     password: str
 
@@ -413,8 +465,8 @@ class EnableDebuger(Tag):
         )
 
 
-@dataclass
 @register_tag(code=64)
+@dataclass(slots=True)
 class EnableDebuger2(Tag):
     #reserved: int
     password: str
@@ -430,8 +482,8 @@ class EnableDebuger2(Tag):
         )
 
 
-@dataclass
 @register_tag(code=65)
+@dataclass(slots=True)
 class ScriptLimits(Tag):
     max_recursion_depth: int
     script_timeout_seconds: int
@@ -448,8 +500,8 @@ class ScriptLimits(Tag):
         )
 
 
-@dataclass
 @register_tag(code=66)
+@dataclass(slots=True)
 class SetTabIndex(Tag):
     depth: int
     tab_index: int
@@ -466,8 +518,8 @@ class SetTabIndex(Tag):
         )
 
 
-@dataclass
 @register_tag(code=69)
+@dataclass(slots=True)
 class FileAttributes(Tag):
     #reserved: int
     use_direct_blit: bool
@@ -480,15 +532,10 @@ class FileAttributes(Tag):
 
     @classmethod
     def unpack(cls, header, stream):
-
-        stream.read_ubits(1)  # reserved always 0
-        use_direct_blit = stream.read_bit_bool()
-        use_gpu = stream.read_bit_bool()
-        has_metadata = stream.read_bit_bool()
-        actionscript3 = stream.read_bit_bool()
-        stream.read_ubits(2)  # reserved always 0
-        use_network = stream.read_bit_bool()
-        stream.read_ubits(24)  # reserved always 0
+        (
+            use_direct_blit, use_gpu, has_metadata, actionscript3,
+            use_network,
+        ) = stream.read_layout(__FILE_ATTRIBUTES_FLAGS__)
 
         return cls(
             header=header,
@@ -500,8 +547,8 @@ class FileAttributes(Tag):
         )
 
 
-@dataclass
 @register_tag(code=71)
+@dataclass(slots=True)
 class ImportAssets2(Tag):
     url: str
     #reserved: int
@@ -524,8 +571,8 @@ class ImportAssets2(Tag):
         )
 
 
-@dataclass
 @register_tag(code=76)
+@dataclass(slots=True)
 class SymbolClass(Tag):
     tags: list[tuple[int, str]]
 
@@ -541,8 +588,8 @@ class SymbolClass(Tag):
         )
 
 
-@dataclass
 @register_tag(code=77)
+@dataclass(slots=True)
 class Metadata(Tag):
     metadata: str
 
@@ -556,8 +603,8 @@ class Metadata(Tag):
         )
 
 
-@dataclass
 @register_tag(code=78)
+@dataclass(slots=True)
 class Metadata(Tag):
     character_id: int
     splitter: Rectangle
@@ -574,8 +621,8 @@ class Metadata(Tag):
         )
 
 
-@dataclass
 @register_tag(code=2)
+@dataclass(slots=True)
 class DefineShape(Tag):
     shape_id: int
     shape_bounds: Rectangle
@@ -595,8 +642,8 @@ class DefineShape(Tag):
         )
 
 
-@dataclass
 @register_tag(code=22)
+@dataclass(slots=True)
 class DefineShape2(Tag):
     shape_id: int
     shape_bounds: Rectangle
@@ -616,8 +663,8 @@ class DefineShape2(Tag):
         )
 
 
-@dataclass
 @register_tag(code=32)
+@dataclass(slots=True)
 class DefineShape3(Tag):
     shape_id: int
     shape_bounds: Rectangle
@@ -637,8 +684,8 @@ class DefineShape3(Tag):
         )
 
 
-@dataclass
 @register_tag(code=83)
+@dataclass(slots=True)
 class DefineShape4(Tag):
     shape_id: int
     shape_bounds: Rectangle
@@ -669,8 +716,8 @@ class DefineShape4(Tag):
             shapes=shapes,
         )
 
-@dataclass
 @register_tag(code=46)
+@dataclass(slots=True)
 class DefineMorphShape(Tag):
     character_id: int
     start_bounds: Rectangle
@@ -706,8 +753,8 @@ class DefineMorphShape(Tag):
         )
 
 
-@dataclass
 @register_tag(code=39)
+@dataclass(slots=True)
 class DefineSprite(Tag):
     sprite_id: int
     frame_count: int
@@ -732,8 +779,218 @@ class DefineSprite(Tag):
         )
 
 
-@dataclass
+@register_tag(code=14)
+@dataclass(slots=True)
+class DefineSound(Tag):
+    sound_id: int
+    sound_format: int
+    sound_rate: int
+    sound_size: int
+    sound_type: int
+    sound_sample_count: int
+    sound_data: memoryview
+
+    sound_format_enum = EnumField(SoundFormat, 'sound_format')
+    sound_rate_enum = EnumField(SoundRate, 'sound_rate')
+    sound_size_enum = EnumField(SoundSize, 'sound_size')
+    sound_type_enum = EnumField(SoundType, 'sound_type')
+
+    @classmethod
+    def unpack(cls, header, stream):
+        position = stream.byte_position
+
+        sound_id = stream.read_uint16()
+        sound_format = stream.read_ubits(4)
+        sound_rate = stream.read_ubits(2)
+        sound_size = stream.read_ubits(1)
+        sound_type = stream.read_ubits(1)
+        sound_sample_count = stream.read_uint32()
+
+        bytes_read = stream.byte_position - position
+        sound_data = stream.read_view(header.length - bytes_read)
+
+        return cls(
+            header=header,
+            sound_id=sound_id,
+            sound_format=sound_format,
+            sound_rate=sound_rate,
+            sound_size=sound_size,
+            sound_type=sound_type,
+            sound_sample_count=sound_sample_count,
+            sound_data=sound_data,
+        )
+
+
+@register_tag(code=18)
+@dataclass(slots=True)
+class SoundStreamHead(Tag):
+    #reserved: int
+    playback_sound_rate: int
+    playback_sound_size: int
+    playback_sound_type: int
+    stream_sound_compression: int
+    stream_sound_rate: int
+    stream_sound_size: int
+    stream_sound_type: int
+    stream_sound_sample_count: int
+    latency_seek: int
+
+    playback_sound_rate_enum = EnumField(SoundRate, 'playback_sound_rate')
+    playback_sound_size_enum = EnumField(SoundSize, 'playback_sound_size')
+    playback_sound_type_enum = EnumField(SoundType, 'playback_sound_type')
+    stream_sound_compression_enum = EnumField(
+        SoundFormat, 'stream_sound_compression'
+    )
+    stream_sound_rate_enum = EnumField(SoundRate, 'stream_sound_rate')
+    stream_sound_size_enum = EnumField(SoundSize, 'stream_sound_size')
+    stream_sound_type_enum = EnumField(SoundType, 'stream_sound_type')
+
+    @classmethod
+    def unpack(cls, header, stream):
+        stream.read_ubits(4)  # reserved always 0
+        playback_sound_rate = stream.read_ubits(2)
+        playback_sound_size = stream.read_ubits(1)
+        playback_sound_type = stream.read_ubits(1)
+        stream_sound_compression = stream.read_ubits(4)
+        stream_sound_rate = stream.read_ubits(2)
+        stream_sound_size = stream.read_ubits(1)
+        stream_sound_type = stream.read_ubits(1)
+        stream_sound_sample_count = stream.read_uint16()
+
+        latency_seek = None
+        if stream_sound_compression == __MP3__ and header.length > 4:
+            latency_seek = stream.read_sint16()
+
+        return cls(
+            header=header,
+            playback_sound_rate=playback_sound_rate,
+            playback_sound_size=playback_sound_size,
+            playback_sound_type=playback_sound_type,
+            stream_sound_compression=stream_sound_compression,
+            stream_sound_rate=stream_sound_rate,
+            stream_sound_size=stream_sound_size,
+            stream_sound_type=stream_sound_type,
+            stream_sound_sample_count=stream_sound_sample_count,
+            latency_seek=latency_seek,
+        )
+
+
+@register_tag(code=45)
+@dataclass(slots=True)
+class SoundStreamHead2(SoundStreamHead):
+    pass
+
+
+@register_tag(code=19)
+@dataclass(slots=True)
+class SoundStreamBlock(Tag):
+    stream_sound_data: memoryview
+
+    @classmethod
+    def unpack(cls, header, stream):
+        stream_sound_data = stream.read_view(header.length)
+
+        return cls(
+            header=header,
+            stream_sound_data=stream_sound_data,
+        )
+
+
+@register_tag(code=60)
+@dataclass(slots=True)
+class DefineVideoStream(Tag):
+    character_id: int
+    num_frames: int
+    width: int
+    height: int
+    #reserved: int
+    deblocking: int
+    smoothing: bool
+    codec_id: int
+
+    codec_id_enum = EnumField(VideoCodec, 'codec_id')
+
+    @classmethod
+    def unpack(cls, header, stream):
+        character_id = stream.read_uint16()
+        num_frames = stream.read_uint16()
+        width = stream.read_uint16()
+        height = stream.read_uint16()
+        stream.read_ubits(4)  # reserved always 0
+        deblocking = stream.read_ubits(3)
+        smoothing = stream.read_bit_bool()
+        codec_id = stream.read_uint8()
+
+        return cls(
+            header=header,
+            character_id=character_id,
+            num_frames=num_frames,
+            width=width,
+            height=height,
+            deblocking=deblocking,
+            smoothing=smoothing,
+            codec_id=codec_id,
+        )
+
+
+@register_tag(code=61)
+@dataclass(slots=True)
+class VideoFrame(Tag):
+    stream_id: int
+    frame_num: int
+    video_data: memoryview
+
+    @classmethod
+    def unpack(cls, header, stream):
+        stream_id = stream.read_uint16()
+        frame_num = stream.read_uint16()
+        video_data = stream.read_view(header.length - 4)
+
+        return cls(
+            header=header,
+            stream_id=stream_id,
+            frame_num=frame_num,
+            video_data=video_data,
+        )
+
+
+@register_tag(code=12)
+@dataclass(slots=True)
+class DoAction(Tag):
+    actions: ActionBlock
+
+    @classmethod
+    def unpack(cls, header, stream):
+        actions = ActionBlock.unpack(header.length, stream, header.offset)
+
+        return cls(
+            header=header,
+            actions=actions,
+        )
+
+
+@register_tag(code=59)
+@dataclass(slots=True)
+class DoInitAction(Tag):
+    sprite_id: int
+    actions: ActionBlock
+
+    @classmethod
+    def unpack(cls, header, stream):
+        sprite_id = stream.read_uint16()
+        actions = ActionBlock.unpack(
+            header.length - 2, stream, header.offset + 2
+        )
+
+        return cls(
+            header=header,
+            sprite_id=sprite_id,
+            actions=actions,
+        )
+
+
 @register_tag(code=87)
+@dataclass(slots=True)
 class DefineBinaryData(Tag):
     tag: int
     #reserved: int
@@ -756,8 +1013,8 @@ class DefineBinaryData(Tag):
         )
 
 
-@dataclass
 @register_tag(code=82)
+@dataclass(slots=True)
 class DoABC(Tag):
     flags: int
     name: str
@@ -781,8 +1038,8 @@ class DoABC(Tag):
         )
 
 
-@dataclass
 @register_tag(code=41)
+@dataclass(slots=True)
 class ProductInfo(Tag):
     id: int
     edition: int
@@ -0,0 +1,186 @@
+import struct
+import zlib
+
+import pytest
+
+
+def tag(code, body=b'', long=False):
+    if len(body) < 0x3f and not long:
+        return struct.pack('<H', code << 6 | len(body)) + body
+    return struct.pack('<HI', code << 6 | 0x3f, len(body)) + body
+
+
+def bits(fields):
+    """Big endian bit fields of (size, value), padded to a byte."""
+    text = ''.join(
+        format(value & ((1 << size) - 1), f'0{size}b')
+        for size, value in fields
+    )
+    text += '0' * (-len(text) % 8)
+    return int(text, 2).to_bytes(len(text) // 8, 'big') if text else b''
+
+
+def rect(x_min=0, x_max=11000, y_min=0, y_max=8000):
+    return bits([(5, 15), (15, x_min), (15, x_max), (15, y_min), (15, y_max)])
+
+
+def body(tags, frame_count=1):
+    """Decompressed body: frame size, rate and count, then the tags."""
+    return rect() + struct.pack('<HH', 24 << 8, frame_count) + \
+        b''.join(tags) + tag(0)
+
+
+def swf(tags, signature='FWS', version=10, frame_count=1):
+    data = body(tags, frame_count)
+    length = 8 + len(data)
+    if signature == 'CWS':
+        data = zlib.compress(data)
+    elif signature == 'ZWS':
+        import pylzma
+        # props and data, without the uncompressed size of .lzma files
+        compressed = pylzma.compress(data)
+        data = struct.pack('<I', len(compressed) - 5) + compressed
+
+    return signature.encode() + bytes([version]) + \
+        struct.pack('<I', length) + data
+
+
+def signatures():
+    """File signatures to test, ZWS only when pylzma is installed."""
+    try:
+        import pylzma  # noqa: F401
+    except ImportError:
+        zws = pytest.param('ZWS', marks=pytest.mark.skip('needs pylzma'))
+    else:
+        zws = 'ZWS'
+
+    return ['FWS', 'CWS', zws]
+
+
+def show_frame():
+    return tag(1)
+
+
+def define_sprite(sprite_id, tags, frame_count=1):
+    return tag(
+        39,
+        struct.pack('<HH', sprite_id, frame_count) + b''.join(tags) + tag(0),
+        long=True,
+    )
+
+
+def mp3_frame(fill=0):
+    """MPEG 1 layer III frame, 128 kbit/s at 44100 Hz without padding."""
+    return b'\xff\xfb\x90\x00' + bytes([fill]) * 413
+
+
+def sound_stream_head(compression, code=45):
+    # 44 kHz, 16 bits, stereo for both the playback and the stream
+    data = bytes([0x0f, compression << 4 | 0x0f]) + struct.pack('<H', 1152)
+    if compression == 2:
+        data += struct.pack('<h', 0)
+
+    return tag(code, data)
+
+
+def sound_stream_block(data, mp3=True):
+    if mp3:
+        data = struct.pack('<Hh', 1152, 0) + data
+
+    return tag(19, data, long=True)
+
+
+def u30(value):
+    data = b''
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if not value:
+            return data + bytes([byte])
+        data += bytes([byte | 0x80])
+
+
+def abc_string(text):
+    text = text.encode()
+    return u30(len(text)) + text
+
+
+def abc(name='Foo', package='com.example', super_name='Sprite',
+        code=b'\xd0\x30\x47', sealed=True, interfaces=True,
+        param_type=0, return_type=0):
+    """ABC file of one class `package.name` extending `super_name`, with
+    an initializer, a constructor and a script method running `code`."""
+    strings = [
+        package, name, 'flash.display', super_name, 'IEventDispatcher',
+        'flash.events',
+    ]
+    data = struct.pack('<HH', 16, 46)
+    # int, uint and double pools
+    data += u30(0) + u30(0) + u30(0)
+    data += u30(len(strings) + 1) + b''.join(map(abc_string, strings))
+    namespaces = [(0x16, 1), (0x16, 3), (0x16, 6)]
+    data += u30(len(namespaces) + 1) + b''.join(
+        bytes([kind]) + u30(name) for kind, name in namespaces
+    )
+    # namespace sets
+    data += u30(0)
+    # qualified names: the class, its super class and its interface
+    multinames = [(1, 2), (2, 4), (3, 5)]
+    data += u30(len(multinames) + 1) + b''.join(
+        b'\x07' + u30(ns) + u30(name) for ns, name in multinames
+    )
+
+    data += u30(3)
+    # the class initializer takes one param of `param_type`
+    data += u30(1) + u30(return_type) + u30(param_type) + u30(0) + b'\x00'
+    data += (u30(0) + u30(0) + u30(0) + b'\x00') * 2
+    # metadata
+    data += u30(0)
+
+    data += u30(1)
+    flags = 0x01 if sealed else 0x00
+    data += u30(1) + u30(2) + bytes([flags])
+    if interfaces:
+        data += u30(1) + u30(3)
+    else:
+        data += u30(0)
+    # instance initializer and traits
+    data += u30(1) + u30(0)
+    # class initializer and traits
+    data += u30(0) + u30(0)
+
+    # script: initializer and its class trait
+    data += u30(1) + u30(2) + u30(1) + u30(1) + b'\x04' + u30(1) + u30(0)
+
+    data += u30(3)
+    for method in range(3):
+        data += u30(method) + u30(1) + u30(1) + u30(0) + u30(1) + \
+            u30(len(code)) + code + u30(0) + u30(0)
+
+    return data
+
+
+def do_abc(data, name='frame1', flags=1):
+    return tag(
+        82,
+        struct.pack('<I', flags) + name.encode() + b'\0' + data,
+        long=True,
+    )
+
+
+def action(code, data=b''):
+    if code < 0x80:
+        return bytes([code])
+    return bytes([code]) + struct.pack('<H', len(data)) + data
+
+
+def constant_pool(*constants):
+    return action(0x88, struct.pack('<H', len(constants)) + b''.join(
+        constant.encode() + b'\0' for constant in constants
+    ))
+
+
+def define_function(name, code):
+    # no params, then the size of the body following the record
+    data = name.encode() + b'\0' + struct.pack('<HH', 0, len(code))
+    return action(0x9b, data) + code
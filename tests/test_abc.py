@@ -0,0 +1,93 @@
+import pytest
+
+from builders import abc, u30
+
+from amv2.enums import ClassFlag, MethodFlag
+from amv2.structs import File as ABCFile, Instance, Method, flag_table
+from stream import BitsExhaustion, SizeExceeded, Stream
+
+__VALUES__ = [0, 1, 0x7f, 0x80, 0x3fff, 0x4000, 0x3fffffff]
+
+
+def test_var_uint30_arrays():
+    stream = Stream(b''.join(map(u30, __VALUES__)) + b'\x07')
+
+    assert stream.read_var_uint30_array(len(__VALUES__)).tolist() == \
+        __VALUES__
+    assert stream.read_uint8() == 7
+
+
+def test_var_uint30_arrays_match_single_reads():
+    data = b''.join(map(u30, __VALUES__))
+    stream = Stream(data)
+
+    assert [stream.read_var_uint30() for _ in __VALUES__] == \
+        Stream(data).read_var_uint30_array(len(__VALUES__)).tolist()
+
+
+def test_var_ints():
+    stream = Stream(b'\xff\xff\xff\xff\x0f' + b'\xff\xff\xff\xff\x0f')
+
+    assert stream.read_var_uint32() == 0xffffffff
+    assert stream.read_var_sint32() == -1
+
+
+def test_invalid_var_ints():
+    with pytest.raises(BitsExhaustion):
+        Stream(b'\x80').read_var_uint30()
+    with pytest.raises(SizeExceeded):
+        Stream(b'\xff' * 6).read_var_uint30_array(1)
+
+
+def test_flag_tables():
+    table = flag_table(ClassFlag)
+
+    assert len(table) == 256
+    assert table[0] == ()
+    assert table[0x09] == (ClassFlag.SEALED, ClassFlag.PROTECTED_NS)
+    assert table[0xf0] == ()
+
+
+def test_methods():
+    stream = Stream(
+        # two params of types 3 and 4 returning 5, named 6
+        u30(2) + u30(5) + u30(3) + u30(4) + u30(6) +
+        bytes([0x88 | 0x01]) +
+        # one optional value, then the param names
+        u30(1) + u30(9) + b'\x03' + u30(7) + u30(8)
+    )
+
+    method = Method.unpack(stream)
+
+    assert method.flags == (MethodFlag.NEED_ARGUMENTS,
+                            MethodFlag.HAS_OPTIONAL,
+                            MethodFlag.HAS_PARAM_NAMES)
+    assert method.param_types.tolist() == [3, 4]
+    assert method.param_names.tolist() == [7, 8]
+    assert method.return_type == 5
+    assert method.name_idx == 6
+    assert len(method.options) == 1
+
+
+def test_instances():
+    stream = Stream(
+        u30(1) + u30(2) + bytes([0x0a]) + u30(3) +
+        u30(2) + u30(4) + u30(5) + u30(6) + u30(0)
+    )
+
+    instance = Instance.unpack(stream)
+
+    assert instance.flags == (ClassFlag.FINAL, ClassFlag.PROTECTED_NS)
+    assert instance.protected_ns == 3
+    assert instance.interfaces.tolist() == [4, 5]
+    assert instance.init_method_idx == 6
+
+
+def test_abc_files():
+    file = ABCFile.unpack(Stream(abc()))
+
+    assert len(file.methods) == 3
+    assert file.methods[0].param_types.tolist() == [0]
+    assert file.instances[0].flags == (ClassFlag.SEALED,)
+    assert file.instances[0].interfaces.tolist() == [3]
+    assert [body.method_idx for body in file.method_bodies] == [0, 1, 2]
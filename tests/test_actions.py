@@ -0,0 +1,138 @@
+import gc
+import struct
+
+from builders import action, constant_pool, define_function, swf, tag
+
+from stream import Stream
+from swf import cfg
+from swf.actions import ActionBlock, DefineFunction, Play, Push, Stop
+from swf.enums import ValueType
+from swf.file import File
+from swf.tags import DoAction, DoInitAction
+
+# Stop, Play, End
+__ACTIONS__ = b'\x07\x06\x00'
+
+
+def test_blocks_with_the_same_bytes_are_equal():
+    assert ActionBlock(memoryview(__ACTIONS__), 10) == \
+        ActionBlock(__ACTIONS__, 200)
+    assert ActionBlock(__ACTIONS__, 10) != ActionBlock(b'\x06\x00', 10)
+    assert ActionBlock(__ACTIONS__, 10) != __ACTIONS__
+
+
+def test_do_action_blocks_of_two_files_are_equal():
+    old = File.unpack(Stream(swf([tag(12, __ACTIONS__)])))
+    new = File.unpack(Stream(swf([tag(1), tag(12, __ACTIONS__)])))
+
+    assert old.tags[0].actions == new.tags[1].actions
+    assert old.tags[0].actions.offset != new.tags[1].actions.offset
+
+
+def test_lazy_actions_match_the_decoded_ones():
+    actions = ActionBlock(__ACTIONS__, 0)
+
+    # End decodes as None
+    assert [type(action) for action in actions][:2] == [Stop, Play]
+    assert ActionBlock(__ACTIONS__, 0)[1] == actions[1]
+
+
+def test_do_action_tags():
+    movie = File.unpack(Stream(swf([
+        tag(12, __ACTIONS__),
+        tag(59, b'\x05\x00' + __ACTIONS__),
+    ])))
+    do_action, do_init_action = movie.tags[:2]
+
+    assert isinstance(do_action, DoAction)
+    assert isinstance(do_init_action, DoInitAction)
+    assert do_init_action.sprite_id == 5
+    assert do_action.actions.offset == do_action.header.offset
+    assert do_init_action.actions.offset == do_init_action.header.offset + 2
+    assert bytes(do_init_action.actions.data) == __ACTIONS__
+
+
+def test_index_skips_nested_blocks():
+    data = b'\x07' + define_function('f', b'\x06\x06') + \
+        action(0x96, b'\x07' + bytes(4)) + b'\x00'
+    actions = ActionBlock(data, 100)
+
+    assert list(actions.index.codes) == [0x07, 0x9b, 0x96, 0x00]
+    assert list(actions.index.offsets) == [100, 101, 112, 120]
+    assert actions.find(112) == 2
+    assert actions.find(113) is None
+    assert not actions.is_decoded
+    assert len(actions) == 4
+
+
+def test_single_actions_are_decoded_once():
+    data = constant_pool('foo') + b'\x07' + action(0x96, b'\x08\x00')
+    actions = ActionBlock(data, 0)
+
+    push = actions[-1]
+
+    assert isinstance(push, Push)
+    assert push.values == [(ValueType.CONSTANT_8, 'foo')]
+    assert actions.unpack_action(2) is push
+    assert not actions.is_decoded
+    assert actions[2] == actions.actions[2]
+
+
+def test_single_actions_in_function_bodies():
+    actions = ActionBlock(define_function('f', b'\x06') + b'\x07', 0)
+
+    assert isinstance(actions[0], DefineFunction)
+    assert isinstance(actions[0].body[0], Play)
+    assert isinstance(actions[1], Stop)
+
+
+def test_equal_blocks_have_their_own_graphs():
+    block = ActionBlock(__ACTIONS__, 10)
+    other = ActionBlock(__ACTIONS__, 200)
+
+    graph = cfg.build(block)
+
+    assert cfg.build(block) is graph
+    assert cfg.build(other).offset == 200
+    assert graph.offset == 10
+
+
+def test_graph_of_branches():
+    data = action(0x96, b'\x05\x01') + \
+        action(0x9d, struct.pack('<h', 6)) + \
+        b'\x06' + action(0x99, struct.pack('<h', 1)) + \
+        b'\x07\x00'
+    graph = cfg.build(ActionBlock(data, 0))
+
+    assert [(block.start, block.end) for block in graph.blocks] == \
+        [(0, 2), (2, 4), (4, 5), (5, 6)]
+    assert [block.offset for block in graph.blocks] == [0, 10, 16, 17]
+    assert [block.successors for block in graph.blocks] == \
+        [[2, 1], [3], [3], []]
+    assert [block.predecessors for block in graph.blocks] == \
+        [[], [0], [0], [1, 2]]
+    assert graph.find(16) is graph.blocks[2]
+    assert graph.find(11) is None
+
+
+def test_graphs_of_function_bodies():
+    block = ActionBlock(b'\x07' + define_function('f', b'\x06\x00'), 0)
+    graph = cfg.build(block)
+
+    [nested] = graph.nested[1]
+
+    assert nested.offset == block[1].body.offset
+    assert isinstance(nested.blocks[0].actions[0], Play)
+    assert list(graph.walk()) == [graph, nested]
+
+
+def test_graphs_are_dropped_with_their_block():
+    block = ActionBlock(__ACTIONS__, 10)
+    graph = cfg.build(block)
+    count = len(cfg.__GRAPHS__)
+
+    del block
+    gc.collect()
+
+    assert len(cfg.__GRAPHS__) == count - 1
+    assert graph.actions is None
@@ -0,0 +1,77 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from builders import define_sprite, show_frame, swf, tag
+
+from stream import Stream
+from swf.aio import aiter_tags, parse
+from swf.file import File
+
+__TAGS__ = [
+    tag(9, b'\x00\x00\xff'),
+    tag(12, b'\x07\x06\x00'),
+    define_sprite(1, [tag(43, b'inner\x00'), show_frame()]),
+    tag(43, b'label\x00'),
+    show_frame(),
+] * 3
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(1)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def write(tmp_path, signature='CWS'):
+    path = tmp_path / 'movie.swf'
+    path.write_bytes(swf(__TAGS__, signature=signature))
+    return str(path)
+
+
+def unpack(path):
+    with open(path, 'rb') as file:
+        return File.unpack(Stream(file.read()))
+
+
+async def collect(path, **kwargs):
+    return [tag async for tag in aiter_tags(path, **kwargs)]
+
+
+def test_parse_matches_unpack(tmp_path):
+    path = write(tmp_path)
+
+    with ThreadPoolExecutor(2) as executor:
+        movie = asyncio.run(parse(path, executor, chunk_size=16))
+
+    expected = unpack(path)
+    assert movie.tags == expected.tags
+    assert movie.header == expected.header
+
+
+def test_tags_through_a_process_pool(tmp_path):
+    path = write(tmp_path, 'FWS')
+
+    with ProcessPoolExecutor(2) as executor:
+        tags = asyncio.run(collect(path, executor=executor, chunk_size=16))
+
+    assert tags == unpack(path).tags
+
+
+def test_jobs_are_prefetched_up_to_the_consumer(tmp_path):
+    path = write(tmp_path)
+
+    async def first(executor):
+        async for tag in aiter_tags(path, executor, chunk_size=1,
+                                    prefetch=3):
+            return tag
+
+    with CountingExecutor() as executor:
+        tag = asyncio.run(first(executor))
+
+        # the first jobs, then one more once the first one is consumed
+        assert executor.submitted == 4
+    assert tag == unpack(path).tags[0]
@@ -0,0 +1,94 @@
+from builders import abc
+
+from amv2.analysis import Analyzer, analyze
+from amv2.structs import AESException, File as ABCFile, MethodBody
+from stream import Stream
+
+
+def method_body(code, max_stack=1, max_scope_depth=1, exceptions=()):
+    return MethodBody(
+        method_idx=0,
+        max_stack=max_stack,
+        local_count=1,
+        init_scope_depth=0,
+        max_scope_depth=max_scope_depth,
+        code=code,
+        exceptions=list(exceptions),
+        traits=[],
+    )
+
+
+# getlocal_0, pushscope, pushtrue, iffalse +6,
+# pushbyte 1, jump +2,
+# pushbyte 2,
+# returnvalue
+__IF_ELSE__ = bytes.fromhex('d0 30 26 12060000 2401 10020000 2402 48')
+
+
+def test_blocks_and_heights():
+    analysis = analyze(method_body(__IF_ELSE__))
+
+    assert analysis.is_valid, analysis.errors
+    assert [(block.start, block.end) for block in analysis.blocks] == \
+        [(0, 7), (7, 13), (13, 15), (15, 16)]
+    assert [block.successors for block in analysis.blocks] == \
+        [[2, 1], [3], [3], []]
+    assert [(block.stack_height, block.scope_height)
+            for block in analysis.blocks] == [(0, 0), (0, 1), (0, 1), (1, 1)]
+    assert analysis.max_stack == 1
+    assert analysis.max_scope_depth == 1
+
+
+def test_declared_limits_are_checked():
+    analysis = analyze(method_body(__IF_ELSE__, max_stack=0,
+                                   max_scope_depth=0))
+
+    assert analysis.errors == [
+        'stack height 1 exceeds max_stack 0',
+        'scope depth 1 exceeds max_scope_depth 0',
+    ]
+
+
+def test_stack_underflow():
+    # pop, returnvoid
+    analysis = analyze(method_body(bytes.fromhex('29 47')))
+
+    assert analysis.errors == ['stack underflow at 0 (pop)']
+
+
+def test_inconsistent_merges():
+    # pushtrue, iftrue +2, pushbyte 1, returnvoid
+    analysis = analyze(method_body(bytes.fromhex('26 11020000 2401 47')))
+
+    assert analysis.errors == ['inconsistent heights at 7: (0, 0) and (1, 0)']
+
+
+def test_exception_handlers():
+    # pushtrue, pop, returnvoid, then the handler popping the exception
+    analysis = analyze(method_body(
+        bytes.fromhex('26 29 47 29 47'),
+        exceptions=[AESException(0, 2, 3, 0, 0)],
+    ))
+
+    assert analysis.is_valid, analysis.errors
+    assert [block.start for block in analysis.blocks] == [0, 2, 3]
+    assert analysis.blocks[0].handlers == [2]
+    assert analysis.blocks[1].handlers == []
+    assert analysis.blocks[2].stack_height == 1
+
+
+def test_invalid_code():
+    analysis = analyze(method_body(bytes.fromhex('24')))
+
+    assert analysis.errors == ['invalid code: pushbyte at 0']
+    assert analysis.blocks == []
+
+
+def test_analyzer_caches_methods():
+    analyzer = Analyzer(ABCFile.unpack(Stream(abc())))
+
+    analyses = analyzer.analyze_all()
+
+    assert [analysis.method_idx for analysis in analyses] == [0, 1, 2]
+    assert all(analysis.is_valid for analysis in analyses)
+    assert analyzer.analyze(1) is analyses[1]
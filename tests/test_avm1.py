@@ -0,0 +1,98 @@
+import struct
+
+from builders import action, constant_pool, define_function
+
+from stream import Stream
+from swf.actions import Constant, ConstantPool, Decoder, DefineFunction, \
+                        Play, Push, Stop, unpack
+from swf.enums import ValueType
+
+
+def push(*values):
+    return action(0x96, b''.join(values))
+
+
+def decode(data):
+    return Decoder().unpack_actions(Stream(data), len(data))
+
+
+def test_push_values():
+    double = struct.pack('<d', 1.5)
+    [action] = decode(push(
+        b'\x00text\x00',
+        b'\x01' + struct.pack('<f', 0.5),
+        b'\x02', b'\x03',
+        b'\x04\x02',
+        b'\x05\x01',
+        # the two halves of doubles are swapped
+        b'\x06' + double[4:] + double[:4],
+        b'\x07' + struct.pack('<I', 70000),
+    ))
+
+    assert isinstance(action, Push)
+    assert action.values == [
+        (ValueType.STRING, 'text'),
+        (ValueType.FLOAT, 0.5),
+        (ValueType.NULL, None),
+        (ValueType.UNDEFINED, None),
+        (ValueType.REGISTER, 2),
+        (ValueType.BOOL, True),
+        (ValueType.DOUBLE, 1.5),
+        (ValueType.INTEGER, 70000),
+    ]
+
+
+def test_unknown_value_types_end_the_push():
+    actions = decode(push(b'\x07' + bytes(4), b'\x0b\x01\x02') + b'\x07')
+
+    assert actions[0].values == [(ValueType.INTEGER, 0)]
+    assert isinstance(actions[1], Stop)
+
+
+def test_pushed_constants_are_resolved():
+    actions = decode(
+        constant_pool('foo', 'bar') +
+        push(b'\x08\x01', b'\x09\x00\x00', b'\x08\x05')
+    )
+
+    assert isinstance(actions[0], ConstantPool)
+    values = actions[1].values
+    assert values == [
+        (ValueType.CONSTANT_8, 'bar'),
+        (ValueType.CONSTANT_16, 'foo'),
+        # out of the pool, kept as the index
+        (ValueType.CONSTANT_8, 5),
+    ]
+    assert isinstance(values[0][1], Constant)
+    assert values[0][1].index == 1
+
+
+def test_later_pools_replace_earlier_ones():
+    actions = decode(
+        constant_pool('foo') + push(b'\x08\x00') +
+        constant_pool('bar') + push(b'\x08\x00')
+    )
+
+    assert actions[1].values == [(ValueType.CONSTANT_8, 'foo')]
+    assert actions[3].values == [(ValueType.CONSTANT_8, 'bar')]
+
+
+def test_function_bodies_use_the_active_pool():
+    actions = decode(
+        constant_pool('foo') +
+        define_function('f', push(b'\x08\x00') + b'\x06') +
+        b'\x07'
+    )
+
+    function = actions[1]
+    assert isinstance(function, DefineFunction)
+    assert function.name == 'f'
+    assert function.body.actions[0].values == [(ValueType.CONSTANT_8, 'foo')]
+    assert isinstance(function.body.actions[1], Play)
+
+
+def test_unhandled_actions_are_skipped():
+    stream = Stream(action(0xff, b'abc') + b'\x07')
+
+    assert unpack(stream) is None
+    assert isinstance(unpack(stream), Stop)
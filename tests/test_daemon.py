@@ -0,0 +1,159 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from builders import abc, do_abc, show_frame, sound_stream_block, \
+                     sound_stream_head, swf, tag
+
+from stream import Stream
+from swf import daemon as daemon_module
+from swf.daemon import Cache, Client, Daemon, DaemonError
+from swf.file import File
+from swf.memory import memory_report
+
+__TAGS__ = [tag(9, b'\x00\x00\xff'), do_abc(abc()), show_frame()]
+
+
+def call(daemon, method, **params):
+    async def handle():
+        daemon._pool = ThreadPoolExecutor(1)
+        try:
+            line = json.dumps(
+                {'jsonrpc': '2.0', 'id': 1, 'method': method,
+                 'params': params}
+            )
+            return await daemon.handle(line.encode())
+        finally:
+            daemon._pool.shutdown()
+
+    return asyncio.run(handle())
+
+
+@pytest.fixture
+def movie(tmp_path):
+    path = tmp_path / 'movie.swf'
+    path.write_bytes(swf(__TAGS__))
+    return str(path)
+
+
+def test_file_methods(tmp_path, movie):
+    daemon = Daemon(str(tmp_path / 'sock'))
+
+    assert call(daemon, 'header', path=movie)['result']['frame_count'] == 1
+    assert [tag['name'] for tag in call(daemon, 'tags', path=movie)['result']] \
+        == ['SetBackgroundColor', 'DoABC', 'ShowFrame']
+    assert ('com.example.Foo', 'class', '') in \
+        call(daemon, 'symbols', path=movie)['result']
+
+    cache = call(daemon, 'metrics')['result']['cache']
+    assert (cache['entries'], cache['hits'], cache['misses']) == (1, 2, 1)
+
+
+def test_errors(tmp_path, movie):
+    daemon = Daemon(str(tmp_path / 'sock'))
+
+    def error(line):
+        return asyncio.run(daemon.handle(line))['error']['code']
+
+    assert error(b'{') == -32700
+    assert error(b'[]') == -32600
+    assert call(daemon, 'nope')['error']['code'] == -32601
+    assert call(daemon, 'tags')['error']['code'] == -32602
+    assert call(daemon, 'tags', path=movie + '.missing')['error']['code'] \
+        == -32000
+
+
+def test_cached_size_is_the_unpickled_one(tmp_path):
+    blocks = [sound_stream_head(1)]
+    for _ in range(20):
+        blocks += [sound_stream_block(bytes(20000), mp3=False), show_frame()]
+    path = tmp_path / 'sound.swf'
+    path.write_bytes(swf(blocks, frame_count=20))
+    daemon = Daemon(str(tmp_path / 'sock'))
+
+    call(daemon, 'header', path=str(path))
+
+    # every payload is a copy next to the body once unpickled, about
+    # twice the size of the file parsed in the worker
+    swf_file = File.unpack(Stream(path.read_bytes()))
+    assert daemon.cache.used > 1.9 * memory_report(swf_file).total
+
+
+def test_evicted_file_changed_under_the_same_stat(tmp_path, movie):
+    daemon = Daemon(str(tmp_path / 'sock'))
+    assert call(daemon, 'tags', path=movie)['result'][0]['code'] == 9
+    daemon.cache = Cache()
+
+    stat = os.stat(movie)
+    with open(movie, 'r+b') as file:
+        # SetBackgroundColor becomes an unknown tag of the same length
+        data = bytearray(file.read())
+        position = data.index(tag(9, b'\x00\x00\xff'))
+        data[position:position + 2] = tag(200, b'\x00\x00\xff')[:2]
+        file.seek(0)
+        file.write(data)
+    os.utime(movie, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    # unknown tags aren't listed
+    assert call(daemon, 'tags', path=movie)['result'][0]['code'] == 82
+    # cached under the hash of what was parsed
+    hash = hashlib.sha256(data).hexdigest()
+    assert list(daemon._hashes.values()) == [hash]
+    assert daemon.cache.get(hash) is not None
+
+
+def test_hashes_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(daemon_module, '__HASHES_SIZE__', 2)
+    daemon = Daemon(str(tmp_path / 'sock'))
+    paths = []
+    for idx in range(3):
+        path = tmp_path / f'{idx}.swf'
+        path.write_bytes(swf(__TAGS__ + [tag(43, f'{idx}'.encode())]))
+        paths.append(str(path))
+        call(daemon, 'header', path=str(path))
+
+    assert [key[0] for key in daemon._hashes] == paths[1:]
+
+
+def test_cache_evicts_least_recently_used():
+    cache = Cache(10)
+    cache.put('a', 1, 4)
+    cache.put('b', 2, 4)
+    assert cache.get('a') == 1
+    cache.put('c', 3, 4)
+    cache.put('d', 4, 11)
+
+    assert (cache.get('b'), cache.get('a'), cache.get('c')) == (None, 1, 3)
+    assert cache.get('d') is None
+    assert (cache.used, cache.evictions) == (8, 1)
+
+
+def test_client_over_the_socket(tmp_path, movie):
+    socket = str(tmp_path / 'sock')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'swf.daemon', socket, '--workers', '1'],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while not os.path.exists(socket):
+            assert time.monotonic() < deadline and process.poll() is None
+            time.sleep(0.05)
+
+        with Client(socket) as client:
+            assert client.call('ping') == 'pong'
+            assert client.call('header', path=movie)['version'] == 10
+            with pytest.raises(DaemonError):
+                client.call('nope')
+    finally:
+        process.terminate()
+        process.wait(10)
+
+    assert not os.path.exists(socket)
@@ -0,0 +1,104 @@
+from builders import abc, define_sprite, do_abc, show_frame, swf, tag
+
+from swf.diff import ADDED, CHANGED, REMOVED, Change, diff
+
+
+def abc_diff(old, new, **kwargs):
+    return diff(
+        swf([do_abc(abc(**old), **kwargs.get('old_tag', {}))]),
+        swf([do_abc(abc(**new), **kwargs.get('new_tag', {}))]),
+    )
+
+
+def test_same_files_have_no_changes():
+    data = swf([do_abc(abc()), show_frame()])
+
+    assert diff(data, data).is_empty
+
+
+def test_method_bodies():
+    changes = abc_diff({}, {'code': b'\xd0\x30\x02\x47'}).changes
+
+    assert changes == [Change(CHANGED, (82, 0), [
+        '~com.example.Foo$/cinit', '~com.example.Foo/iinit', '~script0/init',
+    ])]
+
+
+def test_renamed_classes():
+    changes = abc_diff({}, {'name': 'Bar'}).changes
+
+    assert changes == [Change(CHANGED, (82, 0), [
+        '+com.example.Bar', '-com.example.Foo',
+        '+com.example.Bar$/cinit', '+com.example.Bar/iinit',
+        '-com.example.Foo$/cinit', '-com.example.Foo/iinit',
+    ])]
+
+
+def test_sealed_flag():
+    changes = abc_diff({}, {'sealed': False}).changes
+
+    assert changes == [Change(CHANGED, (82, 0), ['~com.example.Foo'])]
+
+
+def test_removed_interface():
+    changes = abc_diff({}, {'interfaces': False}).changes
+
+    assert changes == [Change(CHANGED, (82, 0), ['~com.example.Foo'])]
+
+
+def test_super_class():
+    changes = abc_diff({}, {'super_name': 'MovieClip'}).changes
+
+    assert changes == [Change(CHANGED, (82, 0), ['~com.example.Foo'])]
+
+
+def test_method_signatures():
+    assert abc_diff({}, {'param_type': 2}).changes == [
+        Change(CHANGED, (82, 0), ['~com.example.Foo$/cinit']),
+    ]
+    assert abc_diff({}, {'return_type': 1}).changes == [
+        Change(CHANGED, (82, 0), ['~com.example.Foo$/cinit']),
+    ]
+
+
+def test_do_abc_name_and_flags():
+    changes = abc_diff({}, {}, new_tag={'name': 'frame2'}).changes
+    assert changes == [Change(CHANGED, (82, 0), ['name'])]
+
+    changes = abc_diff({}, {}, new_tag={'flags': 0}).changes
+    assert changes == [Change(CHANGED, (82, 0), ['flags'])]
+
+
+def test_changed_bodies_are_reported_without_details():
+    # unknown tags decode as None, their bodies still differ
+    changes = diff(swf([tag(200, b'\x01')]), swf([tag(200, b'\x02')])).changes
+
+    assert changes == [Change(CHANGED, (200, 0), [])]
+
+
+def test_added_and_removed_tags():
+    old = swf([tag(9, b'\x00\x00\x00'), show_frame()])
+    new = swf([show_frame(), tag(43, b'end\x00')])
+
+    assert diff(old, new).changes == [
+        Change(REMOVED, (9, 0)), Change(ADDED, (43, 0)),
+    ]
+
+
+def test_characters_are_matched_by_id():
+    old = swf([tag(6, b'\x01\x00old'), tag(6, b'\x02\x00two')])
+    new = swf([tag(6, b'\x02\x00two'), tag(6, b'\x01\x00new')])
+
+    changes = diff(old, new).changes
+
+    assert [change.key for change in changes] == [(6, 1)]
+    assert changes[0].kind == CHANGED
+
+
+def test_sprites_are_compared_whole():
+    old = swf([define_sprite(1, [tag(12, b'\x07\x00'), show_frame()])])
+    new = swf([define_sprite(1, [tag(12, b'\x06\x00'), show_frame()])])
+
+    changes = diff(old, new).changes
+
+    assert changes == [Change(CHANGED, (39, 1), ['control_tags'])]
@@ -0,0 +1,42 @@
+from builders import abc, sound_stream_head, swf
+
+from amv2.enums import NamespaceKind
+from amv2.structs import File as ABCFile, Namespace
+from stream import Stream
+from swf.enums import SoundFormat, SoundRate, SoundType
+from swf.fields import EnumField
+from swf.file import File
+from swf.tags import SoundStreamHead
+
+
+def test_enum_fields_keep_the_raw_values():
+    head = File.unpack(Stream(swf([sound_stream_head(2)]))).tags[0]
+
+    assert isinstance(head, SoundStreamHead)
+    assert head.stream_sound_compression == 2
+    assert head.stream_sound_compression_enum is SoundFormat.MP3
+    assert head.stream_sound_rate == 3
+    assert head.stream_sound_rate_enum is SoundRate.KHZ_44
+    assert head.stream_sound_type_enum is SoundType.STEREO
+
+
+def test_unknown_values_decode_without_a_member():
+    head = File.unpack(Stream(swf([sound_stream_head(13)]))).tags[0]
+
+    assert head.stream_sound_compression == 13
+    assert head.stream_sound_compression_enum is None
+
+
+def test_abc_enum_fields():
+    namespaces = ABCFile.unpack(Stream(abc())).constants_pool.namespaces
+
+    assert [namespace.kind for namespace in namespaces] == [0x16] * 3
+    assert namespaces[0].kind_enum is NamespaceKind.PACKAGE_NS
+    assert Namespace(kind=0x42, name_idx=0).kind_enum is None
+
+
+def test_enum_fields_on_the_class():
+    assert isinstance(SoundStreamHead.stream_sound_compression_enum,
+                      EnumField)
+    assert 'stream_sound_compression_enum' not in \
+        SoundStreamHead.__dataclass_fields__
@@ -0,0 +1,29 @@
+import pytest
+
+from builders import body, show_frame, signatures, swf, tag
+
+from stream import Stream
+from swf.exceptions import UnmatchedFileLength
+from swf.file import unpack_body
+
+__TAGS__ = [tag(9, b'\x00\x00\xff'), show_frame()]
+
+
+@pytest.mark.parametrize('signature', signatures())
+def test_unpack_body(signature):
+    header, stream = unpack_body(Stream(swf(__TAGS__, signature=signature)))
+
+    assert header.signature == signature
+    assert header.frame_count == 1
+    assert bytes(stream.buffer) == body(__TAGS__)
+    # positioned on the first tag
+    assert bytes(stream.buffer)[stream.byte_position:] == \
+        b''.join(__TAGS__) + tag(0)
+
+
+def test_unmatched_file_length():
+    data = bytearray(swf(__TAGS__))
+    data[4] += 1
+
+    with pytest.raises(UnmatchedFileLength):
+        unpack_body(Stream(bytes(data)))
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from builders import define_sprite, show_frame, swf, tag
+
+from stream import Stream
+from swf.file import File, build_index, open_indexed, sidecar_path, \
+                     unpack_body
+from swf.index import InvalidSidecar, Sidecar, TagIndex
+
+__TAGS__ = [
+    tag(9, b'\x00\x00\xff'),
+    tag(6, b'\x05\x00' + bytes(range(200)), long=True),
+    show_frame(),
+    define_sprite(7, [
+        tag(12, b'\x07\x00'), show_frame(), tag(12, b'\x06\x00'),
+        show_frame(),
+    ], frame_count=2),
+    tag(43, b'two\x00'),
+    show_frame(),
+]
+
+
+def write(tmp_path, signature='FWS', name='movie.swf'):
+    path = tmp_path / name
+    path.write_bytes(swf(__TAGS__, signature=signature, frame_count=2))
+    return str(path)
+
+
+def test_tag_index():
+    _, stream = unpack_body(Stream(swf(__TAGS__)))
+    tags = TagIndex.build(stream)
+
+    assert list(tags.codes) == [9, 6, 1, 39, 12, 1, 12, 1, 43, 1]
+    assert list(tags.parents) == [-1, -1, -1, -1, 3, 3, 3, 3, -1, -1]
+    assert list(tags.frames) == [0, 0, 0, 1, 0, 0, 1, 1, 1, 1]
+    assert tags.find(5) == 1
+    assert tags.find(7) == 3
+    assert tags.find(9) is None
+    assert tags.frame_tags(1) == [3, 8, 9]
+    assert tags.frame_tags(1, parent=3) == [6, 7]
+    assert tags.frame_tags(2) == []
+
+
+def test_sidecar_round_trip(tmp_path):
+    path = write(tmp_path, 'CWS')
+    index = build_index(path, chunk_size=64)
+
+    with open(sidecar_path(path), 'rb') as file:
+        data = file.read()
+    sidecar = Sidecar.unpack(data)
+
+    assert sidecar.tags == index.tags
+    assert sidecar.chunks == index.chunks
+    assert (sidecar.signature, sidecar.version, sidecar.chunk_size) == \
+        ('CWS', 10, 64)
+    assert Sidecar.unpack(data[:Sidecar.header_size()],
+                          header_only=True).file_length == index.file_length
+
+
+def test_invalid_sidecars(tmp_path):
+    with pytest.raises(InvalidSidecar):
+        Sidecar.unpack(b'SWFX')
+    with pytest.raises(InvalidSidecar):
+        Sidecar.unpack(b'\x00' * Sidecar.header_size())
+
+
+@pytest.mark.parametrize('signature', ['FWS', 'CWS'])
+def test_indexed_tags_match_parsed_ones(tmp_path, signature):
+    path = write(tmp_path, signature)
+    with open(path, 'rb') as file:
+        tags = File.unpack(Stream(file.read())).tags
+
+    with open_indexed(path, chunk_size=64) as indexed:
+        main = [idx for idx in range(len(indexed))
+                if indexed.tags.parents[idx] == -1]
+
+        assert [indexed.tag(idx) for idx in main] == tags
+        assert indexed.find(5) == tags[1]
+        assert indexed.find(7) == tags[3]
+        assert indexed.frame_tags(0) == [0, 1, 2]
+
+
+def test_stale_sidecars_are_rebuilt(tmp_path):
+    path = write(tmp_path)
+    open_indexed(path).close()
+    sidecar = sidecar_path(path)
+    built = os.stat(sidecar).st_mtime_ns
+
+    open_indexed(path).close()
+    assert os.stat(sidecar).st_mtime_ns == built
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    with open_indexed(path) as indexed:
+        assert indexed.sidecar.source_mtime == stat.st_mtime_ns + 10 ** 9
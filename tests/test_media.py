@@ -0,0 +1,87 @@
+from builders import define_sprite, mp3_frame, show_frame, \
+                     sound_stream_block, sound_stream_head, swf
+
+from stream import Stream
+from swf.file import File
+
+
+def mp3_frames(data):
+    """Lengths of the MP3 frames making the whole of `data`."""
+    lengths = []
+    position = 0
+    while position < len(data):
+        header = int.from_bytes(data[position:position + 4], 'big')
+        assert header >> 21 == 0x7ff, f"no frame sync at {position}"
+        # MPEG 1 layer III, 128 kbit/s at 44100 Hz
+        assert header >> 12 & 0xf == 9 and header >> 10 & 0x3 == 0
+        length = 144 * 128000 // 44100 + (header >> 9 & 1)
+        lengths.append(length)
+        position += length
+
+    assert position == len(data)
+    return lengths
+
+
+def test_mp3_sound_stream_is_a_sequence_of_frames():
+    frames = [mp3_frame(fill) for fill in range(5)]
+    data = swf([
+        sound_stream_head(2),
+        sound_stream_block(frames[0] + frames[1]),
+        show_frame(),
+        sound_stream_block(frames[2]),
+        show_frame(),
+        sound_stream_block(frames[3] + frames[4]),
+        show_frame(),
+    ], frame_count=3)
+
+    stream = File.unpack(Stream(data)).sound_stream()
+
+    assert stream == b''.join(frames)
+    assert len(mp3_frames(stream)) == 5
+
+
+def test_sprite_mp3_sound_stream():
+    frames = [mp3_frame(fill) for fill in range(2)]
+    data = swf([
+        define_sprite(1, [
+            sound_stream_head(2, code=18),
+            sound_stream_block(frames[0]),
+            show_frame(),
+            sound_stream_block(frames[1]),
+            show_frame(),
+        ], frame_count=2),
+        show_frame(),
+    ])
+
+    swf_file = File.unpack(Stream(data))
+
+    assert swf_file.sound_stream(1) == b''.join(frames)
+    assert swf_file.sound_stream() == b''
+
+
+def test_adpcm_sound_stream_keeps_whole_blocks():
+    blocks = [bytes([fill]) * 100 for fill in range(3)]
+    data = swf([
+        sound_stream_head(1),
+        *(
+            block
+            for data in blocks
+            for block in (sound_stream_block(data, mp3=False), show_frame())
+        ),
+    ], frame_count=3)
+
+    assert File.unpack(Stream(data)).sound_stream() == b''.join(blocks)
+
+
+def test_sound_blocks_of_one_frame_are_all_kept():
+    frames = [mp3_frame(fill) for fill in range(3)]
+    data = swf([
+        sound_stream_head(2),
+        *(sound_stream_block(frame) for frame in frames),
+        show_frame(),
+    ])
+
+    swf_file = File.unpack(Stream(data))
+
+    assert len(swf_file.media.sound_blocks[0][0]) == 3
+    assert swf_file.sound_stream() == b''.join(frames)
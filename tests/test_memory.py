@@ -0,0 +1,57 @@
+import dataclasses
+import inspect
+
+import pytest
+
+from builders import define_sprite, show_frame, swf, tag
+
+import amv2.structs
+from stream import Stream
+from swf import actions, filters, records, tags
+from swf.file import File
+from swf.memory import memory_report
+
+
+@pytest.mark.parametrize('module', [tags, records, actions, filters,
+                                    amv2.structs])
+def test_records_have_no_instance_dict(module):
+    classes = [
+        cls for cls in vars(module).values()
+        if inspect.isclass(cls) and cls.__module__ == module.__name__ and
+        dataclasses.is_dataclass(cls)
+    ]
+
+    assert classes
+    assert [cls.__name__ for cls in classes if cls.__dictoffset__] == []
+
+
+def test_memory_report():
+    movie = File.unpack(Stream(swf([
+        tag(43, b'label\x00'),
+        define_sprite(1, [tag(43, b'inner\x00'), show_frame()]),
+        tag(43, b'other\x00'),
+        show_frame(),
+    ])))
+
+    report = memory_report(movie)
+
+    assert report.tags['FrameLabel'].count == 2
+    assert report.tags['DefineSprite'].count == 1
+    assert report.tags['FrameLabel'].bytes > 0
+    # the sprite control tags are counted as records of the sprite
+    assert report.records['FrameLabel'].count == 3
+    assert report.body == movie.body.nbytes
+    assert report.total == report.body + sum(
+        usage.bytes for usage in report.tags.values()
+    )
+    assert 'FrameLabel' in report.table()
+
+
+def test_shared_objects_are_counted_once():
+    movie = File.unpack(Stream(swf([tag(43, b'label\x00'), show_frame()])))
+    movie.tags.append(movie.tags[0])
+
+    report = memory_report(movie)
+
+    assert report.tags['FrameLabel'].count == 2
+    assert report.records['FrameLabel'].count == 1
@@ -0,0 +1,66 @@
+import pickle
+
+from builders import define_sprite, show_frame, swf, tag
+
+from stream import Stream
+from swf.file import File, unpack_body
+from swf.parallel import decode_range, dumps, tag_positions, tag_ranges
+
+__TAGS__ = [
+    tag(9, b'\x00\x00\xff'),
+    tag(12, b'\x07\x06\x00'),
+    define_sprite(1, [tag(43, b'inner\x00'), show_frame()]),
+    tag(87, b'\x05\x00' + bytes(4) + bytes(range(200)), long=True),
+    tag(43, b'label\x00'),
+    show_frame(),
+] * 4
+
+
+def test_tag_positions():
+    _, stream = unpack_body(Stream(swf(__TAGS__)))
+    start = stream.byte_position
+
+    positions = tag_positions(stream)
+
+    assert len(positions) == len(__TAGS__) + 1
+    assert positions[0] == start
+    assert positions[1] == start + len(__TAGS__[0])
+    # left after the End tag
+    assert stream.byte_position == positions[-1] + 2
+
+
+def test_tag_ranges():
+    positions = [0, 10, 20, 100, 110, 120]
+
+    assert tag_ranges(positions, 15) == [(0, 20), (20, 100), (100, 120)]
+    assert tag_ranges(positions, 1000) == [(0, 120)]
+    assert tag_ranges(positions, 1) == list(zip(positions, positions[1:]))
+    assert tag_ranges([0], 1) == []
+
+
+def test_ranges_decode_like_the_whole_body():
+    data = swf(__TAGS__)
+    tags = File.unpack(Stream(data)).tags
+    _, stream = unpack_body(Stream(data))
+    positions = tag_positions(stream)
+    body = memoryview(stream.buffer)
+
+    decoded = [
+        tag for start, end in tag_ranges(positions, 100)
+        for tag in pickle.loads(dumps(decode_range(
+            10, 'utf-8', body[start:end], start
+        )))
+    ]
+
+    assert decoded == tags
+    assert [tag.header for tag in decoded] == [tag.header for tag in tags]
+
+
+def test_parallel_unpack_matches_the_sequential_one():
+    data = swf(__TAGS__, signature='CWS')
+
+    sequential = File.unpack(Stream(data))
+    parallel = File.unpack(Stream(data), workers=2)
+
+    assert parallel.tags == sequential.tags
+    assert File.unpack(Stream(swf([])), workers=2).tags == []
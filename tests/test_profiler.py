@@ -0,0 +1,65 @@
+import json
+
+from builders import define_sprite, show_frame, swf, tag
+
+from stream import Stream
+from swf import actions
+from swf.file import File
+from swf.profiler import ACTION, TAG, Profiler
+from swf.tags import SetBackgroundColor
+
+__MOVIE__ = swf([
+    tag(9, b'\x00\x00\xff'),
+    # Stop, Play, End
+    tag(12, b'\x07\x06\x00'),
+    define_sprite(1, [tag(9, b'\x00\x00\x00'), show_frame()]),
+    show_frame(),
+])
+
+
+def parse():
+    movie = File.unpack(Stream(__MOVIE__))
+    list(movie.tags[1].actions)
+    return movie
+
+
+def test_unpacks_are_counted():
+    with Profiler() as profiler:
+        parse()
+
+    entries = {(entry.kind, entry.name): entry
+               for entry in profiler.entries.values()}
+    # sprites are counted with their control tags
+    assert entries[(TAG, 'SetBackgroundColor')].count == 2
+    assert entries[(TAG, 'SetBackgroundColor')].bytes == 6
+    assert entries[(ACTION, 'Stop')].count == 1
+    assert entries[(ACTION, 'Play')].count == 1
+    sprite = entries[(TAG, 'DefineSprite')]
+    assert sprite.self_time <= sprite.time
+    assert profiler.calls['read_uint8'] > 0
+
+
+def test_results():
+    with Profiler() as profiler:
+        parse()
+
+    results = json.loads(profiler.to_json())
+    assert {entry['name'] for entry in results['entries']} >= \
+        {'SetBackgroundColor', 'DefineSprite', 'Stop'}
+    assert all(count for count in results['calls'].values())
+    assert 'SetBackgroundColor' in profiler.table()
+
+
+def test_disable_restores_the_methods():
+    unpack = vars(SetBackgroundColor)['unpack']
+    decoders = list(actions.__DECODERS__)
+    read_uint8 = Stream.read_uint8
+
+    with Profiler() as profiler:
+        pass
+    parse()
+
+    assert vars(SetBackgroundColor)['unpack'] is unpack
+    assert actions.__DECODERS__ == decoders
+    assert Stream.read_uint8 is read_uint8
+    assert not any(entry.count for entry in profiler.entries.values())
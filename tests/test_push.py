@@ -0,0 +1,59 @@
+import pytest
+
+from builders import define_sprite, show_frame, signatures, swf, tag
+
+from stream import Stream
+from swf.exceptions import IncompleteFile, UnmatchedFileLength
+from swf.file import File, Header
+from swf.push import SwfParser
+
+__TAGS__ = [
+    tag(9, b'\x00\x00\xff'),
+    tag(6, b'\x05\x00' + bytes(range(256)) * 4, long=True),
+    show_frame(),
+    define_sprite(7, [tag(12, b'\x07\x00'), show_frame()]),
+    show_frame(),
+]
+
+def events(data, size):
+    parser = SwfParser()
+    events = []
+    for start in range(0, len(data), size):
+        parser.feed(data[start:start + size])
+        events.extend(parser.events())
+    parser.close()
+
+    return events
+
+
+@pytest.mark.parametrize('signature', signatures())
+@pytest.mark.parametrize('size', [1, 3, 9, 13, 64, 1 << 20])
+def test_chunked_input_gives_the_parsed_tags(signature, size):
+    data = swf(__TAGS__, signature=signature, frame_count=2)
+    swf_file = File.unpack(Stream(data))
+
+    header, *tags = events(data, size)
+
+    assert isinstance(header, Header)
+    assert header == swf_file.header
+    # unknown tags, decoded as None, aren't events
+    assert tags[:-1] == [tag for tag in swf_file.tags if tag is not None]
+    assert type(tags[-1]).__name__ == 'End'
+
+
+@pytest.mark.parametrize('signature', signatures())
+def test_truncated_input_is_incomplete(signature):
+    data = swf(__TAGS__, signature=signature)
+    parser = SwfParser()
+    parser.feed(data[:len(data) // 2])
+
+    with pytest.raises(IncompleteFile):
+        parser.close()
+
+
+def test_unmatched_file_length():
+    data = bytearray(swf(__TAGS__))
+    data[4] += 1
+
+    with pytest.raises(UnmatchedFileLength):
+        events(bytes(data), 16)
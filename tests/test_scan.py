@@ -0,0 +1,79 @@
+from builders import define_sprite, show_frame, swf, tag
+
+from stream import Stream
+from swf.file import unpack_body
+from swf.scan import ScanStats, scan, scan_files
+from swf.tags import walk
+
+__TAGS__ = [
+    tag(9, b'\x00\x00\xff'),
+    define_sprite(1, [
+        tag(43, b'outer\x00'),
+        define_sprite(2, [show_frame()]),
+        show_frame(),
+    ]),
+    show_frame(),
+    tag(43, b'label\x00'),
+    show_frame(),
+]
+
+
+def test_walk_descends_nested_sprites():
+    _, stream = unpack_body(Stream(swf(__TAGS__)))
+
+    walked = [(header.code, depth) for _, header, depth in walk(stream)]
+
+    assert walked == [
+        (9, 0), (39, 0), (43, 1), (39, 1), (1, 2), (1, 1), (1, 0), (43, 0),
+        (1, 0),
+    ]
+    assert stream.byte_position == stream.bytes_length
+
+
+def test_walk_positions_are_the_tag_headers():
+    data = swf(__TAGS__)
+    _, stream = unpack_body(Stream(data))
+    body = bytes(stream.buffer)
+
+    for position, header, _ in walk(stream):
+        code = int.from_bytes(body[position:position + 2], 'little') >> 6
+        assert code == header.code
+
+
+def test_walk_skips_sprites_not_descended():
+    _, stream = unpack_body(Stream(swf(__TAGS__)))
+
+    walked = [header.code for _, header, _ in
+              walk(stream, lambda header: False)]
+
+    assert walked == [9, 39, 1, 43, 1]
+
+
+def test_scan():
+    stats = scan(swf(__TAGS__, signature='CWS'))
+
+    assert (stats.files, stats.errors) == (1, 0)
+    assert (stats.frames, stats.sprite_frames, stats.sprites) == (2, 2, 2)
+    assert stats.depths == {0: 5, 1: 3, 2: 1}
+    assert stats.tags[43].count == 2
+    assert stats.tags[43].bytes == 12
+    assert stats.tags[9].bytes == 3
+    assert 'SetBackgroundColor' in stats.table()
+
+
+def test_scan_files(tmp_path):
+    paths = []
+    for name, data in (('a.swf', swf(__TAGS__)), ('b.swf', swf([tag(1)])),
+                       ('broken.swf', b'FWS\x0a')):
+        path = tmp_path / name
+        path.write_bytes(data)
+        paths.append(str(path))
+
+    stats = scan_files(paths, workers=2)
+
+    assert (stats.files, stats.errors) == (3, 1)
+    assert stats.frames == 3
+    assert stats.tags[1].count == 5
+    assert stats == ScanStats().merge(scan(swf(__TAGS__))).merge(
+        scan(swf([tag(1)]))
+    ).merge(ScanStats(files=1, errors=1))
@@ -0,0 +1,78 @@
+import os
+import random
+import zlib
+
+from builders import show_frame, swf, tag
+
+from stream import Stream
+from swf.file import File, open_indexed, sidecar_path
+from swf.seekable import SeekableZlib
+
+__DATA__ = random.Random(0).randbytes(1 << 16) + bytes(1 << 18)
+
+
+def test_random_reads_match_the_decompressed_data():
+    seekable = SeekableZlib(zlib.compress(__DATA__), interval=4096)
+    positions = random.Random(1).sample(range(len(__DATA__)), 200)
+
+    for position in positions:
+        assert seekable.read(position, 1000) == \
+            __DATA__[position:position + 1000]
+
+
+def test_checkpoints_are_recorded_once():
+    seekable = SeekableZlib(zlib.compress(__DATA__), interval=1 << 16)
+
+    assert seekable.read(len(__DATA__) - 10, 100) == __DATA__[-10:]
+    checkpoints = list(seekable.checkpoints)
+    assert len(checkpoints) > 1
+    assert [position for position, _, _ in checkpoints] == \
+        seekable._positions
+
+    assert seekable.read(0, 10) == __DATA__[:10]
+    assert seekable.read(1 << 17, 10) == __DATA__[1 << 17:(1 << 17) + 10]
+    assert seekable.checkpoints == checkpoints
+
+
+def test_reads_past_the_end():
+    seekable = SeekableZlib(zlib.compress(b'data'))
+
+    assert seekable.read(2, 10) == b'ta'
+    assert seekable.read(10, 10) == b''
+
+
+def write(tmp_path):
+    path = tmp_path / 'movie.swf'
+    path.write_bytes(swf(
+        [tag(6, b'\x05\x00' + __DATA__[:5000], long=True), show_frame()],
+        signature='CWS',
+    ))
+    return str(path)
+
+
+def test_unchunked_sidecars_read_through_checkpoints(tmp_path):
+    path = write(tmp_path)
+    with open(path, 'rb') as file:
+        tags = File.unpack(Stream(file.read())).tags
+
+    with open_indexed(path, chunk_size=None, interval=1024) as indexed:
+        assert not indexed.sidecar.chunks
+        assert [indexed.tag(idx) for idx in reversed(range(len(indexed)))] \
+            == tags[::-1]
+        assert len(indexed._zlib.checkpoints) > 1
+
+
+def test_sidecars_of_another_chunk_mode_are_rebuilt(tmp_path):
+    path = write(tmp_path)
+    sidecar = sidecar_path(path)
+
+    open_indexed(path, chunk_size=None).close()
+    built = os.path.getsize(sidecar)
+
+    with open_indexed(path, chunk_size=1024) as indexed:
+        assert indexed.sidecar.chunk_size == 1024
+        assert os.path.getsize(sidecar) > built
+
+    with open_indexed(path, chunk_size=None) as indexed:
+        assert indexed.sidecar.chunk_size == 0
+        assert indexed._zlib is not None
@@ -0,0 +1,56 @@
+from builders import body, define_sprite, show_frame, swf, tag
+
+from stream import Stream
+from swf.file import File
+from swf.store import AssetStore
+
+__TAGS__ = [
+    tag(9, b'\x00\x00\xff'),
+    # short enough for a short header, written with a long one
+    tag(43, b'label\x00', long=True),
+    define_sprite(1, [tag(12, b'\x07\x00'), show_frame()]),
+    show_frame(),
+]
+
+
+def test_rebuild_round_trips_uncompressed_files(tmp_path):
+    store = AssetStore(tmp_path)
+    data = swf(__TAGS__)
+
+    manifest = store.add_bytes(data)
+
+    assert store.rebuild(manifest) == data
+    assert [code for code, _, _ in manifest.tags] == [9, 43, 39, 1]
+    assert [is_long for _, _, is_long in manifest.tags] == \
+        [False, True, True, False]
+
+
+def test_rebuild_decompresses_cws_files(tmp_path):
+    store = AssetStore(tmp_path)
+
+    manifest = store.add_bytes(swf(__TAGS__, signature='CWS'))
+    rebuilt = store.rebuild(manifest)
+
+    assert rebuilt[:3] == b'FWS'
+    assert rebuilt[8:] == body(__TAGS__)
+    assert len(File.unpack(Stream(rebuilt)).tags) == len(__TAGS__)
+
+
+def test_tag_bodies_are_stored_once(tmp_path):
+    store = AssetStore(tmp_path)
+
+    first = store.add_bytes(swf(__TAGS__))
+    second = store.add_bytes(swf(__TAGS__ + [tag(9, b'\x00\x00\x00')]))
+
+    assert first.tags == second.tags[:len(first.tags)]
+    objects = [path for path in (tmp_path / 'objects').rglob('*')
+               if path.is_file()]
+    assert len(objects) == len(first.hashes()) + 1
+
+
+def test_added_files_are_found_by_their_hash(tmp_path):
+    store = AssetStore(tmp_path)
+    manifest = store.add_bytes(swf(__TAGS__))
+
+    assert AssetStore(tmp_path).manifest(manifest.hash) == manifest
+    assert all(hash in store for hash in manifest.hashes())
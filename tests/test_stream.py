@@ -0,0 +1,230 @@
+from array import array
+import struct
+
+import pytest
+
+from builders import action, bits, define_sprite, show_frame, swf, tag
+
+from amv2.structs import String
+from stream import BitLayout, BitsExhaustion, Stream
+from swf import filters
+from swf.actions import ActionBlock, Play, Stop, Try
+from swf.file import File, string_encoding
+from swf.tags import FileAttributes, FrameLabel, PlaceObject3, \
+                     SetBackgroundColor
+
+
+def test_cstrings():
+    stream = Stream(b'first\x00\x00last\x00')
+
+    assert stream.read_cstring() == 'first'
+    assert stream.read_cstring() == ''
+    assert stream.read_cstring() == 'last'
+
+
+def test_cstrings_longer_than_a_search_chunk():
+    # the two bytes of the last character straddle the first chunk end
+    text = 'a' * 63 + 'é' + 'b' * 100
+    stream = Stream(text.encode() + b'\x00\x07')
+
+    assert stream.read_cstring() == text
+    assert stream.read_uint8() == 7
+
+
+def test_cstrings_are_byte_aligned():
+    stream = Stream(b'\x80abc\x00')
+    stream.read_bits(3)
+
+    assert stream.read_cstring() == 'abc'
+
+
+def test_unterminated_cstrings():
+    with pytest.raises(BitsExhaustion):
+        Stream(b'abc').read_cstring()
+
+
+def test_legacy_encoding():
+    stream = Stream('é\x00'.encode('latin-1'), encoding=string_encoding(5))
+
+    assert stream.read_cstring() == 'é'
+    assert string_encoding(6) == 'utf-8'
+
+
+def test_strings_of_a_declared_length():
+    stream = Stream(b'\x04\x00\xc3\xa9t\xc3\xa9')
+
+    assert stream.read_string(2) == '\x04\x00'
+    assert stream.read_string(5) == 'été'
+    with pytest.raises(BitsExhaustion):
+        stream.read_string(1)
+
+
+def test_abc_strings():
+    data = 'ünïcode'.encode()
+    stream = Stream(bytes([len(data)]) + data + b'\x00')
+
+    string = String.unpack(stream)
+
+    assert string == 'ünïcode'
+    assert stream.read_uint8() == 0
+
+
+def test_bit_layouts():
+    layout = BitLayout('? x2 u4 s3 ?')
+    value = int('1' '11' '1010' '101' '0', 2)
+
+    assert layout.size == 11
+    assert layout.unpack(value) == (True, 10, -3, False)
+    with pytest.raises(ValueError):
+        BitLayout('? y2')
+
+
+@pytest.mark.parametrize('skip', [0, 3])
+def test_read_layout_matches_bit_reads(skip):
+    data = bytes([0b10110010, 0b01111000, 0b11001010])
+    layout = BitLayout('? u5 s4 x2 ? u3')
+    stream = Stream(data)
+    stream.read_bits(skip)
+    expected = Stream(data)
+    expected.read_bits(skip)
+
+    values = [
+        expected.read_bit_bool(), expected.read_ubits(5),
+        expected.read_sbits(4),
+    ]
+    expected.read_ubits(2)
+    values += [expected.read_bit_bool(), expected.read_ubits(3)]
+
+    assert stream.read_layout(layout) == tuple(values)
+    assert stream.bit_position == expected.bit_position
+
+
+def test_read_bits_of_no_size():
+    stream = Stream(b'\xff')
+    stream.read_bits(3)
+
+    assert stream.read_bits(0) == 0
+    assert stream.read_sbits(0) == 0
+    assert stream.bit_position == 3
+
+
+def test_place_object_3_skips_the_reserved_bit():
+    # character and name, then the reserved bit set and a blend mode
+    data = bits([(8, 0b00100010), (1, 1), (7, 0b0000010)]) + \
+        b'\x02\x00\x07\x00clip\x00\x03'
+    movie = File.unpack(Stream(swf([tag(70, data)])))
+
+    place = movie.tags[0]
+    assert isinstance(place, PlaceObject3)
+    assert (place.depth, place.character_id, place.name, place.blend_mode) \
+        == (2, 7, 'clip', 3)
+    assert place.class_name is None
+    assert place.visible is None
+
+
+def test_file_attributes():
+    movie = File.unpack(Stream(swf([tag(69, bytes([0b01001001, 0, 0, 0]))])))
+
+    attributes = movie.tags[0]
+    assert isinstance(attributes, FileAttributes)
+    assert (
+        attributes.use_direct_blit, attributes.use_gpu,
+        attributes.has_metadata, attributes.actionscript3,
+        attributes.use_network,
+    ) == (True, False, False, True, True)
+
+
+def test_array_reads():
+    stream = Stream(
+        b'\x80' + b'\x01\x02' + struct.pack('<HH', 1, 0x1234) +
+        struct.pack('<ff', 0.5, -2.0)
+    )
+    stream.read_bits(1)
+
+    assert stream.read_uint8_array(2) == b'\x01\x02'
+    assert stream.read_uint16_array(2) == array('H', [1, 0x1234])
+    assert stream.read_float_array(2) == array('f', [0.5, -2.0])
+    with pytest.raises(BitsExhaustion):
+        stream.read_uint16_array(1)
+
+
+def test_big_endian_array_reads():
+    stream = Stream(b'\x12\x34', byteorder='big')
+
+    assert stream.read_uint16_array(1) == array('H', [0x1234])
+
+
+def test_color_matrix_filter():
+    values = [float(value) for value in range(20)]
+    stream = Stream(b'\x06' + struct.pack('<20f', *values))
+
+    matrix = filters.unpack(stream)
+
+    assert isinstance(matrix, filters.ColorMatrix)
+    assert matrix.matrix == [values[row:row + 5] for row in range(0, 20, 5)]
+
+
+def test_try_bodies():
+    # catch into `e`, a Stop try body and a Play catch body
+    data = action(0x8f, b'\x01' + struct.pack('<HHH', 1, 1, 0) + b'e\x00') \
+        + b'\x07\x06' + b'\x00'
+    actions = ActionBlock(data, 0)
+
+    [record, end] = actions.index.codes
+    block = actions[0]
+
+    assert (record, end) == (0x8f, 0)
+    assert isinstance(block, Try)
+    assert (block.catch_block, block.finally_block) == (True, False)
+    assert block.catch_name == 'e'
+    assert isinstance(block.try_body[0], Stop)
+    assert isinstance(block.catch_body[0], Play)
+    assert len(block.finally_body) == 0
+
+
+def test_substreams():
+    stream = Stream(b'\x01\x02\x03\x04\x05', origin=100)
+    stream.read_uint8()
+
+    substream = stream.substream(3)
+
+    assert substream.origin == 101
+    assert substream.read_uint16() == 0x0302
+    assert substream.read_uint8() == 4
+    with pytest.raises(BitsExhaustion):
+        substream.read_uint8()
+    assert stream.read_uint8() == 5
+    with pytest.raises(BitsExhaustion):
+        Stream(b'\x01').substream(2)
+
+
+def test_substreams_share_the_buffer():
+    data = bytearray(b'\x01\x02\x03')
+    stream = Stream.from_buffer(memoryview(data))
+
+    substream = stream.substream(2)
+    data[1] = 9
+
+    assert substream.read_uint16() == 0x0901
+
+
+def test_tags_are_decoded_in_their_body():
+    movie = File.unpack(Stream(swf([
+        # a longer body than the decoder reads
+        tag(9, b'\x01\x02\x03\xff\xff'),
+        define_sprite(1, [tag(43, b'inner\x00'), show_frame()]),
+        tag(43, b'label\x00'),
+    ])))
+    color, sprite, label = movie.tags[:3]
+
+    assert isinstance(color, SetBackgroundColor)
+    assert isinstance(label, FrameLabel)
+    assert label.name == 'label'
+    inner = sprite.control_tags[0]
+    assert inner.name == 'inner'
+    assert bytes(movie.body[inner.header.offset:][:6]) == b'inner\x00'
+
+
+def test_decoders_cant_read_past_their_body():
+    with pytest.raises(BitsExhaustion):
+        File.unpack(Stream(swf([tag(9, b'\x01\x02'), tag(43, b'label\x00')])))
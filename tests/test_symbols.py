@@ -0,0 +1,100 @@
+import os
+import struct
+
+from builders import abc, define_sprite, do_abc, show_frame, swf, tag
+
+from stream import Stream
+from swf.file import File
+from swf.symbols import CLASS, INTERFACE, REFERENCE, SUPER, SYMBOL, \
+                        SymbolIndex, swf_symbols
+
+
+def symbol_class(*symbols):
+    return tag(76, struct.pack('<H', len(symbols)) + b''.join(
+        struct.pack('<H', character_id) + name.encode() + b'\0'
+        for character_id, name in symbols
+    ))
+
+
+__MOVIE__ = swf([
+    define_sprite(1, [do_abc(abc()), show_frame()]),
+    symbol_class((1, 'Clip')),
+    show_frame(),
+])
+
+
+def write(tmp_path, name, data=__MOVIE__):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_swf_symbols():
+    symbols = swf_symbols(File.unpack(Stream(__MOVIE__)))
+
+    assert symbols == {
+        ('com.example.Foo', CLASS, ''),
+        ('flash.display.Sprite', SUPER, 'com.example.Foo'),
+        ('flash.events.IEventDispatcher', INTERFACE, 'com.example.Foo'),
+        ('com.example.Foo', REFERENCE, ''),
+        ('flash.display.Sprite', REFERENCE, ''),
+        ('flash.events.IEventDispatcher', REFERENCE, ''),
+        ('Clip', SYMBOL, ''),
+    }
+
+
+def test_lookups(tmp_path):
+    path = write(tmp_path, 'movie.swf')
+    index = SymbolIndex(str(tmp_path / 'symbols.db'))
+
+    assert index.update([path]) == 1
+
+    assert index.defines('com.example.Foo') == [path]
+    assert index.defines('Clip') == [path]
+    assert index.defines('flash.display.Sprite') == []
+    assert index.references('flash.display.Sprite') == [path]
+    assert index.subclasses('flash.events.IEventDispatcher') == \
+        [('com.example.Foo', path)]
+    index.close()
+
+
+def test_unchanged_files_and_contents_are_parsed_once(tmp_path):
+    path = write(tmp_path, 'movie.swf')
+    copy = write(tmp_path, 'copy.swf')
+    index = SymbolIndex(str(tmp_path / 'symbols.db'))
+
+    assert index.update([path, copy]) == 1
+    assert index.update([path, copy]) == 0
+    assert index.defines('Clip') == [copy, path]
+
+    os.utime(path, (0, 0))
+    assert index.update([path]) == 0
+    index.close()
+
+
+def test_malformed_files_are_recorded(tmp_path):
+    path = write(tmp_path, 'broken.swf', b'FWS\x0a\xff\xff\xff\xff')
+    index = SymbolIndex(str(tmp_path / 'symbols.db'))
+
+    assert index.update([path]) == 1
+    [(error,)] = index.connection.execute('SELECT error FROM contents')
+    assert error is not None
+
+    os.utime(path, (0, 0))
+    assert index.update([path]) == 0
+    index.close()
+
+
+def test_removed_files_are_pruned(tmp_path):
+    path = write(tmp_path, 'movie.swf')
+    index = SymbolIndex(str(tmp_path / 'symbols.db'))
+    index.update([path])
+
+    index.remove([path])
+    index.prune()
+
+    assert index.defines('Clip') == []
+    assert index.connection.execute(
+        'SELECT COUNT(*) FROM symbols'
+    ).fetchone() == (0,)
+    index.close()
@@ -0,0 +1,55 @@
+from builders import define_sprite, show_frame, swf, tag
+
+from stream import Stream
+from swf.file import File, parse, visit
+from swf.tags import DefineSprite, DoAction, SetBackgroundColor, ShowFrame, \
+                     Tag
+
+__TAGS__ = [
+    tag(9, b'\x00\x00\xff'),
+    tag(12, b'\x07\x00'),
+    show_frame(),
+    define_sprite(1, [tag(12, b'\x06\x00'), show_frame()]),
+    show_frame(),
+]
+
+
+def collect(*classes):
+    tags = []
+    handlers = {cls: tags.append for cls in classes}
+    return tags, handlers
+
+
+def test_visited_tags_match_parsed_ones():
+    data = swf(__TAGS__)
+    parsed = File.unpack(Stream(data)).tags
+    tags, handlers = collect(SetBackgroundColor, DoAction)
+
+    header = visit(Stream(data), handlers)
+
+    assert header.frame_count == 1
+    assert tags[:2] == parsed[:2]
+    # the control tags of unhandled sprites are visited
+    assert tags[2] == parsed[3].control_tags[0]
+
+
+def test_handled_sprites_are_decoded_whole():
+    data = swf(__TAGS__)
+    tags, handlers = collect(DefineSprite, ShowFrame)
+
+    visit(Stream(data), handlers)
+
+    assert [type(tag) for tag in tags] == \
+        [ShowFrame, DefineSprite, ShowFrame]
+    assert tags[1] == File.unpack(Stream(data)).tags[3]
+
+
+def test_handlers_of_base_classes(tmp_path):
+    path = tmp_path / 'movie.swf'
+    path.write_bytes(swf(__TAGS__))
+    tags, handlers = collect(Tag)
+
+    parse(str(path), handlers=handlers)
+
+    assert [type(tag) for tag in tags] == \
+        [SetBackgroundColor, DoAction, ShowFrame, DefineSprite, ShowFrame]